@@ -1,47 +1,74 @@
 # -*- coding:utf-8 -*-
 # pylint: disable=bare-except
 try:
-    from typing import List, Tuple, Dict, Any, Optional
+    from typing import List, Tuple, Dict, Any, Optional, Iterator
 except ImportError:
     pass
 
-from copy import deepcopy
-from itertools import product
-import scriptcontext as sc
-
-from funcs._radial_mass import RadialAreaGroup, RadialMass
-from funcs._utils import get_ag_interaval, check_area_group_intersection, check_interval_intersection
+from funcs._backend import sc
+
+from funcs._radial_mass import RadialAreaGroup, RadialMass, get_ring_size, merge_area_groups
+from funcs._metrics import (
+    get_area_groups_cost,
+    get_layout_cost,
+    get_room_data,
+    iter_unique_layouts,
+    INVALID_AREA_DATA,
+)
+from funcs._interval_index import get_area_group_intervals, get_first_overlaps
+from funcs._search import SearchEngine
+from funcs._ring import Ring, RingWindows, get_prefix_areas, get_covering_count
 import math
 
 FIRST_POS_TOL = 0.6
 TOO_SMALL_AREA = 20
 
+def iter_area_divisions(target_list, prev_capacity, next_capacity):
+    # type: (List[Tuple[float, str]], float, float) -> Iterator[Tuple[List, List]]
+    """(면적, 이름) 리스트를 prev, next 두 쪽으로 나누는 경우를 하나씩 만든다.
+    각 쪽 면적 합은 capacity보다 작아야 하고, 넘치는 순간 그 아래는 보지 않는다.
+    같은 면적 구성(이름만 다르고 면적은 같은 room끼리 자리를 바꾼 것)은 한번만 나온다.
+    순서는 itertools.product([True, False])로 나누던 것과 같다. (True == prev)"""
+    seen = set()
+    prev_data = []  # type: List[Tuple[float, str]]
+    next_data = []  # type: List[Tuple[float, str]]
+
+    def _divide(i, prev_total, next_total):
+        if i == len(target_list):
+            key = (
+                tuple(sorted([x[0] for x in prev_data])),
+                tuple(sorted([x[0] for x in next_data])),
+            )
+            if key not in seen:
+                seen.add(key)
+                yield list(prev_data), list(next_data)
+            return
+        area = target_list[i][0]
+        if prev_total + area < prev_capacity:
+            prev_data.append(target_list[i])
+            for division in _divide(i + 1, prev_total + area, next_total):
+                yield division
+            prev_data.pop()
+        if next_total + area < next_capacity:
+            next_data.append(target_list[i])
+            for division in _divide(i + 1, prev_total, next_total + area):
+                yield division
+            next_data.pop()
+
+    if 0 < prev_capacity and 0 < next_capacity:
+        for division in _divide(0, 0, 0):
+            yield division
+
+
 class SeedExtensionScenarioCombination:
+    """seed마다 하나씩 고른 SeedExtensionScenario들.
+    겹침 확인은 SearchEngine이 조합을 찾을 때 이미 했다."""
+
     def __init__(self):
         self.scenario_combination = []
 
     def add_scenario(self, scenario):
         self.scenario_combination.append(scenario)
-
-    def check_scenario_intersection(self, scenario1, scenario2):
-        for ag1 in scenario1.all_area_groups:
-            for ag2 in scenario2.all_area_groups:
-                intervals_1 = get_ag_interaval(ag1)
-                intervals_2 = get_ag_interaval(ag2)
-                if check_interval_intersection(intervals_1, intervals_2):
-                    return True
-        return False
-    
-    @property
-    def is_valid(self):
-        for scenario1 in self.scenario_combination:
-            for scenario2 in self.scenario_combination:
-                if scenario1 == scenario2:
-                    pass
-                else:
-                    if self.check_scenario_intersection(scenario1, scenario2):
-                        return False
-        return True
                 
 class SeedExtensionScenario:
     def __init__(self, seed, prev_area_groups, next_area_groups, prev_area_data , next_area_data):
@@ -50,23 +77,34 @@ class SeedExtensionScenario:
         self.next_area_groups = next_area_groups
         self.prev_area_data = prev_area_data
         self.next_area_data = next_area_data
-        self._geom_list = None
+        self._angle_intervals = None
         
+    @property
+    def angle_intervals(self):
+        # type: () -> List[Tuple[float, float]]
+        """all_area_groups의 각도 구간. 한번만 계산한다."""
+        if self._angle_intervals is None:
+            self._angle_intervals = [
+                interval
+                for area_group in self.all_area_groups
+                for interval in get_area_group_intervals(area_group)
+            ]
+        return self._angle_intervals
+
     @property
     def all_area_groups(self):
         all_groups = [self.seed.area_groups[0]]
         all_groups.extend(self.prev_area_groups)
         all_groups.extend(self.next_area_groups)
         return all_groups
-    
-    @property
-    def geom_list(self):
-        if self._geom_list is None:
-            _geom_list = [self.seed.area_groups[0].geom]
-            _geom_list.extend([ag.geom for ag in self.prev_area_groups])
-            _geom_list.extend([ag.geom for ag in self.next_area_groups])
-            self._geom_list = _geom_list
-        return self._geom_list
+
+    def get_cost(self, objective):
+        # type: (Optional[str]) -> float
+        """양쪽으로 합칠 area_group들의 cost. (SearchEngine의 objective)
+        prev_area_groups는 seed에서 멀어지는 순서이므로 expand_by처럼 뒤집어서 본다."""
+        return get_area_groups_cost(
+            objective, self.prev_area_groups[::-1], self.prev_area_data
+        ) + get_area_groups_cost(objective, self.next_area_groups, self.next_area_data)
     
 class Seed:
     def __init__(self, area_group, area_cluster):
@@ -77,20 +115,36 @@ class Seed:
         self.next_area_groups = []
         self.prev_area_groups = []
         self.extend_scenarios = []
+        self._area_left_key = None
+        self._area_left_data = None
+        self._area_left = None
 
     @property
     def area_left(self):
-
-        return sum( self.area_left_data.values())
+        self._update_area_left()
+        return self._area_left
         
     @property
     def area_left_data(self):
-        '''처리되지 않은 area들'''
-        area_processed_keys = []
+        '''처리되지 않은 area들. 같은 dict를 돌려주므로 바꾸지 않도록 하자.'''
+        self._update_area_left()
+        return self._area_left_data
+
+    def _update_area_left(self):
+        # seed의 area_group이나 그 area_data가 바뀌었을 때만 다시 계산한다.
+        key = [(id(area_group), area_group.area_data_version) for area_group in self.area_groups]
+        if key == self._area_left_key:
+            return
+        self._area_left_key = key
+        self._area_left_data = self._get_area_left_data()
+        self._area_left = sum(self._area_left_data.values())
+
+    def _get_area_left_data(self):
+        area_processed_keys = set()
         for area_group in self.area_groups:
             if area_group.is_area_set:
-                keys = [i[1] for i in area_group.area_data]
-                area_processed_keys.extend(keys)
+                keys = [i[1] for i in get_room_data(area_group.area_data)]
+                area_processed_keys.update(keys)
 
         not_processed_area_data = {}
         for k, v in self.area_cluster.items():
@@ -103,13 +157,15 @@ class Seed:
         seed_area_group = self.area_groups[0]
         next_area_group = seed_area_group.next
         prev_area_group = seed_area_group.prev
+        # 고리가 끊겨 있어도 무한 루프가 되지 않도록 고리 크기만큼만 본다.
+        ring_size = get_ring_size(seed_area_group)
         count = 0
 
         while not next_area_group.is_area_set and not seed_area_group == next_area_group:
             self.next_area_groups.append(next_area_group)
             next_area_group = next_area_group.next
             count +=1
-            if count ==100:
+            if count == ring_size:
                 break
         count = 0
 
@@ -117,7 +173,7 @@ class Seed:
             self.prev_area_groups.append(prev_area_group)
             prev_area_group = prev_area_group.prev
             count +=1
-            if count ==100:
+            if count == ring_size:
                 break
 
     def check_extendable(self):
@@ -127,74 +183,70 @@ class Seed:
 
         return  extendable_area >= self.area_left
     
-    def find_extend_scenarios(self):
-        
-        def get_possible_division():
-            target_list = []
-            for k,v in zip(self.area_left_data.keys(), self.area_left_data.values()):
-                target_list.append((v,k))
-
-            l1 = []
-            l2 = []
-
-            for pattern in product([True,False],repeat=len(target_list)):
-                l1.append([x[1] for x in zip(pattern,target_list) if x[0]])
-                l2.append([x[1] for x in zip(pattern,target_list) if not x[0]])
-
-            return zip(l1,l2)
-        
-        possible_division = get_possible_division()
+    def iter_extend_scenarios(self):
+        # type: () -> Iterator[SeedExtensionScenario]
+        """남은 room들을 prev / next 쪽으로 나누는 scenario를 하나씩 만든다.
+        나눈 면적 합이 양쪽 확장 가능 면적보다 작은 것만 나온다."""
+        target_list = []
+        for k,v in zip(self.area_left_data.keys(), self.area_left_data.values()):
+            target_list.append((v,k))
 
         prev_area_left = sum([area_group.area for area_group in self.prev_area_groups])
         next_area_left = sum([area_group.area for area_group in self.next_area_groups])
-        
-        extendable_division = []
-        for division in possible_division:
-            area_data_1, area_data_2 = division
-            if sum([x[0] for x in area_data_1]) < prev_area_left and sum([x[0] for x in area_data_2])< next_area_left:
-                extendable_division.append(division)
 
-        extend_scenarios = []
-
-        for division in extendable_division:
-            prev_area_data , next_area_data = division
+        # 같은 면적 합이면 같은 area_group들이 선택되므로 한번만 찾는다.
+        matching_cache = {}  # type: Dict[Tuple[bool, float], List[RadialAreaGroup]]
+        prefix_areas = {
+            True: get_prefix_areas([area_group.area for area_group in self.prev_area_groups]),
+            False: get_prefix_areas([area_group.area for area_group in self.next_area_groups]),
+        }
+
+        def _get_matching(is_prev, area_total):
+            key = (is_prev, area_total)
+            if key not in matching_cache:
+                area_groups = self.prev_area_groups if is_prev else self.next_area_groups
+                matching_cache[key] = self._get_area_groups_matching_area(
+                    area_total, area_groups, prefix_areas[is_prev]
+                )
+            return matching_cache[key]
+
+        for prev_area_data, next_area_data in iter_area_divisions(target_list, prev_area_left, next_area_left):
             prev_area_total = sum([x[0]for x in prev_area_data])
             next_area_total = sum([x[0]for x in next_area_data])
-            prev_area_groups = self._get_area_groups_matching_area(prev_area_total, self.prev_area_groups)
-            next_area_groups = self._get_area_groups_matching_area(next_area_total, self.next_area_groups)
-            extend_scenarios.append(SeedExtensionScenario(self, prev_area_groups, next_area_groups, prev_area_data , next_area_data))
-        self.extend_scenarios = extend_scenarios
-        
-        return extend_scenarios
-
-    def _get_area_groups_matching_area(self, area, area_groups):
-        res_area_groups = [] # type: List[RadialAreaGroup]
-        i = 0 
-        while sum([area_group.area for area_group in res_area_groups])<area:
-            res_area_groups.append(area_groups[i])
-            i+=1
-            if i ==100:
-                return []
-        return res_area_groups
+            prev_area_groups = _get_matching(True, prev_area_total)
+            next_area_groups = _get_matching(False, next_area_total)
+            yield SeedExtensionScenario(self, prev_area_groups, next_area_groups, prev_area_data , next_area_data)
+
+    def find_extend_scenarios(self):
+        self.extend_scenarios = list(self.iter_extend_scenarios())
+        return self.extend_scenarios
+
+    def _get_area_groups_matching_area(self, area, area_groups, prefix_areas=None):
+        # type: (float, List[RadialAreaGroup], Optional[List[float]]) -> List[RadialAreaGroup]
+        """앞에서부터 합쳐서 area 이상이 되는 가장 짧은 area_group들. 모자라면 []"""
+        if prefix_areas is None:
+            prefix_areas = get_prefix_areas([area_group.area for area_group in area_groups])
+        count = get_covering_count(prefix_areas, area)
+        if count is None:
+            return []
+        return area_groups[:count]
     
     def expand_by(self, extension_scenario):
         # type: (SeedExtensionScenario) -> List[RadialAreaGroup]
         
+        # seed와 후보 area_group은 scenario 조합끼리 같이 쓰므로 바꾸지 않고 새 area_group을 만든다.
         area_groups_res = [area_group.duplicate() for area_group in self.area_groups]
         if not len(extension_scenario.next_area_groups) == 0 :
             if len(extension_scenario.next_area_data) <= 3:
-                area_group = extension_scenario.next_area_groups[0] # type: RadialAreaGroup
-                for i in range(len(extension_scenario.next_area_groups)-1):
-                    area_group += extension_scenario.next_area_groups[i+1]
+                area_group = merge_area_groups(extension_scenario.next_area_groups)
                 area_group.set_area_data(extension_scenario.next_area_data)
                 area_groups_res.append(area_group)
             else:
                 print("I HAVE NO IDEA")
         if not len(extension_scenario.prev_area_groups) == 0 :
             if len(extension_scenario.prev_area_data) <= 3:
-                area_group = extension_scenario.prev_area_groups[0]
-                for i in range(len(extension_scenario.prev_area_groups)-1):
-                    area_group += extension_scenario.prev_area_groups[i+1]
+                # prev_area_groups는 seed에서 멀어지는 순서이므로 각도 순서로 뒤집어서 합친다.
+                area_group = merge_area_groups(extension_scenario.prev_area_groups[::-1])
                 area_group.set_area_data(extension_scenario.prev_area_data)
                 area_groups_res.append(area_group)
             else:
@@ -215,17 +267,6 @@ class PositionScenario:
         self.init_area_group_list.append(area_group)
         self.first_area_data_list.append(first_area_data)
 
-    def is_valid(self):
-        for area_group_1 in self.init_area_group_list:
-            for area_group_2 in self.init_area_group_list:
-                if area_group_1 == area_group_2:
-                    pass
-                else:
-                    if check_area_group_intersection(area_group_1, area_group_2):
-                        return False
-        
-        return True
-    
     def create_seeds(self):
         self.init_area_group_list =[area_group.duplicate() for area_group in self.init_area_group_list]
         for area_group, first_area_data, area_cluster in zip(self.init_area_group_list, self.first_area_data_list, self.area_cluster_list):
@@ -235,12 +276,22 @@ class PositionScenario:
 
     def filter_invalid_radius(self):
         for area_group in self.area_group_list:
+            # seed처럼 이미 room이 앉은 area_group은 덮어쓰지 않는다.
+            if area_group.is_area_set:
+                continue
             if (area_group.radial_area.r2 - area_group.radial_area.r1) < 3:
-                area_group.set_area_data(("invalid", 0))
+                area_group.set_area_data(INVALID_AREA_DATA)
 
     
 
-    def process(self):
+    def process(self, search_engine=None):
+        # type: (Optional[SearchEngine]) -> List[List[RadialAreaGroup]]
+        return list(self.iter_process(search_engine))
+
+    def iter_process(self, search_engine=None):
+        # type: (Optional[SearchEngine]) -> Iterator[List[RadialAreaGroup]]
+        """성장 scenario 조합을 찾는 대로 seed를 확장한 area_group 리스트를 하나씩 돌려준다.
+        objective가 없으면 조합을 미리 모으지 않고 탐색하면서 바로 돌려준다."""
         # 3m 미만의 area_group은 막아둠.
         self.filter_invalid_radius()
 
@@ -254,46 +305,44 @@ class PositionScenario:
                 seed.find_extend_scenarios()
         else:
             print("EXTEND NOT POSSIBLE")
-            return []
-        
-        # 모든 성장 scenario의 combination을 만들고 validation 함
-        res_scenarios = [] # type: List[SeedExtensionScenarioCombination]
-        
-        for seed in self.seeds:
-            if len(res_scenarios) == 0:
-                for scenario in seed.extend_scenarios:
-                    comb = SeedExtensionScenarioCombination()
-                    comb.add_scenario(scenario)
-                    res_scenarios.append(comb)
-            else:
-                next_scnearios = []
-                for res_scenario in res_scenarios:
-                    for scenario in seed.extend_scenarios:
-                        scenario_new = deepcopy(res_scenario)
-                        scenario_new.add_scenario(scenario)
-                        if scenario_new.is_valid:
-                            next_scnearios.append(scenario_new)
-                        else:
-                            print("INVALID SCENARIO COMBINATION")
-
-                res_scenarios = next_scnearios
-        print("extension scenario count : {}".format(len(res_scenarios)))
-        res_scenarios_filtered = [] 
-        for scenario in res_scenarios:
-            if len(scenario.scenario_combination) == len(self.seeds):
-                res_scenarios_filtered.append(scenario)
-
-        print("extension scenario filtered count : {}".format(len(res_scenarios_filtered)))
-        output = []
+            return
         
-        for scenario in res_scenarios_filtered:
-            seeds = deepcopy(self.seeds)
+        # 모든 성장 scenario의 combination을 depth first로 찾는다.
+        # 겹치는 조합은 그 아래를 보지 않고, objective가 있으면 좋은 것만 남긴다.
+        search_engine = search_engine or SearchEngine()
+        tables = [seed.extend_scenarios for seed in self.seeds]
+
+        def _get_cost(_, scenario):
+            # type: (int, SeedExtensionScenario) -> float
+            return scenario.get_cost(search_engine.objective)
+
+        if search_engine.objective is None:
+            # first-k는 사전순이므로 찾는 대로 돌려준다. 개수는 부르는 쪽에서 자른다.
+            found = (
+                indices
+                for _, indices in search_engine.iterate(
+                    tables, lambda scenario: scenario.angle_intervals
+                )
+            )
+        else:
+            found = search_engine.search(
+                tables, lambda scenario: scenario.angle_intervals, _get_cost
+            )
+
+        count = 0
+        for indices in found:
+            comb = SeedExtensionScenarioCombination()
+            for table, index in zip(tables, indices):
+                comb.add_scenario(table[index])
+            if len(comb.scenario_combination) != len(self.seeds):
+                continue
+
             res_area_groups = []
-            for seed, extension_scenario in zip(seeds, scenario.scenario_combination):
+            for seed, extension_scenario in zip(self.seeds, comb.scenario_combination):
                 res_area_groups.extend(seed.expand_by(extension_scenario))
-            # output.append(Result(res_area_groups, self.area_group_list))
-            output.append(res_area_groups)
-        return output
+            count += 1
+            yield res_area_groups
+        print("extension scenario count : {}".format(count))
 
 
 class AreaToMass:
@@ -309,12 +358,14 @@ class AreaToMass:
     주의할점 : TOO SMALL AREA 보다 작은 areacluster는 찾지 않는다.
 
     """
-    def __init__(self, mass, area_distribute_option):
-        # type: (RadialMass, List)->None
+    def __init__(self, mass, area_distribute_option, search_engine=None):
+        # type: (RadialMass, List, Optional[SearchEngine])->None
         self.mass = mass
         self.area_distribute_option = area_distribute_option
         self.scenarios = []
         self.skipped_area_cluster = []
+        # 기본 SearchEngine은 기존처럼 모든 조합을 찾는다.
+        self.search_engine = search_engine or SearchEngine()
 
     def area_is_similar(self, area_target, area):
         """
@@ -334,42 +385,26 @@ class AreaToMass:
         else:
             return False
         
-    def get_combined_area_groups(self,_radial_area_groups, count):
-        # type: (List[RadialAreaGroup], int) -> List[RadialAreaGroup]
-        """
-        area_group을 근접성 기준으로 통합한다.
-        """
-        radial_groups_binded = []
-        
-        for radial_area_group in _radial_area_groups:
-            area_group_combined = radial_area_group
-            for _ in range(count):
-                print( area_group_combined , area_group_combined.next)
-                area_group_combined = area_group_combined + area_group_combined.next
-            radial_groups_binded.append(area_group_combined)
-        return radial_groups_binded
-    
-    def find_matching_area_groups(self, _radial_area_groups, room_tuples, combine_level):
-        # type: (List[RadialAreaGroup], Tuple, int) -> List[RadialAreaGroup]
-        """Room Tuple과 매치되는 Area Group을 찾는다."""
-        matching_area_groups = [] 
+    def find_matching_area_groups(self, ring, room_tuples):
+        # type: (Ring, Tuple) -> List[RadialAreaGroup]
+        """Room Tuple과 매치되는 Area Group을 찾는다.
+        모든 area group이 모자라면 이웃한 조각을 하나씩 더 합쳐서 다시 본다.
+        합친 면적은 RingWindows로 계산하고, 매치되는 것만 area group으로 만든다."""
         area_total = sum([x[0] for x in room_tuples])
-        
-        area_diff = []
-        if _radial_area_groups[0].radial_area.a2 - _radial_area_groups[0].radial_area.a1 > math.pi *1.2:
-            # 너무 통합되어서 커진 경우
-            return [] 
-        for area_group in _radial_area_groups:
-            area_diff.append(area_total - area_group.area)
-            if self.area_is_similar(area_total, area_group.area):
-                matching_area_groups.append(area_group)
-
-        if all([a > 0 for a in area_diff]): 
-            combine_level += 1
-            _radial_area_groups = self.get_combined_area_groups(_radial_area_groups, combine_level)
-            return self.find_matching_area_groups(_radial_area_groups, room_tuples, combine_level)
-        
-        return matching_area_groups
+        windows = RingWindows(ring)
+        while True:
+            if windows.spans[0] > math.pi *1.2:
+                # 너무 통합되어서 커진 경우
+                return []
+            areas = windows.areas.tolist()
+            if all([area < area_total for area in areas]):
+                windows.grow()
+                continue
+            return [
+                RadialAreaGroup.from_ring(ring, start, windows.length)
+                for start, area in enumerate(areas)
+                if self.area_is_similar(area_total, area)
+            ]
 
     def create_seeds_in_scenarios(self):
         for scenario in self.scenarios:
@@ -384,65 +419,104 @@ class AreaToMass:
         return area_group_list
     
     def process(self):
+        # type: () -> Tuple[List[List[RadialAreaGroup]], List]
+        """모든 결과를 리스트로 돌려준다. objective가 있으면 전체를 cost 순으로 정렬한다."""
+        res_filled = []
+        for full_area_groups in self._iter_layouts():
+            res_filled.append(full_area_groups)
+            if (
+                self.search_engine.objective is None
+                and self.search_engine.max_results is not None
+                and len(res_filled) >= self.search_engine.max_results
+            ):
+                break
+
+        if self.search_engine.objective is not None:
+            res_filled.sort(
+                key=lambda area_groups: get_layout_cost(
+                    self.search_engine.objective, area_groups
+                )
+            )
+        if self.search_engine.max_results is not None:
+            res_filled = res_filled[: self.search_engine.max_results]
+
+        return res_filled, self.skipped_area_cluster
+
+    def iter_results(self):
+        # type: () -> Iterator[List[RadialAreaGroup]]
+        """process의 generator 버전. 채우고 연결한 area_group 리스트를 하나씩 돌려준다.
+        전체 결과를 들고 있지 않으므로 objective가 있어도 전체 정렬은 하지 않는다.
+        (scenario 안에서만 cost 순서이다.) max_results개를 돌려주면 멈춘다.
+        skip된 area_cluster는 첫 결과가 나온 뒤부터 skipped_area_cluster에 있다."""
+        count = 0
+        for full_area_groups in self._iter_layouts():
+            yield full_area_groups
+            count += 1
+            if (
+                self.search_engine.max_results is not None
+                and count >= self.search_engine.max_results
+            ):
+                return
+
+    def _iter_layouts(self):
+        # type: () -> Iterator[List[RadialAreaGroup]]
+        self.search_engine.start()
         first_positions = self._get_first_init_position()
         # 첫번째 배치되는 시나리오 찾기
         if len(first_positions) == 0:
-            return [], self.skipped_area_cluster
+            return
         print(first_positions)
         sc.sticky["pos"] = first_positions
         first_position_scenraios = self._get_first_position_scenario(first_positions) # type: List[PositionScenario]
         # 시나리오 별로 area_group이 첫번째 배치되는 area_group만 있으므로 mass의 원본을 찾아서 이어준다.
         if len(first_position_scenraios) == 0:
-            return [], self.skipped_area_cluster
+            return
         
+        self.scenarios = first_position_scenraios
+        # 후보 area_group은 scenario끼리 공유하므로 seed를 먼저 만들어서(duplicate)
+        # 각 scenario 자신의 area_group으로 ring을 채운다.
+        self.create_seeds_in_scenarios()
+
         for scenario in first_position_scenraios:
             full_area_groups = self._fill_vacant_area_group(scenario.init_area_group_list)
             full_area_groups = self.connect_all_area_groups(full_area_groups)
             scenario.area_group_list = full_area_groups
 
-        self.scenarios = first_position_scenraios
-
         print("first_position_scenario_counts : {}".format(len(first_position_scenraios)))
-        self.create_seeds_in_scenarios()
         
-        res = []
+        # scenario 순서만 다르고 같은 배치는 fill, connect 전에 버린다.
+        seen_fingerprints = set()
         for i, scenario in enumerate(first_position_scenraios):
             print("{} scenario process working".format(i))
-            res.extend(scenario.process())
-            
-
-        res_filled = []
-        for res_area_groups in res:
-            full_area_groups = self._fill_vacant_area_group(res_area_groups)
-            full_area_groups = self.connect_all_area_groups(full_area_groups)
-            res_filled.append(full_area_groups)
-
-        return res_filled, self.skipped_area_cluster
+            for res_area_groups in iter_unique_layouts(
+                scenario.iter_process(self.search_engine), seen_fingerprints
+            ):
+                full_area_groups = self._fill_vacant_area_group(res_area_groups)
+                yield self.connect_all_area_groups(full_area_groups)
+            if self.search_engine.is_timeout:
+                print("SEARCH TIMEOUT")
+                return
         
     def _fill_vacant_area_group(self, area_groups):
-        # type: (List[RadialAreaGroup]) -> None
-        original_area_groups = [area_group.duplicate() for area_group in self.mass.radial_area_groups]
-        
-        def get_intersect_area_group(check_area_group, area_groups):
-            """area_group, area_groups. 
-            area_groups 중에서 area_group과 겹치는 area_group을 반환한다."""
-            for area_group in area_groups:
-                if check_area_group_intersection(area_group, check_area_group):
-                    return area_group
-                else:
-                    pass
-            return None
-        
+        # type: (List[RadialAreaGroup]) -> List[RadialAreaGroup]
+        """mass의 조각을 각도 순서로 보면서, 배치된 area_group과 겹치는 조각은
+        그 area_group으로(처음 한번만), 겹치지 않는 조각은 그 조각의 새 area_group으로 채운다.
+        조각의 RingRange는 바뀌지 않으므로 복사하지 않고 같이 쓴다.
+        (앞 뒤 관계는 결과마다 다르므로 area_group 객체는 새로 만든다.)"""
+        original_area_groups = self.mass.radial_area_groups
+        first_overlaps = get_first_overlaps(
+            [get_area_group_intervals(area_group) for area_group in original_area_groups],
+            [get_area_group_intervals(area_group) for area_group in area_groups],
+        )
+
         full_area_groups = []
-        for area_group in original_area_groups:
-            interesect_area_group = get_intersect_area_group(area_group, area_groups)
-            if interesect_area_group:
-                if interesect_area_group in full_area_groups:
-                    pass
-                else:
-                    full_area_groups.append(interesect_area_group)
-            else:
-                full_area_groups.append(deepcopy(area_group))
+        is_added = [False] * len(area_groups)
+        for area_group, overlap_index in zip(original_area_groups, first_overlaps):
+            if overlap_index is None:
+                full_area_groups.append(area_group.duplicate())
+            elif not is_added[overlap_index]:
+                is_added[overlap_index] = True
+                full_area_groups.append(area_groups[overlap_index])
 
         return full_area_groups
             
@@ -450,35 +524,34 @@ class AreaToMass:
     def _get_first_position_scenario(self, first_positions):
         '''첫번째 진입가능한 position을 찾는다.'''
         
+        # 후보 area_group table은 공유하고, 조합은 depth first로 index tuple만 찾는다.
+        tables = [area_group_cands for _, area_group_cands, _ in first_positions]
+        mass_area = self.mass.area
+        cluster_areas = [
+            sum(area_cluster.values()) - sum([data[0] for data in first_area_data])
+            for area_cluster, _, first_area_data in first_positions
+        ]
+
+        def _is_feasible(area_groups):
+            # check_extendable의 필요조건. 각 seed가 쓸 수 있는 빈 영역은 양 옆뿐이고
+            # 빈 영역 하나는 최대 두 seed가 나눠 쓰므로, 남은 면적의 합은 빈 면적의 두배를 넘을 수 없다.
+            free_area = mass_area - sum([area_group.area for area_group in area_groups])
+            return sum(cluster_areas[: len(area_groups)]) <= free_area * 2
+
+        # 첫번째 배치는 개수를 자르지 않는다. 결과 개수와 cost는 확장 단계에서 본다.
+        found = self.search_engine.search(
+            tables, get_area_group_intervals, is_feasible=_is_feasible, limit=False
+        )
+        if len(found) == 0:
+            return []
+
         scenarios = [] # type: List[PositionScenario]
-        for area_cluster, area_group_cands, first_area_data in first_positions:
-            if len(scenarios) == 0:
-                for area_group in area_group_cands:
-                    position_scenario = PositionScenario()
-                    position_scenario.add(area_cluster, area_group, first_area_data)
-                    scenarios.append(position_scenario)
-            else:
-                next_scnearios = []
-                for scenario in scenarios:
-                    for area_group in area_group_cands:
-                        scenario_new = deepcopy(scenario)
-                        scenario_new.add(area_cluster, area_group, first_area_data)
-                        if scenario_new.is_valid():
-                            next_scnearios.append(scenario_new)
-                        else:
-                            pass
-                print("NEXT")
-                for scenario in next_scnearios:
-                    print(scenario.init_area_group_list)
-                if len(next_scnearios) == 0 :
-                    return []
-                scenarios = next_scnearios
+        for indices in found:
+            position_scenario = PositionScenario()
+            for (area_cluster, _, first_area_data), table, index in zip(first_positions, tables, indices):
+                position_scenario.add(area_cluster, table[index], first_area_data)
+            scenarios.append(position_scenario)
        
-        # res = [] 
-        # for scenario in scenarios:
-        #     if scenario.is_valid():
-        #         res.append(scenario)
-        # print(len(res))
         return scenarios
 
     def _get_first_init_position(self):
@@ -489,16 +562,19 @@ class AreaToMass:
         # sort area_distribute_option
         total_areas = [] 
 
+        # area_distribute_option은 mass가 갖고 있는 것이므로 바꾸지 않고 'total'을 뺀 dict를 만든다.
+        area_clusters = []
         for area_cluster in area_distribute_option:
-            total_areas.append(area_cluster.pop('total'))
+            total_areas.append(area_cluster['total'])
+            area_clusters.append(
+                dict([(k, v) for k, v in area_cluster.items() if k != 'total'])
+            )
             
-        sorted_list = sorted(zip(total_areas, area_distribute_option))
+        sorted_list = sorted(zip(total_areas, area_clusters))
         sorted_list.reverse()
         sorted_area_cluster = [x[1] for x in sorted_list]
         first_positions = [] 
         for area_cluster in sorted_area_cluster:
-            radial_area_groups = [area_group.duplicate() for area_group in mass.radial_area_groups]
-            
             # sort area_cluster:
             room_names = area_cluster.keys()
             areas = area_cluster.values()
@@ -514,8 +590,7 @@ class AreaToMass:
                 rooms = sorted_rooms[:i+1]
                 if sum([room[0] for room in rooms]) > 230:
                     break
-                combine_level = 0
-                matching_area_groups_from_rooms = self.find_matching_area_groups(radial_area_groups, rooms, combine_level)
+                matching_area_groups_from_rooms = self.find_matching_area_groups(mass.ring, rooms)
                 
                 matching_area_groups.extend(matching_area_groups_from_rooms)
                 
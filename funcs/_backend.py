@@ -0,0 +1,22 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+# geometry backend를 고른다. 모든 module은 Rhino.Geometry, scriptcontext 대신
+# from funcs._backend import geo, sc 를 쓴다.
+#
+# Rhino / Grasshopper 안에서는 RhinoCommon을 그대로 쓰고,
+# Rhino가 없는 CPython에서는 _headless의 순수 python 구현을 쓴다.
+# RAD_MASS_HEADLESS=1 환경변수가 있으면 Rhino 안에서도 headless를 쓴다. (결과 비교용)
+import os
+
+IS_HEADLESS = os.environ.get("RAD_MASS_HEADLESS") == "1"
+
+if not IS_HEADLESS:
+    try:
+        import Rhino.Geometry as geo  # type: ignore
+        import scriptcontext as sc  # type: ignore
+    except ImportError:
+        IS_HEADLESS = True
+
+if IS_HEADLESS:
+    from funcs import _headless as geo
+    from funcs._headless import sc
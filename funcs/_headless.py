@@ -0,0 +1,755 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+# Rhino.Geometry 중 이 패키지가 쓰는 부분만 순수 python으로 구현한 것이다.
+# Rhino가 없는 CPython(batch 서버, multiprocessing worker)에서 _backend가 geo 대신 돌려준다.
+#
+# - 모든 Curve는 점 리스트(polyline)로 들고 있다. Arc는 ARC_SEGMENT_ANGLE 간격으로 나눠서 만든다.
+# - 평면은 XY 평면만 다룬다. Z 값은 그대로 옮겨 다니기만 한다.
+# - boolean 연산은 단순 polygon(구멍 없음)끼리만 지원한다.
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Union
+except ImportError:
+    pass
+
+import math
+
+from funcs._sector import TOL, get_polyline_bbox
+
+ARC_SEGMENT_ANGLE = math.pi / 180
+
+
+class Point3d:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (Point3d, Vector3d)):
+            x, y, z = x.X, x.Y, x.Z
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __repr__(self):
+        return "Point3d({}, {}, {})".format(self.X, self.Y, self.Z)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Point3d)
+            and self.X == other.X
+            and self.Y == other.Y
+            and self.Z == other.Z
+        )
+
+    def __hash__(self):
+        return hash((self.X, self.Y, self.Z))
+
+    def __iter__(self):
+        return iter((self.X, self.Y, self.Z))
+
+    def __add__(self, other):
+        return Point3d(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Vector3d):
+            return Point3d(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+        return Vector3d(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, value):
+        return Point3d(self.X * value, self.Y * value, self.Z * value)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, value):
+        return Point3d(self.X / value, self.Y / value, self.Z / value)
+
+    def DistanceTo(self, other):
+        return math.sqrt(
+            (self.X - other.X) ** 2 + (self.Y - other.Y) ** 2 + (self.Z - other.Z) ** 2
+        )
+
+    def EpsilonEquals(self, other, epsilon):
+        return self.DistanceTo(other) <= epsilon
+
+
+class Vector3d:
+    ZAxis = None  # type: Vector3d  클래스 정의 뒤에 채운다.
+    XAxis = None  # type: Vector3d
+    YAxis = None  # type: Vector3d
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (Point3d, Vector3d)):
+            x, y, z = x.X, x.Y, x.Z
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __repr__(self):
+        return "Vector3d({}, {}, {})".format(self.X, self.Y, self.Z)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Vector3d)
+            and self.X == other.X
+            and self.Y == other.Y
+            and self.Z == other.Z
+        )
+
+    def __hash__(self):
+        return hash((self.X, self.Y, self.Z))
+
+    def __iter__(self):
+        return iter((self.X, self.Y, self.Z))
+
+    def __add__(self, other):
+        if isinstance(other, Point3d):
+            return Point3d(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+        return Vector3d(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return Vector3d(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __neg__(self):
+        return Vector3d(-self.X, -self.Y, -self.Z)
+
+    def __mul__(self, value):
+        if isinstance(value, Vector3d):  # Rhino처럼 벡터끼리 곱하면 내적
+            return self.X * value.X + self.Y * value.Y + self.Z * value.Z
+        return Vector3d(self.X * value, self.Y * value, self.Z * value)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, value):
+        return Vector3d(self.X / value, self.Y / value, self.Z / value)
+
+    @property
+    def Length(self):
+        return math.sqrt(self.X**2 + self.Y**2 + self.Z**2)
+
+    def Unitize(self):
+        length = self.Length
+        if length == 0:
+            return False
+        self.X /= length
+        self.Y /= length
+        self.Z /= length
+        return True
+
+    def EpsilonEquals(self, other, epsilon):
+        return (
+            abs(self.X - other.X) <= epsilon
+            and abs(self.Y - other.Y) <= epsilon
+            and abs(self.Z - other.Z) <= epsilon
+        )
+
+
+Vector3d.XAxis = Vector3d(1, 0, 0)
+Vector3d.YAxis = Vector3d(0, 1, 0)
+Vector3d.ZAxis = Vector3d(0, 0, 1)
+
+
+class Interval:
+    def __init__(self, t0, t1):
+        self.T0 = t0
+        self.T1 = t1
+
+    def __repr__(self):
+        return "Interval({}, {})".format(self.T0, self.T1)
+
+    @property
+    def Length(self):
+        return self.T1 - self.T0
+
+    @property
+    def Min(self):
+        return min(self.T0, self.T1)
+
+    @property
+    def Max(self):
+        return max(self.T0, self.T1)
+
+    @property
+    def IsValid(self):
+        return self.T0 <= self.T1
+
+    @staticmethod
+    def FromIntersection(a, b):
+        # 겹치지 않으면 Length가 음수인(IsValid가 아닌) 구간이 된다.
+        return Interval(max(a.Min, b.Min), min(a.Max, b.Max))
+
+
+class Plane:
+    WorldXY = None  # type: Plane
+
+    def __init__(self, origin=None, normal=None):
+        self.Origin = Point3d(origin) if origin is not None else Point3d()
+        self.Normal = Vector3d(normal) if normal is not None else Vector3d(Vector3d.ZAxis)
+
+
+Plane.WorldXY = Plane()
+
+
+class PointContainment:
+    Unset = 0
+    Inside = 1
+    Outside = 2
+    Coincident = 3
+
+
+class BoundingBox:
+    def __init__(self, min_point, max_point):
+        self.Min = Point3d(min_point)
+        self.Max = Point3d(max_point)
+
+    @property
+    def IsValid(self):
+        return (
+            self.Min.X <= self.Max.X
+            and self.Min.Y <= self.Max.Y
+            and self.Min.Z <= self.Max.Z
+        )
+
+    def Contains(self, point):
+        return (
+            self.Min.X <= point.X <= self.Max.X
+            and self.Min.Y <= point.Y <= self.Max.Y
+            and self.Min.Z <= point.Z <= self.Max.Z
+        )
+
+    @staticmethod
+    def Intersection(a, b):
+        return BoundingBox(
+            Point3d(max(a.Min.X, b.Min.X), max(a.Min.Y, b.Min.Y), max(a.Min.Z, b.Min.Z)),
+            Point3d(min(a.Max.X, b.Max.X), min(a.Max.Y, b.Max.Y), min(a.Max.Z, b.Max.Z)),
+        )
+
+
+class Line:
+    def __init__(self, start, end):
+        self.From = Point3d(start)
+        self.To = Point3d(end)
+
+    @property
+    def Length(self):
+        return self.From.DistanceTo(self.To)
+
+
+class Circle:
+    def __init__(self, center, radius):
+        self.Center = Point3d(center)
+        self.Radius = radius
+
+
+class Arc:
+    def __init__(self, circle, angle_interval):
+        # type: (Circle, Interval) -> None
+        self.Center = circle.Center
+        self.Radius = circle.Radius
+        self.AngleDomain = angle_interval
+
+    def PointAt(self, angle):
+        return Point3d(
+            self.Center.X + self.Radius * math.cos(angle),
+            self.Center.Y + self.Radius * math.sin(angle),
+            self.Center.Z,
+        )
+
+    def get_points(self):
+        # type: () -> List[Point3d]
+        a1 = self.AngleDomain.T0
+        a2 = self.AngleDomain.T1
+        count = max(1, int(math.ceil(abs(a2 - a1) / ARC_SEGMENT_ANGLE - 1e-9)))
+        return [self.PointAt(a1 + (a2 - a1) * i / count) for i in range(count + 1)]
+
+
+class Polyline(list):
+    """Point3d의 리스트"""
+
+    def __init__(self, points=None):
+        super(Polyline, self).__init__([Point3d(pt) for pt in points or []])
+
+    @property
+    def Count(self):
+        return len(self)
+
+    @property
+    def IsClosed(self):
+        return len(self) > 2 and self[0].EpsilonEquals(self[-1], TOL)
+
+    def ToNurbsCurve(self):
+        return PolylineCurve(self)
+
+    def ToPolylineCurve(self):
+        return PolylineCurve(self)
+
+
+class Curve:
+    """점 리스트로 근사한 curve. is_polyline은 근사 없이 정확히 polyline인지를 뜻한다."""
+
+    def __init__(self, points, is_polyline=True):
+        # type: (List[Point3d], bool) -> None
+        self.points = [Point3d(pt) for pt in points]
+        self.is_polyline = is_polyline
+
+    def __repr__(self):
+        return "{}({} points)".format(type(self).__name__, len(self.points))
+
+    @property
+    def xy(self):
+        # type: () -> List[Tuple[float, float]]
+        return [(pt.X, pt.Y) for pt in self.points]
+
+    @property
+    def PointAtStart(self):
+        return Point3d(self.points[0])
+
+    @property
+    def PointAtEnd(self):
+        return Point3d(self.points[-1])
+
+    @property
+    def IsClosed(self):
+        return len(self.points) > 2 and self.points[0].EpsilonEquals(self.points[-1], TOL)
+
+    @property
+    def PointCount(self):
+        return len(self.points)
+
+    def Point(self, index):
+        return Point3d(self.points[index])
+
+    def GetLength(self):
+        return sum(
+            [self.points[i - 1].DistanceTo(self.points[i]) for i in range(1, len(self.points))]
+        )
+
+    def GetBoundingBox(self, _=True):
+        xs = [pt.X for pt in self.points]
+        ys = [pt.Y for pt in self.points]
+        zs = [pt.Z for pt in self.points]
+        return BoundingBox(
+            Point3d(min(xs), min(ys), min(zs)), Point3d(max(xs), max(ys), max(zs))
+        )
+
+    def DuplicateCurve(self):
+        return type(self)._from_points(self.points, self.is_polyline)
+
+    @classmethod
+    def _from_points(cls, points, is_polyline):
+        curve = Curve.__new__(cls)
+        Curve.__init__(curve, points, is_polyline)
+        return curve
+
+    def ToNurbsCurve(self):
+        return self.DuplicateCurve()
+
+    def Reverse(self):
+        self.points.reverse()
+        return True
+
+    def Translate(self, vector):
+        self.points = [pt + vector for pt in self.points]
+        return True
+
+    def TryGetPolyline(self):
+        if not self.is_polyline:
+            return False, None
+        return True, Polyline(self.points)
+
+    def ToPolyline(self, *_):
+        return PolylineCurve(self.points)
+
+    def get_signed_area(self):
+        # type: () -> float
+        points = self.xy
+        return sum(
+            [
+                points[i - 1][0] * points[i][1] - points[i][0] * points[i - 1][1]
+                for i in range(len(points))
+            ]
+        ) / 2
+
+    def TryGetPlane(self, _=TOL):
+        # 닫힌 curve는 반시계 방향이면 +Z, 시계 방향이면 -Z를 normal로 본다.
+        normal = Vector3d.ZAxis
+        if self.IsClosed and self.get_signed_area() < 0:
+            normal = -Vector3d.ZAxis
+        return True, Plane(self.points[0], normal)
+
+    def Contains(self, point, _=None, tolerance=TOL):
+        if not self.IsClosed:
+            return PointContainment.Unset
+        x, y = point.X, point.Y
+        if get_distance_to_polyline(x, y, self.xy) <= tolerance:
+            return PointContainment.Coincident
+        if is_pt_inside_polygon(x, y, self.xy):
+            return PointContainment.Inside
+        return PointContainment.Outside
+
+    @staticmethod
+    def JoinCurves(curves, tolerance=TOL):
+        return join_curves(curves, tolerance)
+
+    @staticmethod
+    def CreateBooleanIntersection(curves_a, curves_b, tolerance=TOL):
+        return boolean_regions(curves_a, curves_b, "intersection", tolerance)
+
+    @staticmethod
+    def CreateBooleanDifference(curves_a, curves_b, tolerance=TOL):
+        return boolean_regions(curves_a, curves_b, "difference", tolerance)
+
+
+class PolylineCurve(Curve):
+    def __init__(self, points):
+        super(PolylineCurve, self).__init__(points, True)
+
+
+class ArcCurve(Curve):
+    def __init__(self, arc):
+        # type: (Arc) -> None
+        super(ArcCurve, self).__init__(arc.get_points(), False)
+        self.Arc = arc
+
+
+class Extrusion:
+    """headless 에서는 solid를 만들지 않고 profile과 높이만 기억한다."""
+
+    def __init__(self, profile, height):
+        self.profile = profile
+        self.height = height
+
+    @staticmethod
+    def Create(profile, height, cap=True):
+        if not profile.IsClosed:
+            return None
+        return Extrusion(profile.DuplicateCurve(), height)
+
+    def ToBrep(self):
+        return self
+
+
+class _CurveIntersectionEvent:
+    def __init__(self, point):
+        self.PointA = point
+        self.PointB = point
+
+
+class _Intersection:
+    @staticmethod
+    def CurveCurve(curve_a, curve_b, tolerance=TOL, _=TOL):
+        # type: (Curve, Curve, float, float) -> List[_CurveIntersectionEvent]
+        events = []
+        points_a = curve_a.xy
+        points_b = curve_b.xy
+        for i in range(1, len(points_a)):
+            for j in range(1, len(points_b)):
+                for _, _, point in get_segment_intersections(
+                    points_a[i - 1], points_a[i], points_b[j - 1], points_b[j], tolerance
+                ):
+                    events.append(
+                        _CurveIntersectionEvent(
+                            Point3d(point[0], point[1], curve_a.points[i].Z)
+                        )
+                    )
+        return events
+
+
+class Intersect:
+    Intersection = _Intersection
+
+
+class StickyStore(dict):
+    """scriptcontext.sticky 대신 쓰는 저장소. 디버그용 저장이므로 아무것도 기억하지 않는다."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class ScriptContext:
+    def __init__(self):
+        self.sticky = StickyStore()
+
+
+sc = ScriptContext()
+
+
+# ---------------------------------------------------------------------------
+# polyline 계산
+
+
+def get_distance_to_polyline(x, y, points):
+    # type: (float, float, List[Tuple[float, float]]) -> float
+    distance = float("inf")
+    for i in range(1, len(points)):
+        (x1, y1), (x2, y2) = points[i - 1], points[i]
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy
+        t = 0.0 if length2 == 0 else ((x - x1) * dx + (y - y1) * dy) / length2
+        t = min(max(t, 0.0), 1.0)
+        distance = min(distance, math.hypot(x1 + t * dx - x, y1 + t * dy - y))
+    return distance
+
+
+def is_pt_inside_polygon(x, y, polygon):
+    # type: (float, float, List[Tuple[float, float]]) -> bool
+    """crossing number 방식의 point in polygon.
+    polygon은 닫혀있다고 가정하고, 마지막 점이 첫 점과 같아도 상관없다."""
+    inside = False
+    count = len(polygon)
+    for i in range(count):
+        x1, y1 = polygon[i - 1]
+        x2, y2 = polygon[i]
+        if (y1 > y) != (y2 > y):
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            if x < x_cross:
+                inside = not inside
+    return inside
+
+
+def get_segment_intersections(p1, p2, q1, q2, tol=TOL):
+    # type: (Tuple[float, float], Tuple[float, float], Tuple[float, float], Tuple[float, float], float) -> List[Tuple[float, float, Tuple[float, float]]]
+    """선분 p1p2, q1q2의 교점들을 (p 위의 t, q 위의 u, 점)으로 돌려준다.
+    끝점이 닿는 경우를 포함하고, 평행하게 겹치면 겹치는 구간의 양 끝을 돌려준다."""
+    rx, ry = p2[0] - p1[0], p2[1] - p1[1]
+    sx, sy = q2[0] - q1[0], q2[1] - q1[1]
+    r_length = math.hypot(rx, ry)
+    s_length = math.hypot(sx, sy)
+    if r_length == 0 or s_length == 0:
+        return []
+    denom = rx * sy - ry * sx
+    qpx, qpy = q1[0] - p1[0], q1[1] - p1[1]
+    t_tol = tol / r_length
+    u_tol = tol / s_length
+
+    if abs(denom) > tol * max(r_length, s_length):
+        t = (qpx * sy - qpy * sx) / denom
+        u = (qpx * ry - qpy * rx) / denom
+        if -t_tol <= t <= 1 + t_tol and -u_tol <= u <= 1 + u_tol:
+            t = min(max(t, 0.0), 1.0)
+            u = min(max(u, 0.0), 1.0)
+            return [(t, u, (p1[0] + t * rx, p1[1] + t * ry))]
+        return []
+
+    # 평행한 경우. 같은 직선 위에 있지 않으면 만나지 않는다.
+    if abs(qpx * ry - qpy * rx) / r_length > tol:
+        return []
+    r_length2 = r_length * r_length
+    res = []
+    for point in (q1, q2):
+        t = ((point[0] - p1[0]) * rx + (point[1] - p1[1]) * ry) / r_length2
+        if -t_tol <= t <= 1 + t_tol:
+            u = 0.0 if point is q1 else 1.0
+            res.append((min(max(t, 0.0), 1.0), u, point))
+    for t, point in ((0.0, p1), (1.0, p2)):
+        u = ((point[0] - q1[0]) * sx + (point[1] - q1[1]) * sy) / (s_length * s_length)
+        if -u_tol <= u <= 1 + u_tol:
+            res.append((t, min(max(u, 0.0), 1.0), point))
+    return res
+
+
+def join_curves(curves, tolerance=TOL):
+    # type: (List[Curve], float) -> List[Curve]
+    """끝점이 tolerance 안에서 만나는 curve들을 이어 붙인다. 필요하면 뒤집어서 붙인다."""
+    remaining = [curve for curve in curves if curve is not None]
+    joined = []
+    while remaining:
+        first = remaining.pop(0)
+        points = list(first.points)
+        is_polyline = first.is_polyline
+        extended = True
+        while extended and not (
+            len(points) > 2 and points[0].EpsilonEquals(points[-1], tolerance)
+        ):
+            extended = False
+            for i, curve in enumerate(remaining):
+                candidate = curve.points
+                if points[-1].EpsilonEquals(candidate[0], tolerance):
+                    points.extend(candidate[1:])
+                elif points[-1].EpsilonEquals(candidate[-1], tolerance):
+                    points.extend(list(reversed(candidate))[1:])
+                elif points[0].EpsilonEquals(candidate[-1], tolerance):
+                    points = list(candidate[:-1]) + points
+                elif points[0].EpsilonEquals(candidate[0], tolerance):
+                    points = list(reversed(candidate))[:-1] + points
+                else:
+                    continue
+                is_polyline = is_polyline and curve.is_polyline
+                remaining.pop(i)
+                extended = True
+                break
+        if len(points) > 2 and points[0].EpsilonEquals(points[-1], tolerance):
+            points[-1] = Point3d(points[0])
+        joined.append(Curve(points, is_polyline))
+    return joined
+
+
+# ---------------------------------------------------------------------------
+# boolean region 연산
+
+
+class _PointSnapper:
+    """tol 안에 있는 점들을 하나의 점으로 모은다. 선분을 이어 붙일 때 key로 쓴다."""
+
+    def __init__(self, tol):
+        self.tol = tol
+        self.cells = {}  # type: Dict[Tuple[int, int], List[Tuple[float, float]]]
+
+    def snap(self, point):
+        # type: (Tuple[float, float]) -> Tuple[float, float]
+        ix = int(math.floor(point[0] / self.tol))
+        iy = int(math.floor(point[1] / self.tol))
+        for cx in (ix - 1, ix, ix + 1):
+            for cy in (iy - 1, iy, iy + 1):
+                for candidate in self.cells.get((cx, cy), ()):
+                    if math.hypot(candidate[0] - point[0], candidate[1] - point[1]) <= self.tol:
+                        return candidate
+        self.cells.setdefault((ix, iy), []).append(point)
+        return point
+
+
+def _get_ccw_polygon(points):
+    # type: (List[Tuple[float, float]]) -> List[Tuple[float, float]]
+    polygon = list(points)
+    if len(polygon) > 1 and polygon[0] == polygon[-1]:
+        polygon = polygon[:-1]
+    area = sum(
+        [
+            polygon[i - 1][0] * polygon[i][1] - polygon[i][0] * polygon[i - 1][1]
+            for i in range(len(polygon))
+        ]
+    )
+    if area < 0:
+        polygon.reverse()
+    return polygon
+
+
+def _split_edges(polygon_a, polygon_b, tol):
+    # type: (List[Tuple[float, float]], List[Tuple[float, float]], float) -> Tuple[List, List]
+    # 두 polygon의 교점에서 각 변을 나눈다.
+    splits_a = [[(0.0, polygon_a[i]), (1.0, polygon_a[(i + 1) % len(polygon_a)])] for i in range(len(polygon_a))]
+    splits_b = [[(0.0, polygon_b[j]), (1.0, polygon_b[(j + 1) % len(polygon_b)])] for j in range(len(polygon_b))]
+    bbox_b = get_polyline_bbox(polygon_b)
+    for i in range(len(polygon_a)):
+        p1 = polygon_a[i]
+        p2 = polygon_a[(i + 1) % len(polygon_a)]
+        if (
+            max(p1[0], p2[0]) < bbox_b[0] - tol
+            or min(p1[0], p2[0]) > bbox_b[2] + tol
+            or max(p1[1], p2[1]) < bbox_b[1] - tol
+            or min(p1[1], p2[1]) > bbox_b[3] + tol
+        ):
+            continue
+        for j in range(len(polygon_b)):
+            q1 = polygon_b[j]
+            q2 = polygon_b[(j + 1) % len(polygon_b)]
+            for t, u, point in get_segment_intersections(p1, p2, q1, q2, tol):
+                splits_a[i].append((t, point))
+                splits_b[j].append((u, point))
+
+    def _to_edges(splits):
+        edges = []
+        for split in splits:
+            split.sort(key=lambda item: item[0])
+            for k in range(1, len(split)):
+                edges.append((split[k - 1][1], split[k][1]))
+        return edges
+
+    return _to_edges(splits_a), _to_edges(splits_b)
+
+
+def _classify(edge, polygon, tol):
+    # type: (Tuple, List[Tuple[float, float]], float) -> str
+    """edge의 중점이 polygon 안(inside), 밖(outside), 경계 위에서 같은 방향(same),
+    반대 방향(opposite) 중 어디인지"""
+    (x1, y1), (x2, y2) = edge
+    x, y = (x1 + x2) / 2, (y1 + y2) / 2
+    closed = polygon + [polygon[0]]
+    if get_distance_to_polyline(x, y, closed) <= tol:
+        best = None
+        for i in range(1, len(closed)):
+            distance = get_distance_to_polyline(x, y, [closed[i - 1], closed[i]])
+            if best is None or distance < best[0]:
+                best = (distance, closed[i - 1], closed[i])
+        _, q1, q2 = best
+        dot = (x2 - x1) * (q2[0] - q1[0]) + (y2 - y1) * (q2[1] - q1[1])
+        return "same" if dot > 0 else "opposite"
+    return "inside" if is_pt_inside_polygon(x, y, polygon) else "outside"
+
+
+def _chain_edges(edges, snapper):
+    # type: (List[Tuple], _PointSnapper) -> List[List[Tuple[float, float]]]
+    outgoing = {}  # type: Dict[Tuple[float, float], List[int]]
+    snapped = []
+    for start, end in edges:
+        start = snapper.snap(start)
+        end = snapper.snap(end)
+        if start == end:
+            continue
+        outgoing.setdefault(start, []).append(len(snapped))
+        snapped.append((start, end))
+
+    used = [False] * len(snapped)
+    loops = []
+    for first in range(len(snapped)):
+        if used[first]:
+            continue
+        used[first] = True
+        start, end = snapped[first]
+        loop = [start, end]
+        while end != start:
+            candidates = [k for k in outgoing.get(end, []) if not used[k]]
+            if not candidates:
+                break
+            used[candidates[0]] = True
+            end = snapped[candidates[0]][1]
+            loop.append(end)
+        if end == start and len(loop) > 3:
+            loops.append(loop)
+    return loops
+
+
+def _boolean_polygons(polygon_a, polygon_b, operation, tol):
+    # type: (List[Tuple[float, float]], List[Tuple[float, float]], str, float) -> List[List[Tuple[float, float]]]
+    polygon_a = _get_ccw_polygon(polygon_a)
+    polygon_b = _get_ccw_polygon(polygon_b)
+    edges_a, edges_b = _split_edges(polygon_a, polygon_b, tol)
+    if operation == "intersection":
+        keep_a = ["inside", "same"]
+        keep_b = ["inside"]
+        reverse_b = False
+    elif operation == "difference":
+        keep_a = ["outside", "opposite"]
+        keep_b = ["inside"]
+        reverse_b = True
+    else:
+        raise Exception("unknown boolean operation : {}".format(operation))
+
+    edges = [edge for edge in edges_a if _classify(edge, polygon_b, tol) in keep_a]
+    for edge in edges_b:
+        if _classify(edge, polygon_a, tol) in keep_b:
+            edges.append((edge[1], edge[0]) if reverse_b else edge)
+    return _chain_edges(edges, _PointSnapper(tol))
+
+
+def boolean_regions(curves_a, curves_b, operation, tolerance=TOL):
+    # type: (Union[Curve, List[Curve]], Union[Curve, List[Curve]], str, float) -> List[Curve]
+    """닫힌 curve(들) A, B의 교집합 / 차집합 영역 curve들.
+    A, B가 여러개이면 A의 각 영역에 B를 차례로 적용한다."""
+    if isinstance(curves_a, Curve):
+        curves_a = [curves_a]
+    if isinstance(curves_b, Curve):
+        curves_b = [curves_b]
+    regions = [curve.xy for curve in curves_a if curve.IsClosed]
+    z = curves_a[0].points[0].Z if curves_a else 0.0
+
+    if operation == "intersection":
+        res = []
+        for region in regions:
+            for curve in curves_b:
+                res.extend(_boolean_polygons(region, curve.xy, operation, tolerance))
+        regions = res
+    else:
+        for curve in curves_b:
+            res = []
+            for region in regions:
+                res.extend(_boolean_polygons(region, curve.xy, operation, tolerance))
+            regions = res
+    return [PolylineCurve([Point3d(x, y, z) for x, y in region]) for region in regions]
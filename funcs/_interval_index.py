@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import math
+from bisect import bisect_left
+
+TWO_PI = math.pi * 2
+OVERLAP_TOL = 0.2  # _utils.check_interval_intersection과 같은 기준
+
+
+def get_angle_intervals(a1, a2):
+    # type: (float, float) -> List[Tuple[float, float]]
+    """_utils.get_ag_interaval의 geo.Interval 없는 버전.
+    [0, 2pi)를 넘어가는 부분은 두개로 나눠서 돌려준다."""
+    if a1 < 0:
+        return [(0.0, a2), (a1 + TWO_PI, TWO_PI)]
+    if a2 > TWO_PI:
+        return [(a1, TWO_PI), (0.0, a2 - TWO_PI)]
+    return [(a1, a2)]
+
+
+def get_area_group_intervals(area_group):
+    # type: (Any) -> List[Tuple[float, float]]
+    return get_angle_intervals(area_group.radial_area.a1, area_group.radial_area.a2)
+
+
+def get_overlap(interval_1, interval_2):
+    # type: (Tuple[float, float], Tuple[float, float]) -> float
+    return min(interval_1[1], interval_2[1]) - max(interval_1[0], interval_2[0])
+
+
+class AngularIntervalIndex:
+    """
+    이미 배치된(commit 된) area group들의 각도 구간을 시작 각도 순으로 정렬해서 들고 있다.
+    새 구간이 기존 구간들과 OVERLAP_TOL 보다 많이 겹치는지를 확인할 때
+    bisect로 end - tol 앞에서 시작하는 구간들만 보고, 앞에서부터의 end 최대값(max_ends)이
+    start + tol 이하가 되면 멈춘다. 구간들이 서로 거의 겹치지 않으면 몇 개만 보지만,
+    긴 구간이 앞에 있으면 그 사이의 구간들을 모두 본다. (최악 O(n))
+    조합이 늘어날 때는 added로 부모 index를 복사해서 늘려 쓴다.
+    복사와 insert는 O(n)이지만 n은 한 조합의 구간 수(seed 수 정도)이다.
+    """
+
+    def __init__(self, intervals=None):
+        # type: (Optional[List[Tuple[float, float]]]) -> None
+        self.intervals = []  # type: List[Tuple[float, float]]
+        self.max_ends = []  # type: List[float]  앞에서부터의 end 최대값
+        for interval in intervals or []:
+            self.add_interval(interval)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def _update_max_ends(self, start_index):
+        del self.max_ends[start_index:]
+        max_end = self.max_ends[-1] if self.max_ends else -math.inf
+        for interval in self.intervals[start_index:]:
+            max_end = max(max_end, interval[1])
+            self.max_ends.append(max_end)
+
+    def add_interval(self, interval):
+        # type: (Tuple[float, float]) -> None
+        position = bisect_left(self.intervals, interval)
+        self.intervals.insert(position, interval)
+        self._update_max_ends(position)
+
+    def add(self, intervals):
+        # type: (List[Tuple[float, float]]) -> None
+        for interval in intervals:
+            self.add_interval(interval)
+
+    def added(self, intervals):
+        # type: (List[Tuple[float, float]]) -> AngularIntervalIndex
+        """intervals를 더한 새 index. 자신은 바뀌지 않는다."""
+        index = AngularIntervalIndex()
+        index.intervals = list(self.intervals)
+        index.max_ends = list(self.max_ends)
+        index.add(intervals)
+        return index
+
+    def overlaps_interval(self, interval, tol=OVERLAP_TOL):
+        # type: (Tuple[float, float], float) -> bool
+        start, end = interval
+        # 시작 각도가 end - tol 보다 앞에 있는 구간들만 후보이다.
+        i = bisect_left(self.intervals, (end - tol,)) - 1
+        while i >= 0 and self.max_ends[i] > start + tol:
+            if get_overlap(self.intervals[i], interval) > tol:
+                return True
+            i -= 1
+        return False
+
+    def overlaps(self, intervals, tol=OVERLAP_TOL):
+        # type: (List[Tuple[float, float]], float) -> bool
+        return any(self.overlaps_interval(interval, tol) for interval in intervals)
+
+
+def get_first_overlaps(intervals_list, groups_intervals_list, tol=OVERLAP_TOL):
+    # type: (List[List[Tuple[float, float]]], List[List[Tuple[float, float]]], float) -> List[Optional[int]]
+    """intervals_list의 각 구간들과 tol 보다 많이 겹치는 group 중
+    groups_intervals_list 순서로 첫번째 group의 index. 없으면 None
+    _utils.check_area_group_intersection을 모든 쌍에 대해 부르는 것과 같은 결과이다.
+    양쪽 구간을 시작 각도 순으로 정렬해 두고 한번 훑으면서 겹칠 수 있는 구간만 본다."""
+    items = sorted(
+        [
+            (interval, i)
+            for i, intervals in enumerate(intervals_list)
+            for interval in intervals
+        ]
+    )
+    group_items = sorted(
+        [
+            (interval, i)
+            for i, intervals in enumerate(groups_intervals_list)
+            for interval in intervals
+        ]
+    )
+    res = [None] * len(intervals_list)  # type: List[Optional[int]]
+    active = []  # type: List[Tuple[Tuple[float, float], int]]
+    j = 0
+    for interval, i in items:
+        start, end = interval
+        # 시작이 end - tol 보다 앞인 group 구간을 더하고, start + tol 전에 끝나는 구간은 뺀다.
+        # 구간의 시작 각도는 계속 커지므로 뺀 구간은 다시 볼 필요가 없다.
+        while j < len(group_items) and group_items[j][0][0] < end - tol:
+            active.append(group_items[j])
+            j += 1
+        active = [item for item in active if item[0][1] > start + tol]
+        for group_interval, group_index in active:
+            if get_overlap(interval, group_interval) > tol and (
+                res[i] is None or group_index < res[i]
+            ):
+                res[i] = group_index
+    return res
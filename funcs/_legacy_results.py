@@ -0,0 +1,107 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Iterator
+except ImportError:
+    pass
+
+import os
+import pickle
+import struct
+
+from funcs.base import MassResults, MassResult
+from funcs._result_store import (
+    STORE_EXTENSION,
+    StoredPoint,
+    StoredRadialArea,
+    StoredAreaGroup,
+    save_mass_results,
+)
+from funcs._sweep import parse_shard_name
+
+# 예전 shard는 fx 패키지 시절에 만들어졌다.
+LEGACY_CLASSES = {
+    "MassResults": MassResults,
+    "MassResult": MassResult,
+    "RadialAreaGroup": StoredAreaGroup,
+    "RadialArea": StoredRadialArea,
+}
+LEGACY_MODULES = ["fx.base", "fx._radial_mass", "funcs.base", "funcs._radial_mass"]
+CLR_TYPES = [b"Rhino.Geometry.Point3d", b"Rhino.Geometry.Vector3d"]
+
+
+def deserialize_clr(_, payload):
+    # type: (Any, str) -> StoredPoint
+    """IronPython의 clr.Deserialize 대신 쓴다.
+    Point3d, Vector3d의 .NET BinaryFormatter payload는
+    끝의 MessageEnd(0x0B) 바로 앞에 X, Y, Z double 세개가 있다."""
+    data = payload.encode("latin-1")
+    if not any(clr_type in data for clr_type in CLR_TYPES) or data[-1:] != b"\x0b":
+        raise pickle.UnpicklingError("unsupported clr payload")
+    x, y, z = struct.unpack("<3d", data[-25:-1])
+    return StoredPoint(x, y, z)
+
+
+class LegacyUnpickler(pickle.Unpickler):
+    """RhinoCommon 없이 예전 *results.pickle을 읽는다.
+    Point3d / Vector3d는 StoredPoint로, RadialAreaGroup / RadialArea는
+    _result_store의 가벼운 대체 클래스로 읽고, 그 외의 클래스는 읽지 않는다."""
+
+    def find_class(self, module, name):
+        if module == "clr" and name == "Deserialize":
+            return deserialize_clr
+        if module in LEGACY_MODULES and name in LEGACY_CLASSES:
+            return LEGACY_CLASSES[name]
+        raise pickle.UnpicklingError("{}.{} is not allowed".format(module, name))
+
+
+def load_legacy_shard(path):
+    # type: (str) -> MassResults
+    with open(path, "rb") as f:
+        mass_results = LegacyUnpickler(f).load()
+    if not hasattr(mass_results, "outputs"):
+        raise pickle.UnpicklingError("{} is not a MassResults shard".format(path))
+    for mass_result in mass_results.outputs:
+        if not hasattr(mass_result, "skipped_cluster"):  # 초기 shard에는 없다.
+            mass_result.skipped_cluster = []
+    return mass_results
+
+
+def iter_legacy_results(path):
+    # type: (str) -> Iterator[Tuple[MassResults, MassResult]]
+    """shard의 MassResult를 하나씩 돌려준다. (MassResults는 radius, point 등 참고용)
+    pickle은 나눠 읽을 수 없어서 처음에 shard 전체를 unpickle 한다.
+    그래서 최대 메모리는 shard 하나만큼이고, 돌려준 결과를 shard의 outputs에서 빼서
+    다 쓴 결과가 그 뒤로 메모리에 남지 않게 할 뿐이다."""
+    mass_results = load_legacy_shard(path)
+    outputs = mass_results.outputs
+    mass_results.outputs = []
+    for i in range(len(outputs)):
+        mass_result = outputs[i]
+        outputs[i] = None
+        yield mass_results, mass_result
+
+
+def iter_legacy_shards(folders):
+    # type: (List[str]) -> Iterator[str]
+    """folder들 안의 mass{m}_{r}_{p}_{n}results.pickle 경로"""
+    for folder in folders:
+        for file_name in sorted(os.listdir(folder)):
+            if parse_shard_name(file_name) is not None:
+                yield os.path.join(folder, file_name)
+
+
+def convert_legacy_folder(src_folder, dst_folder):
+    # type: (str, str) -> List[str]
+    """src_folder의 pickle shard를 같은 이름의 .npz로 dst_folder에 저장한다.
+    이미 변환된 shard는 건너뛴다."""
+    if not os.path.isdir(dst_folder):
+        os.makedirs(dst_folder)
+    converted = []
+    for path in iter_legacy_shards([src_folder]):
+        file_name = os.path.splitext(os.path.basename(path))[0] + STORE_EXTENSION
+        dst_path = os.path.join(dst_folder, file_name)
+        if not os.path.exists(dst_path):
+            save_mass_results(dst_path, load_legacy_shard(path))
+        converted.append(dst_path)
+    return converted
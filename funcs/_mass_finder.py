@@ -1,18 +1,19 @@
 # -*- coding:utf-8 -*-
 # pylint: disable=bare-except
 try:
-    from typing import List, Tuple, Dict, Any, Optional
+    from typing import List, Tuple, Dict, Any, Optional, Iterator
 except ImportError:
     pass
 
-import Rhino.Geometry as geo  # type: ignore
+from funcs._backend import geo
 
 from funcs._site import Site
 from funcs._radial_mass import RadialMass
 from funcs._radial_mass import RadialMass
 from funcs._area_to_mass import AreaToMass
 from funcs.base import MassResult
-from copy import deepcopy
+from funcs._search import SearchEngine
+from funcs._metrics import unique_layouts, iter_unique_layouts
 
 
 def points_from_bounding_box(bounding_rect, step):
@@ -98,9 +99,8 @@ class RadialMassFinder:
         self.masses[1].set_target_area(self.area_option_a2)
         self.masses[2].set_target_area(self.area_option_b)
 
-    def finalize(self, mass_index, center_radius):
-        # type: (int, int)-> None
-        """Mass 센터에 원형 외부공간을 만들고, Area를 Set시킨다."""
+    def _get_area_to_mass(self, mass_index, center_radius, search_engine=None):
+        # type: (int, int, Optional[SearchEngine]) -> AreaToMass
         # mass 선택
         # mass 0 은 a1
         # mass 1 은 a2
@@ -109,26 +109,50 @@ class RadialMassFinder:
         # cluster선택은 첫번째 것만 사용한다.(시간상...)
         area_distribute_option = mass.area_distribute_options[0]
 
-        target_area_distribution = deepcopy(area_distribute_option)
-
         # 중심을 비운다.
         mass.create_center(center_radius)
 
-        area_to_mass = AreaToMass(mass, target_area_distribution)
-        res, skipped_cluster = area_to_mass.process()
-        outputs = []
+        return AreaToMass(mass, area_distribute_option, search_engine)
 
+    @staticmethod
+    def _expand_result(area_groups, skipped_cluster):
+        # type: (List[Any], List) -> MassResult
         # horizontal expand
         # 수평으로 확장시도
-        for area_groups in res:
-            new_area_groups = []
-            seed_area_groups = [
-                area_group for area_group in area_groups if area_group.is_area_set
-            ]
-
-            for area_group in seed_area_groups:
-                expanded_area_group = area_group.horizontal_expand()
-                new_area_groups.append(expanded_area_group)
-
-            outputs.append(MassResult(new_area_groups, skipped_cluster))
-        return outputs
+        new_area_groups = []
+        seed_area_groups = [
+            area_group for area_group in area_groups if area_group.is_area_set
+        ]
+
+        for area_group in seed_area_groups:
+            expanded_area_group = area_group.horizontal_expand()
+            new_area_groups.append(expanded_area_group)
+
+        return MassResult(new_area_groups, skipped_cluster)
+
+    def finalize(self, mass_index, center_radius, search_engine=None):
+        # type: (int, int, Optional[SearchEngine])-> List[MassResult]
+        """Mass 센터에 원형 외부공간을 만들고, Area를 Set시킨다.
+        search_engine으로 결과 개수, objective, 시간 제한을 줄 수 있다."""
+        area_to_mass = self._get_area_to_mass(mass_index, center_radius, search_engine)
+        res, skipped_cluster = area_to_mass.process()
+        outputs = [self._expand_result(area_groups, skipped_cluster) for area_groups in res]
+
+        # 확장 후에 같아진 배치도 저장하지 않는다.
+        return unique_layouts(outputs, get_area_groups=lambda output: output.area_groups)
+
+    def iter_finalize(self, mass_index, center_radius, search_engine=None):
+        # type: (int, int, Optional[SearchEngine]) -> Iterator[MassResult]
+        """finalize의 generator 버전. 수평 확장까지 끝난 MassResult를 하나씩 돌려준다.
+        결과 전체를 메모리에 들고 있지 않으므로, 필요한 만큼만 꺼내고 멈출 수 있다.
+        objective가 있어도 전체 정렬은 하지 않는다. (AreaToMass.iter_results 참고)"""
+        area_to_mass = self._get_area_to_mass(mass_index, center_radius, search_engine)
+        outputs = (
+            self._expand_result(area_groups, area_to_mass.skipped_area_cluster)
+            for area_groups in area_to_mass.iter_results()
+        )
+        # 확장 후에 같아진 배치도 돌려주지 않는다.
+        for output in iter_unique_layouts(
+            outputs, get_area_groups=lambda output: output.area_groups
+        ):
+            yield output
@@ -0,0 +1,111 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Iterable, Iterator
+except ImportError:
+    pass
+
+import math
+
+LENGTH_DEPTH_RATIO = 0.8
+TWO_PI = math.pi * 2
+# fingerprint에서 각도(rad), 반지름(m)을 반올림하는 자리수
+FINGERPRINT_ANGLE_DIGITS = 3
+FINGERPRINT_RADIUS_DIGITS = 2
+# 3m 미만이라 room을 앉히지 않는 area_group의 area_data (PositionScenario.filter_invalid_radius)
+INVALID_AREA_DATA = ("invalid", 0)
+
+
+def get_shape_ok(a1, a2, r1, r2):
+    # type: (float, float, float, float) -> bool
+    """안쪽 호의 길이가 깊이에 비해 충분히 긴지 확인한다."""
+    if r2 <= r1:
+        return False
+    return r1 * (a2 - a1) / (r2 - r1) > LENGTH_DEPTH_RATIO
+
+
+def get_room_data(area_data):
+    # type: (Any) -> List[Tuple[float, str]]
+    """area_data 중 (면적, 이름) 만 돌려준다.
+    filter_invalid_radius가 넣는 INVALID_AREA_DATA 같은 값은 room 정보가 아니다."""
+    if not area_data:
+        return []
+    return [data for data in area_data if isinstance(data, (tuple, list))]
+
+
+def get_area_groups_cost(objective, area_groups, area_data):
+    # type: (Optional[str], List[RadialAreaGroup], List[Tuple]) -> float
+    """area_groups를 합쳐서 area_data를 앉혔을 때의 cost. SearchEngine의 objective에 쓴다.
+    area_error : 합친 면적과 목표 면적의 차이
+    shape : 합친 형태가 shape_ok가 아니면 1"""
+    if objective is None or len(area_groups) == 0:
+        return 0.0
+    if objective == "area_error":
+        area = sum([area_group.area for area_group in area_groups])
+        return abs(area - sum([data[0] for data in get_room_data(area_data)]))
+    if objective == "shape":
+        a1 = area_groups[0].radial_area.a1
+        a2 = area_groups[-1].radial_area.a2
+        if a2 < a1:
+            a1 = a1 - 2 * math.pi
+        r1 = max([area_group.radial_area.r1 for area_group in area_groups])
+        r2 = min([area_group.radial_area.r2 for area_group in area_groups])
+        return 0.0 if get_shape_ok(a1, a2, r1, r2) else 1.0
+    raise Exception("unknown objective : {}".format(objective))
+
+
+def get_layout_cost(objective, area_groups):
+    # type: (Optional[str], List[RadialAreaGroup]) -> float
+    """완성된 배치의 cost. area가 set된 area_group들의 cost 합이다."""
+    return sum(
+        [
+            get_area_groups_cost(objective, [area_group], area_group.area_data)
+            for area_group in area_groups
+            if area_group.is_area_set
+        ]
+    )
+
+
+def get_area_group_key(area_group):
+    # type: (Any) -> Tuple[float, float, float, float, Tuple[str, ...]]
+    """area_group 하나의 (시작 각도, 각도 폭, r1, r2, room 이름들)
+    시작 각도는 [0, 2pi)로 맞추고 숫자는 FINGERPRINT_*_DIGITS 자리에서 반올림한다."""
+    radial_area = area_group.radial_area
+    full_angle = round(TWO_PI, FINGERPRINT_ANGLE_DIGITS)
+    a1 = round(radial_area.a1 % TWO_PI, FINGERPRINT_ANGLE_DIGITS)
+    if a1 >= full_angle:
+        a1 = 0.0
+    span = round(radial_area.a2 - radial_area.a1, FINGERPRINT_ANGLE_DIGITS)
+    r1 = round(radial_area.r1, FINGERPRINT_RADIUS_DIGITS)
+    r2 = round(radial_area.r2, FINGERPRINT_RADIUS_DIGITS)
+    rooms = tuple(sorted([name for _, name in get_room_data(area_group.area_data)]))
+    return a1, span, r1, r2, rooms
+
+
+def get_layout_fingerprint(area_groups):
+    # type: (List[Any]) -> Tuple
+    """배치 결과의 canonical fingerprint.
+    조합 순서나 seed 순서만 다른 같은 배치는 같은 값이 된다."""
+    return tuple(sorted([get_area_group_key(area_group) for area_group in area_groups]))
+
+
+def iter_unique_layouts(layouts, seen=None, get_area_groups=None):
+    # type: (Iterable[Any], Optional[set], Optional[Any]) -> Iterator[Any]
+    """unique_layouts의 generator 버전. layouts가 generator여도 하나씩 꺼내서 본다."""
+    if seen is None:
+        seen = set()
+    for layout in layouts:
+        area_groups = layout if get_area_groups is None else get_area_groups(layout)
+        fingerprint = get_layout_fingerprint(area_groups)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        yield layout
+
+
+def unique_layouts(layouts, seen=None, get_area_groups=None):
+    # type: (List[Any], Optional[set], Optional[Any]) -> List[Any]
+    """fingerprint가 처음 나온 배치만 순서대로 남긴다.
+    seen을 넘기면 이전에 본 fingerprint도 제외하고, 새로 본 것을 seen에 더한다.
+    get_area_groups는 배치에서 area_group 리스트를 꺼내는 함수이다. (기본은 배치 자체)"""
+    return list(iter_unique_layouts(layouts, seen, get_area_groups))
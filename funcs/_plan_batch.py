@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Iterator
+except ImportError:
+    pass
+
+import multiprocessing
+from functools import partial
+
+from funcs.base import MassResult
+from funcs._plan_maker import PlanMaker, MIN_WIDTH, check_plan_width
+
+CHUNK_SIZE = 16
+
+
+def make_plan(mass_result, min_width=MIN_WIDTH):
+    # type: (MassResult, float) -> Optional[PlanMaker]
+    """폭 조건을 room을 만들기 전에 확인하고, 통과한 것만 PlanMaker.process를 한다.
+    면적이 맞지 않아 room을 만들 수 없는 결과도 버린다."""
+    try:
+        if not check_plan_width(mass_result, min_width):
+            return None
+    except (ValueError, ZeroDivisionError):
+        return None
+    plan_maker = PlanMaker(mass_result)
+    plan_maker.process()
+    return plan_maker
+
+
+class PlanBatch:
+    """
+    여러 MassResult의 PlanMaker를 process pool로 만든다.
+    PlanMaker.filter에서 버려질 결과는 room을 만들기 전에 해석적으로 걸러낸다.
+
+    batch = PlanBatch(min_width=1.5)
+    for index, plan_maker in batch.run(mass_results.outputs):
+        crvs, names, points = plan_maker.get_2d()
+    """
+
+    def __init__(self, min_width=MIN_WIDTH, processes=None, chunk_size=CHUNK_SIZE):
+        # type: (float, Optional[int], int) -> None
+        self.min_width = min_width
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.rejected_count = 0
+
+    def _iter_passed(self, plan_makers):
+        # type: (Iterator[Optional[PlanMaker]]) -> Iterator[Tuple[int, PlanMaker]]
+        self.rejected_count = 0
+        count = 0
+        for index, plan_maker in enumerate(plan_makers):
+            count += 1
+            if plan_maker is None:
+                self.rejected_count += 1
+                continue
+            yield index, plan_maker
+        print("plan batch : {} / rejected : {}".format(count, self.rejected_count))
+
+    def run(self, mass_results):
+        # type: (List[MassResult]) -> Iterator[Tuple[int, PlanMaker]]
+        """통과한 결과의 (mass_results에서의 index, PlanMaker)를 입력 순서대로 돌려준다."""
+        run_plan = partial(make_plan, min_width=self.min_width)
+
+        if self.processes == 1:
+            for res in self._iter_passed(run_plan(mass_result) for mass_result in mass_results):
+                yield res
+            return
+
+        pool = multiprocessing.Pool(self.processes)
+        try:
+            for res in self._iter_passed(pool.imap(run_plan, mass_results, self.chunk_size)):
+                yield res
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
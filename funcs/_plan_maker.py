@@ -6,13 +6,152 @@ except ImportError:
     pass
 
 import math
-import scriptcontext as sc
-from copy import deepcopy
+from funcs._backend import sc
 from funcs._radial_mass import RadialAreaGroup, RadialArea
 from funcs.base import MassResult
-import Rhino.Geometry as geo  # type: ignore
-
-from _utils import get_joined_curve, move_curve
+from funcs._backend import geo
+
+from funcs._utils import get_radial_area_curve, move_curve
+
+
+# PlanMaker.filter가 폭을 확인하는 room들
+CHECK_ROOM_NAMES = [
+    "office",
+    "meeting_room",
+    "community_corridor",
+    "exhibit_experience",
+    "experience2",
+    "discuss_room",
+    "program1",
+    "program2",
+    "exhibit_planning_room",
+    "unman_cafe",
+    "kitchen",
+]
+MIN_WIDTH = 1.5
+# room_in_room 에서 큰 room의 진입로 각도
+MIN_CORRIDOR_ANGLE = math.pi / 9
+
+
+def get_matched_radius(total_area, angle, r1):
+    # type: (float, float, float) -> int
+    """면적이 total_area가 되는 r2 (정수)"""
+    new_r2 = math.sqrt((total_area + angle * (r1**2) / 2) * 2 / angle)
+    return round(new_r2)
+
+
+def get_cut_angles(areas, r1, r2):
+    # type: (List[float], float, float) -> List[float]
+    """divide_by_areas가 앞에서부터 잘라내는 각도들. 마지막 조각은 남은 각도를 갖는다.
+    areas 중간에 마지막 area와 같은 값이 있으면 거기서 멈춘다."""
+    angles = []
+    for area in areas:
+        if area == areas[-1]:
+            break
+        angle = 2 * area / (r2**2 - r1**2)
+        # make it multiple of 1/18pi
+        angle = math.pi / 36 * (angle // (math.pi / 36))
+        angles.append(angle)
+    return angles
+
+
+def get_cutting_radius(big_area, angle, r1, r2, corridor_angle):
+    # type: (float, float, float, float, float) -> int
+    """room_in_room에서 진입로와 바깥쪽을 합쳐 big_area가 되도록 자르는 반지름 (정수)"""
+    cutting_r = math.sqrt(
+        (2 * big_area - angle * (r2**2) + corridor_angle * (r1**2))
+        / (corridor_angle - angle)
+    )
+    return math.floor(cutting_r)
+
+
+def get_sorted_rooms(area_data):
+    # type: (List[Tuple[float, str]]) -> List[Tuple[float, str]]
+    """(면적, 이름)을 면적이 큰 순서로"""
+    room_names = [a[1] for a in area_data]
+    areas = [a[0] for a in area_data]
+    sorted_room_tuple = sorted(zip(areas, room_names))
+    sorted_room_tuple.reverse()
+    return sorted_room_tuple
+
+
+def get_plan_type(area_data):
+    # type: (List[Tuple[float, str]]) -> str
+    if any([a[0] > 100 for a in area_data]):
+        return "room_in_room"
+    return "simple"
+
+
+def _get_divided_widths(names, areas, a1, a2, r1, cut_r1, cut_r2):
+    # type: (List[str], List[float], float, float, float, float, float) -> List[Tuple[str, float]]
+    # divide_by_areas로 나눈 조각들의 안쪽 폭. 각도 계산 순서도 divide_by_angle과 같게 한다.
+    widths = []
+    start = a1
+    for angle in get_cut_angles(areas, cut_r1, cut_r2):
+        end = start + angle
+        widths.append(r1 * (end - start))
+        start = end
+    if areas:
+        widths.append(r1 * (a2 - start))
+    return list(zip(names, widths))
+
+
+def get_room_widths(area_data, a1, a2, r1):
+    # type: (List[Tuple[float, str]], float, float, float) -> List[Tuple[str, float]]
+    """RoomMaker.process가 만들 room들의 (이름, 가장 큰 radial area의 안쪽 폭)을
+    room을 만들지 않고 계산한다. 순서는 process의 room 순서와 같다."""
+    angle = a2 - a1
+    r2 = get_matched_radius(sum([a[0] for a in area_data]), angle, r1)
+    sorted_room_tuple = get_sorted_rooms(area_data)
+
+    if get_plan_type(area_data) == "simple":
+        areas = [item[0] for item in sorted_room_tuple]
+        names = [item[1] for item in sorted_room_tuple]
+        return _get_divided_widths(names, areas, a1, a2, r1, r1, r2)
+
+    big_area, big_room_name = sorted_room_tuple.pop(0)
+    corridor_angle = MIN_CORRIDOR_ANGLE
+    cutting_r = get_cutting_radius(big_area, angle, r1, r2, corridor_angle)
+
+    # 큰 room은 진입로(안쪽)와 바깥쪽 중 면적이 큰 쪽의 폭을 본다.
+    entrance_a2 = a1 + corridor_angle
+    entrance_area = (entrance_a2 - a1) * ((cutting_r**2) - (r1**2))
+    outer_area = (a2 - a1) * ((r2**2) - (cutting_r**2))
+    if entrance_area >= outer_area:
+        big_width = r1 * (entrance_a2 - a1)
+    else:
+        big_width = cutting_r * (a2 - a1)
+
+    sorted_room_tuple.reverse()
+    rest_areas = [item[0] for item in sorted_room_tuple]
+    rest_names = [item[1] for item in sorted_room_tuple]
+    return [(big_room_name, big_width)] + _get_divided_widths(
+        rest_names, rest_areas, entrance_a2, a2, r1, r1, r2
+    )
+
+
+def check_room_widths(area_group, min_width=MIN_WIDTH, check_room_names=None):
+    # type: (RadialAreaGroup, float, Optional[List[str]]) -> bool
+    """area_group에서 만들 room 중 check_room_names에 있는 room의 안쪽 폭이
+    모두 min_width 이상이면 True. PlanMaker.process 후 filter한 것과 같은 결과이다."""
+    if check_room_names is None:
+        check_room_names = CHECK_ROOM_NAMES
+    radial_area = area_group.radial_area
+    for name, width in get_room_widths(
+        area_group.area_data, radial_area.a1, radial_area.a2, radial_area.r1
+    ):
+        if name in check_room_names and width < min_width:
+            return False
+    return True
+
+
+def check_plan_width(mass_result, min_width=MIN_WIDTH, check_room_names=None):
+    # type: (MassResult, float, Optional[List[str]]) -> bool
+    """mass_result의 area_group을 순서대로 보고, 폭이 모자라는 첫 area_group에서 멈춘다."""
+    for area_group in mass_result.area_groups:
+        if not check_room_widths(area_group, min_width, check_room_names):
+            return False
+    return True
 
 
 class Room:
@@ -39,33 +178,9 @@ class Room:
 
     def get_radial_area_geom(self, radial_area):
         # type: (RadialArea) ->geo.Curve
-        a1 = radial_area.a1
-        a2 = radial_area.a2
-        r1 = radial_area.r1
-        r2 = radial_area.r2
-        c = radial_area.c
-        v1 = geo.Vector3d(math.cos(a1), math.sin(a1), 0)
-        v2 = geo.Vector3d(math.cos(a2), math.sin(a2), 0)
-
-        crv1 = geo.Polyline([c + r1 * v1, c + r2 * v1]).ToNurbsCurve()
-        crv2 = geo.Polyline([c + r1 * v2, c + r2 * v2]).ToNurbsCurve()
-        crv3 = geo.ArcCurve(geo.Arc(geo.Circle(c, r2), geo.Interval(a1, a2)))
-
-        if r1 != 0:
-            crv4 = geo.ArcCurve(geo.Arc(geo.Circle(c, r1), geo.Interval(a1, a2)))
-            try:
-                curve_joined = get_joined_curve([crv1, crv2, crv3, crv4])
-                return curve_joined
-            except:
-                print("ERROR")
-                return None
-        else:
-            try:
-                curve_joined = get_joined_curve([crv1, crv2, crv3])
-                return curve_joined
-            except:
-                print("ERROR")
-                return None
+        return get_radial_area_curve(
+            radial_area.c, radial_area.a1, radial_area.a2, radial_area.r1, radial_area.r2
+        )
 
     @property
     def geom(self):
@@ -88,7 +203,7 @@ class RoomMaker:
         # type: (RadialAreaGroup) -> None
         self.area_group = area_group
         self.area_data = area_group.area_data
-        self.radial_area = deepcopy(area_group.radial_area)
+        self.radial_area = area_group.radial_area.duplicate()
         self.plan_type = None
 
     def process(self):
@@ -101,22 +216,20 @@ class RoomMaker:
         return rooms
 
     def get_plan_type(self):
-        areas = [a[0] for a in self.area_data]
-        if any([area > 100 for area in areas]):
-            self.plan_type = "room_in_room"
-        else:
-            self.plan_type = "simple"
+        self.plan_type = get_plan_type(self.area_data)
 
     def _match_area(self):
         total_area = sum([a[0] for a in self.area_data])
 
         angle = self.radial_area.a2 - self.radial_area.a1
-        total_area / angle
-        new_r2 = math.sqrt(
-            (total_area + angle * (self.radial_area.r1**2) / 2) * 2 / angle
+        self.radial_area.r2 = get_matched_radius(total_area, angle, self.radial_area.r1)
+
+    def get_room_widths(self):
+        # type: () -> List[Tuple[str, float]]
+        """process 없이 계산한 (room 이름, 안쪽 폭)"""
+        return get_room_widths(
+            self.area_data, self.radial_area.a1, self.radial_area.a2, self.radial_area.r1
         )
-        new_r2 = round(new_r2)
-        self.radial_area.r2 = new_r2
 
     def create_radial_mass(self, radial_areas):
         # type: (List[RadialArea]) -> None
@@ -154,16 +267,12 @@ class RoomMaker:
         # type: (float, RadialArea) -> List[RadialArea]
         res = []
         rest = _radial_area
-        for area in areas:
-            if area == areas[-1]:
-                # 마지막 area는 남은 면적을 넣어준다.
-                res.append(rest)
-                break
-            angle = 2 * area / (self.radial_area.r2**2 - self.radial_area.r1**2)
-            # make it multiple of 1/18pi
-            angle = math.pi / 36 * (angle // (math.pi / 36))
+        for angle in get_cut_angles(areas, self.radial_area.r1, self.radial_area.r2):
             cut_radial_area, rest = self.divide_by_angle(angle, rest)
             res.append(cut_radial_area)
+        if areas:
+            # 마지막 area는 남은 면적을 넣어준다.
+            res.append(rest)
         return res
 
     def create_simple_rooms(self):
@@ -171,11 +280,7 @@ class RoomMaker:
         # 나머지 영역
 
         # 면적으로 sort
-        room_names = [a[1] for a in self.area_data]
-        areas = [a[0] for a in self.area_data]
-
-        sorted_room_tuple = sorted(zip(areas, room_names))
-        sorted_room_tuple.reverse()
+        sorted_room_tuple = get_sorted_rooms(self.area_data)
 
         areas = [item[0] for item in sorted_room_tuple]
         names = [item[1] for item in sorted_room_tuple]
@@ -198,12 +303,7 @@ class RoomMaker:
         # 나머지 영역을 나눈다.
 
         # 면적으로 sort
-
-        room_names = [a[1] for a in self.area_data]
-        areas = [a[0] for a in self.area_data]
-
-        sorted_room_tuple = sorted(zip(areas, room_names))
-        sorted_room_tuple.reverse()
+        sorted_room_tuple = get_sorted_rooms(self.area_data)
 
         # room in room type에선 무조건 하나의 큰 Room이 있다.
         big_area, big_room_name = sorted_room_tuple.pop(0)
@@ -213,17 +313,13 @@ class RoomMaker:
         min_corridor_angle = ((min_width / self.radial_area.r1) // (math.pi / 18)) * (
             math.pi / 18
         )
-        min_corridor_angle = math.pi / 9
+        min_corridor_angle = MIN_CORRIDOR_ANGLE
         angle = self.radial_area.a2 - self.radial_area.a1
         r2 = self.radial_area.r2
         r1 = self.radial_area.r1
 
         # 커팅할 radius를 구하고 정수화한다.
-        cutting_r = math.sqrt(
-            (2 * big_area - angle * (r2**2) + (min_corridor_angle) * (r1**2))
-            / (min_corridor_angle - angle)
-        )
-        cutting_r = math.floor(cutting_r)
+        cutting_r = get_cutting_radius(big_area, angle, r1, r2, min_corridor_angle)
 
         # 회전방향 분할
         inner_area, outer_area = self.divide_by_radius(cutting_r, self.radial_area)
@@ -284,22 +380,14 @@ class PlanMaker:
             outputs.extend(room_maker.process())
         self.rooms = outputs
 
-    def filter(self, min_width=1.5):
-        check_room_name = [
-            "office",
-            "meeting_room",
-            "community_corridor",
-            "exhibit_experience",
-            "experience2",
-            "discuss_room",
-            "program1",
-            "program2",
-            "exhibit_planning_room",
-            "unman_cafe",
-            "kitchen",
-        ]
+    def check_width(self, min_width=MIN_WIDTH):
+        # type: (float) -> bool
+        """process 전에 filter 결과를 미리 계산한다. 실패하는 첫 area_group에서 멈춘다."""
+        return check_plan_width(self.mass_result, min_width)
+
+    def filter(self, min_width=MIN_WIDTH):
         for room in self.rooms:
-            if room.name not in check_room_name:
+            if room.name not in CHECK_ROOM_NAMES:
                 continue
             check_radial_area = max(room.radial_areas, key=lambda k: k.area)
             min_inner_width = check_radial_area.r1 * (
@@ -0,0 +1,118 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+CACHE_SIZE = 256
+CACHE_FILE_FORMAT = "slices_{}.json"
+COORDINATE_DIGITS = 6
+
+
+def get_site_fingerprint(polylines):
+    # type: (Dict[str, List[Tuple[float, float]]]) -> str
+    """Site 조건 geometry의 polyline 점들로 만든 hash.
+    같은 대지, 같은 조건 geometry이면 Rhino 세션이 달라도 같은 값이 된다."""
+    sha = hashlib.sha1()
+    for key in sorted(polylines):
+        sha.update(key.encode("utf-8"))
+        for x, y in polylines[key]:
+            sha.update(
+                "{},{};".format(round(x, COORDINATE_DIGITS), round(y, COORDINATE_DIGITS)).encode(
+                    "utf-8"
+                )
+            )
+    return sha.hexdigest()
+
+
+def get_cache_key(site_fingerprint, center, angle_division, precision, refine=None):
+    # type: (str, Any, int, float, Optional[Tuple[float, int]]) -> Tuple
+    """refine은 조각을 나누는 기준 (반지름 차이, 최대 깊이)이다."""
+    return (
+        site_fingerprint,
+        round(center.X, COORDINATE_DIGITS),
+        round(center.Y, COORDINATE_DIGITS),
+        angle_division,
+        precision,
+        refine,
+    )
+
+
+class RadialCache:
+    """
+    RadialMass._get_radial_areas가 찾은 조각별 (a1, a2, 최대 반지름)을
+    (site fingerprint, center, angle_division, precision, refine) 별로 기억한다.
+    A1, A2 처럼 center가 같은 mass나 같은 center로 다시 generate 할 때
+    intersection 탐색을 다시 하지 않는다.
+
+    메모리에는 최근에 쓴 max_size개만 남기고(LRU),
+    folder가 있으면 json 파일로도 저장해서 다른 process / 세션에서도 쓴다.
+    조각들은 tuple로 돌려주므로 _cut_radius, _match_area는 항상 새 RadialArea 위에서 돈다.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE, folder=None):
+        # type: (int, Optional[str]) -> None
+        self.max_size = max_size
+        self.folder = folder
+        self.items = OrderedDict()  # type: OrderedDict[Tuple, Tuple[Tuple[float, float, float], ...]]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def clear(self):
+        self.items.clear()
+
+    def _get_path(self, key):
+        # type: (Tuple) -> str
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, CACHE_FILE_FORMAT.format(name))
+
+    def _remember(self, key, slices):
+        # type: (Tuple, Tuple[Tuple[float, float, float], ...]) -> None
+        self.items[key] = slices
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+    def get(self, key):
+        # type: (Tuple) -> Optional[Tuple[Tuple[float, float, float], ...]]
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key]
+        if self.folder is not None:
+            path = self._get_path(key)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    slices = tuple([tuple(piece) for piece in json.load(f)["slices"]])
+                self._remember(key, slices)
+                self.hits += 1
+                return slices
+        self.misses += 1
+        return None
+
+    def put(self, key, slices):
+        # type: (Tuple, List[Tuple[float, float, float]]) -> Tuple[Tuple[float, float, float], ...]
+        slices = tuple([tuple(piece) for piece in slices])
+        self._remember(key, slices)
+        if self.folder is not None:
+            if not os.path.isdir(self.folder):
+                os.makedirs(self.folder)
+            path = self._get_path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"key": list(key), "slices": [list(piece) for piece in slices]}, f)
+            os.replace(tmp_path, path)
+        return slices
+
+
+# RadialMass들이 같이 쓰는 cache. sweep worker process마다 하나씩 생긴다.
+radial_cache = RadialCache()
@@ -6,14 +6,27 @@ except ImportError:
     pass
 
 import math
-import Rhino.Geometry as geo  # type: ignore
+import numpy as np
+from funcs._backend import geo
 
 # from funcs._site import Site
-from funcs._utils import get_joined_curve, check_intersection
+from funcs._utils import get_radial_area_curve
+from funcs._sector import Sector
+from funcs._metrics import get_shape_ok
+from funcs._radial_solver import get_max_radius, match_radii, MAX_SEARCH_RADIUS
+from funcs._radial_cache import get_cache_key, radial_cache
+from funcs._ring import Ring, RingRange
 
 MIN_RADIUS = 7
 FIRST_MATCHING_AREA_RATIO = 1.6
 MASS_DIVISION_COUNT = 12
+# 이웃 조각과 최대 반지름이 REFINE_RADIUS_JUMP(m) 보다 차이나는 조각은 반으로 나눈다.
+# None 이면 나누지 않는다. 한 조각은 최대 REFINE_MAX_DEPTH 번까지 나뉜다.
+REFINE_RADIUS_JUMP = None
+REFINE_MAX_DEPTH = 2
+RADIUS_PRECISION = 1  # 1 보다 작게 하면 소수점 반지름까지 찾는다.
+MATCH_AREA_STEP = 0.5  # None 이면 면적을 정확히 맞추는 반지름으로 자른다.
+RADIAL_CONSTRAINT_KEYS = ["lot", "close_park", "on_slope", "on_forest_entrance"]
 
 
 class RadialArea:
@@ -27,69 +40,136 @@ class RadialArea:
     위 다섯개의 parameter로 정의되어 있고
     r1 == 0 인 경우에는 피자
     r1 != 0 인 경우에는 한입 먹은 피자처럼 생겼다.
+
+    area, shape_ok, v1, v2는 처음 쓸 때 계산해서 기억하고
+    a1, a2, r1, r2 중 하나가 바뀌면 다시 계산한다.
     """
 
     def __init__(self, c, a1, a2, r1, r2):
         # type: (geo.Point3d, float, float, float, float) -> None
         self.c = c
-        self.a1 = a1
-        self.a2 = a2
-        self.r1 = r1
-        self.r2 = r2
-        self.v1 = geo.Vector3d(math.cos(a1), math.sin(a1), 0)
-        self.v2 = geo.Vector3d(math.cos(a2), math.sin(a2), 0)
+        self._a1 = a1
+        self._a2 = a2
+        self._r1 = r1
+        self._r2 = r2
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._area = None
+        self._shape_ok = None
+        self._v1 = None
+        self._v2 = None
+
+    def __getstate__(self):
+        # 예전 pickle과 같은 key로 저장하고, 기억해둔 값은 저장하지 않는다.
+        return {"c": self.c, "a1": self._a1, "a2": self._a2, "r1": self._r1, "r2": self._r2}
+
+    def __setstate__(self, state):
+        # 예전 pickle은 v1, v2도 갖고 있지만 다시 계산한다.
+        self.c = state["c"]
+        self._a1 = state["a1"]
+        self._a2 = state["a2"]
+        self._r1 = state["r1"]
+        self._r2 = state["r2"]
+        self._clear_cache()
 
-    def duplicate(self):
-        return RadialArea(self.c, self.a1, self.a2, self.r1, self.r2)
+    @property
+    def a1(self):
+        return self._a1
+
+    @a1.setter
+    def a1(self, value):
+        self._a1 = value
+        self._clear_cache()
 
     @property
-    def geom(self):
+    def a2(self):
+        return self._a2
 
-        crv1 = geo.Polyline(
-            [self.c + self.r1 * self.v1, self.c + self.r2 * self.v1]
-        ).ToNurbsCurve()
+    @a2.setter
+    def a2(self, value):
+        self._a2 = value
+        self._clear_cache()
 
-        crv2 = geo.Polyline(
-            [self.c + self.r1 * self.v2, self.c + self.r2 * self.v2]
-        ).ToNurbsCurve()
-        crv3 = geo.ArcCurve(
-            geo.Arc(geo.Circle(self.c, self.r2), geo.Interval(self.a1, self.a2))
-        )
+    @property
+    def r1(self):
+        return self._r1
 
-        if self.r1 != 0:  # 중간에 비어 있으면
-            crv4 = geo.ArcCurve(
-                geo.Arc(geo.Circle(self.c, self.r1), geo.Interval(self.a1, self.a2))
-            )
-            try:
-                curve_joined = get_joined_curve([crv1, crv2, crv3, crv4])
-                return curve_joined
-            except:
-                print("ERROR")
-                return None
-        else:
-            try:
-                curve_joined = get_joined_curve([crv1, crv2, crv3])
-                return curve_joined
-            except:
-                print("ERROR")
-                return None
+    @r1.setter
+    def r1(self, value):
+        self._r1 = value
+        self._clear_cache()
+
+    @property
+    def r2(self):
+        return self._r2
+
+    @r2.setter
+    def r2(self, value):
+        self._r2 = value
+        self._clear_cache()
+
+    @property
+    def v1(self):
+        if self._v1 is None:
+            self._v1 = geo.Vector3d(math.cos(self._a1), math.sin(self._a1), 0)
+        return self._v1
+
+    @property
+    def v2(self):
+        if self._v2 is None:
+            self._v2 = geo.Vector3d(math.cos(self._a2), math.sin(self._a2), 0)
+        return self._v2
+
+    def duplicate(self):
+        return RadialArea(self.c, self._a1, self._a2, self._r1, self._r2)
+
+    @property
+    def geom(self):
+        return get_radial_area_curve(self.c, self.a1, self.a2, self.r1, self.r2)
 
     @property
     def area(self):
-        return (self.a2 - self.a1) * ((self.r2**2) - (self.r1**2))
+        if self._area is None:
+            self._area = (self._a2 - self._a1) * ((self._r2**2) - (self._r1**2))
+        return self._area
+
+    @property
+    def shape_ok(self):
+        if self._shape_ok is None:
+            self._shape_ok = get_shape_ok(self._a1, self._a2, self._r1, self._r2)
+        return self._shape_ok
+
+
+def get_ring_size(area_group):
+    # type: (RadialAreaGroup) -> int
+    """next를 따라 한바퀴 돌았을 때의 area group 개수"""
+    count = 1
+    seen = set([id(area_group)])
+    cur = area_group.next
+    while cur is not None and cur is not area_group and id(cur) not in seen:
+        seen.add(id(cur))
+        count += 1
+        cur = cur.next
+    return count
 
 
 def try_add_area_group(area_group_1, area_group_2):
     # type: (RadialAreaGroup, RadialAreaGroup) -> RadialAreaGroup
-    """RadialAreaGroup의 __add__의 경우는 더하면서
-    앞 뒤 RadialAreaGroup의 관계를 만들어버린다.
-    더해 보고, 겹쳐지면 폐기해야 되는 경우에 이걸 사용한다."""
-    rad_1 = area_group_1.radial_area.duplicate()
-    rad_2 = area_group_2.radial_area.duplicate()
-    new_radial_area_group = RadialAreaGroup([rad_1, rad_2])
-    new_radial_area_group.prev = area_group_1.prev
-    new_radial_area_group.next = area_group_2.next
-    return new_radial_area_group
+    """더해 보고, 겹쳐지면 폐기해야 되는 경우에 사용한다.
+    __add__는 앞 뒤 RadialAreaGroup을 바꾸지 않으므로 그대로 버리면 된다."""
+    return area_group_1 + area_group_2
+
+
+def merge_area_groups(area_groups):
+    # type: (List[RadialAreaGroup]) -> RadialAreaGroup
+    """각도 순서로 이어진 area_group들을 합친 새 area_group. 하나여도 새 객체이다."""
+    merged = area_groups[0].duplicate()
+    merged.prev = area_groups[0].prev
+    merged.next = area_groups[0].next
+    for area_group in area_groups[1:]:
+        merged = merged + area_group
+    return merged
 
 
 class RadialAreaGroup:
@@ -100,6 +180,12 @@ class RadialAreaGroup:
     AreaCluster를 대응시키거나, 그 일부를 대응시켜 면적을 set 시킨다.
 
     prev, next로 자신 앞 뒤의 RadialAreaGroup과 관계를 갖는다는 점을 명심하자
+
+    RadialMass의 area group은 radial_area로 ring의 RingRange를 갖는다.
+    이웃한 RingRange끼리 더하면 index 범위만 늘어나고, ring은 바뀌지 않는다.
+
+    area, shape_ok는 radial_area가 기억하고, target_area, is_area_set은
+    area_data가 set될 때 다시 계산한다. area_data_version은 area_data가 set될 때마다 늘어난다.
     """
 
     def __init__(self, radial_areas):
@@ -111,6 +197,7 @@ class RadialAreaGroup:
         self.prev = None  # type: Optional[RadialAreaGroup]
         self.next = None  # type: Optional[RadialAreaGroup]
 
+        self.area_data_version = 0
         self.area_data = None
         self.divide_options = []
 
@@ -119,22 +206,51 @@ class RadialAreaGroup:
 
     def __add__(self, other):
         # type: (RadialAreaGroup) -> RadialAreaGroup
-        """add는 항상 앞쪽의 area_group이 먼저 나와야 한다."""
-        rad_1 = self.radial_area.duplicate()
-        rad_2 = other.radial_area.duplicate()
-        new_radial_area_group = RadialAreaGroup([rad_1, rad_2])
+        """add는 항상 앞쪽의 area_group이 먼저 나와야 한다.
+        새 area_group은 self.prev, other.next를 앞 뒤로 갖지만
+        앞 뒤 area_group의 prev, next는 바꾸지 않는다."""
+        rad_1 = self.radial_area
+        rad_2 = other.radial_area
+        if isinstance(rad_1, RingRange) and rad_1.is_followed_by(rad_2):
+            new_radial_area_group = RadialAreaGroup.from_radial_area(
+                rad_1.extended(rad_2.count)
+            )
+        else:
+            new_radial_area_group = RadialAreaGroup([rad_1.duplicate(), rad_2.duplicate()])
         new_radial_area_group.prev = self.prev
         new_radial_area_group.next = other.next
 
-        new_radial_area_group.next.prev = new_radial_area_group
-        new_radial_area_group.prev.next = new_radial_area_group
-
         return new_radial_area_group
 
+    @classmethod
+    def from_ring(cls, ring, start, count=1):
+        # type: (Ring, int, int) -> RadialAreaGroup
+        return cls.from_radial_area(RingRange(ring, start, count))
+
+    @classmethod
+    def from_radial_area(cls, radial_area):
+        # type: (RadialArea) -> RadialAreaGroup
+        """radial_area를 복사하지 않고 그대로 radial_area로 갖는다. (RingRange 등)"""
+        area_group = cls.__new__(cls)
+        area_group.radial_areas = [radial_area]
+        area_group.radial_area = radial_area
+        area_group.prev = None
+        area_group.next = None
+        area_group.area_data_version = 0
+        area_group.area_data = None
+        area_group.divide_options = []
+        area_group.is_expandable = True
+        return area_group
+
     def duplicate(self):
-        return RadialAreaGroup(
-            [radial_area.duplicate() for radial_area in self.radial_areas]
-        )
+        """같은 형태와 area_data를 갖는 area_group. 앞 뒤 관계는 없다.
+        RingRange는 바뀌지 않으므로 복사하지 않고 같이 쓴다."""
+        if isinstance(self.radial_area, RingRange):
+            area_group = RadialAreaGroup.from_radial_area(self.radial_area)
+        else:
+            area_group = RadialAreaGroup([self.radial_area.duplicate()])
+        area_group.set_area_data(self.area_data)
+        return area_group
 
     def create_radial_mass(self, radial_areas):
         # type: (List[RadialArea]) -> None
@@ -152,14 +268,43 @@ class RadialAreaGroup:
             a1 = a1 - 2 * math.pi
         self.radial_area = RadialArea(origin, a1, a2, r1, r2)
 
+    def __getstate__(self):
+        # 예전 pickle과 같은 key로 저장한다.
+        state = dict(self.__dict__)
+        state["area_data"] = state.pop("_area_data")
+        del state["_target_area"]
+        del state["_is_area_set"]
+        return state
+
+    def __setstate__(self, state):
+        # 예전 pickle에는 area_data_version이 없다.
+        state = dict(state)
+        area_data = state.pop("area_data", None)
+        self.__dict__.update(state)
+        self.area_data_version = state.get("area_data_version", 0)
+        self.area_data = area_data
+
+    @property
+    def area_data(self):
+        return self._area_data
+
+    @area_data.setter
+    def area_data(self, area_data):
+        self._area_data = area_data
+        self._target_area = None
+        self._is_area_set = bool(area_data)
+        self.area_data_version += 1
+
     def set_area_data(self, area_data):
         self.area_data = area_data
 
     @property
     def target_area(self):
-        if self.area_data is None:
+        if self._area_data is None:
             raise Exception("area_data not set")
-        return sum([data[0] for data in self.area_data])
+        if self._target_area is None:
+            self._target_area = sum([data[0] for data in self._area_data])
+        return self._target_area
 
     def horizontal_expand(self):
         # 양쪽 중 확장 가능한 곳 찾아봄.
@@ -198,7 +343,10 @@ class RadialAreaGroup:
         is_next = True
         # while문이 맞는데, 이따금 무한 루프로 돌기 때문에
         # for 문을 걸어두었다. range안의 숫자는 전체 쪼갠 숫자 -2 정도여야 한다.
-        for _ in range(10):
+        # 쪼갠 숫자는 mass ring의 조각 수이다. (기본 12개면 예전과 같이 10)
+        ring = getattr(self.radial_area, "ring", None)
+        ring_size = len(ring) if ring is not None else get_ring_size(self)
+        for _ in range(max(ring_size - 2, 1)):
             if _area_group.next.is_area_set and _area_group.prev.is_area_set:
                 break
 
@@ -215,19 +363,11 @@ class RadialAreaGroup:
     @property
     def shape_ok(self):
         # 형태가 괜찮은지 확인한다.
-        r1 = self.radial_area.r1
-        r2 = self.radial_area.r2
-        a1 = self.radial_area.a1
-        a2 = self.radial_area.a2
-        LENGTH_DEPTH_RATIO = 0.8
-        return r1 * (a2 - a1) / (r2 - r1) > LENGTH_DEPTH_RATIO
+        return self.radial_area.shape_ok
 
     @property
     def is_area_set(self):
-        if self.area_data:
-            return True
-        else:
-            return False
+        return self._is_area_set
 
     @property
     def area(self):
@@ -239,9 +379,11 @@ class RadialAreaGroup:
 
 
 class RadialMass:
-    def __init__(self, area, name, site):
-        # type: (float, str, Site) -> None
-        """주변 대지 상태만을 체크한 Raw 한 상태의 Mass"""
+    def __init__(self, area, name, site, angle_division=MASS_DIVISION_COUNT):
+        # type: (float, str, Site, int) -> None
+        """주변 대지 상태만을 체크한 Raw 한 상태의 Mass
+        angle_division 개의 같은 각도 조각에서 시작하고,
+        refine_radius_jump가 있으면 반지름이 급하게 바뀌는 조각만 더 잘게 나눈다."""
         self.name = name
         self.site = site
         self.center = None
@@ -250,14 +392,22 @@ class RadialMass:
         self.radial_vectors = []
         self.radial_angles = []
         self.radial_areas = []
+        self.ring = None  # type: Optional[Ring]
         self.condition = {}
-        self.angle_division = MASS_DIVISION_COUNT
+        self.angle_division = angle_division
+        self.refine_radius_jump = REFINE_RADIUS_JUMP
+        self.refine_max_depth = REFINE_MAX_DEPTH
 
         # site setting
         self.lot_boundary = site.boundary
         self.park_geom = site.park_geom
         self.forest_entrance_geom = site.forest_entrance_geom
         self.slope_geom = site.slope_geom
+        self.site_index = site.index
+        self.radius_precision = RADIUS_PRECISION
+        self.match_area_step = MATCH_AREA_STEP
+        self.site_fingerprint = site.fingerprint
+        self.radial_cache = radial_cache
 
         # result
         self.radial_area_groups = []  # type: List[RadialAreaGroup]
@@ -268,24 +418,28 @@ class RadialMass:
         self.radial_vectors = self._get_radial_vectors()
         self.radial_areas = self._get_radial_areas()  # type: List[RadialArea]
         self._cut_radius()
-        self._create_radial_area_group()
         self._match_area()
+        self._create_radial_area_group()
 
     def duplicate_area_groups(self):
         return [area_group.duplicate() for area_group in self.radial_area_groups]
 
     def create_center(self, radius):
         # type: (int)-> None
-        """중심에 비어있는 원형공간을 만든다."""
-        for radial_area_group in self.radial_area_groups:
-            radial_area_group.radial_area.r1 = radius
+        """중심에 비어있는 원형공간을 만든다.
+        ring은 바꾸지 않고 새 ring과 area group을 만든다. 이전 결과의 area group은 그대로이다."""
+        self.ring = self.ring.with_center(radius)
+        self._create_radial_area_group()
         center_radial_area = RadialArea(self.center, 0, math.pi * 2, 0, radius)
         self.center_area_group = RadialAreaGroup([center_radial_area])
 
     def _create_radial_area_group(self):
+        # area group의 radial_area는 ring의 view이다.
+        # 값을 기억하는 view이므로 ring이 다 만들어진 뒤에 만든다.
         self.radial_area_groups = [
-            RadialAreaGroup([radial_area]) for radial_area in self.radial_areas
+            RadialAreaGroup.from_ring(self.ring, i) for i in range(len(self.ring))
         ]
+        self.radial_areas = [area_group.radial_area for area_group in self.radial_area_groups]
         # connect
         for i in range(len(self.radial_area_groups)):
             cur = self.radial_area_groups[i]
@@ -301,50 +455,37 @@ class RadialMass:
         self.condition = condition
 
     def _match_area(self):
-        """면적을 Mass Area에 맞춰서 줄이는 함수"""
-        index = 0
-        counter = 0
-        shrinking_groups = [
-            area_group
-            for area_group in self.radial_area_groups
-            if area_group.radial_area.r2 > self.min_radius + 4
-        ]
-
-        while self.area > self.target_area * FIRST_MATCHING_AREA_RATIO:
-            shrinking_group = shrinking_groups[
-                index % len(shrinking_groups)
-            ]  # type: RadialAreaGroup
-            if (
-                shrinking_group.radial_area.r2 <= MIN_RADIUS
-            ):  # 7m 보다 작은 area는 축소시키지 않는다.
-                if counter == len(shrinking_groups):
-                    # 더 이상 줄일 수 있는 Radial Area Group 이 없을 때
-                    break
-                index += 1
-                counter += 1
-                continue
-            else:
-                shrinking_group.radial_area.r2 = shrinking_group.radial_area.r2 - 0.5
-                counter = 0
-                index += 1
+        """면적을 Mass Area에 맞춰서 줄이는 함수
+        min_radius + 4 보다 긴 area group을 돌아가며 match_area_step씩 줄이던 결과를
+        _radial_solver.match_radii로 바로 계산한다. 7m 보다 작은 area는 축소시키지 않는다."""
+        ring = self.ring
+        shrinkable = np.flatnonzero(ring.r2 > ring.min_radius + 4).tolist()
+        radii = match_radii(
+            (ring.a2 - ring.a1).tolist(),
+            ring.r1.tolist(),
+            ring.r2.tolist(),
+            shrinkable,
+            self.target_area * FIRST_MATCHING_AREA_RATIO,
+            MIN_RADIUS,
+            self.match_area_step,
+        )
+        ring.r2[:] = radii
 
     def _cut_radius(self):  # cut too long radius
         """
         최고로 긴 area의 out
         반지름이 3미터 이상 차이가 나면 2등 반지름과 맞춰준다.
         """
-        out_rad_list = [radial_area.r2 for radial_area in self.radial_areas]
-        sorted_radial_area = sorted(
-            self.radial_areas, key=lambda radial_area: radial_area.r2
-        )
-
-        if sorted_radial_area[-1].r2 - sorted_radial_area[-2].r2 > 3:
-            sorted_radial_area[-1].r2 = sorted_radial_area[-2].r2
+        r2 = self.ring.r2
+        longest, second = np.argsort(r2, kind="stable")[[-1, -2]]
+        if r2[longest] - r2[second] > 3:
+            r2[longest] = r2[second]
 
     def _get_radial_vectors(self):
-        # Center로부터 360 /12 각도마다 radial vector를 구한다.
+        # Center로부터 360 / angle_division 각도마다 radial vector를 구한다.
         angle_step = math.pi * 2 / self.angle_division
         vectors = []
+        self.radial_angles = []  # 같은 mass로 generate를 다시 할 때 누적되지 않도록
         for i in range(self.angle_division + 1):
             angle = angle_step * i
             self.radial_angles.append(angle)
@@ -354,55 +495,97 @@ class RadialMass:
         return vectors
 
     def _get_radial_areas(self):
+        # 조각별 최대 반지름은 center마다 한번만 찾고 radial_cache에 기억한다.
+        # _cut_radius, _match_area가 r2를 바꾸므로 ring은 매번 새로 만든다.
+        # 조각은 RadialArea 대신 ring의 view로 돌려준다.
+        refine = None
+        if self.refine_radius_jump is not None:
+            refine = (self.refine_radius_jump, self.refine_max_depth)
+        key = get_cache_key(
+            self.site_fingerprint,
+            self.center,
+            self.angle_division,
+            self.radius_precision,
+            refine,
+        )
+        slices = self.radial_cache.get(key)
+        if slices is None:
+            slices = self.radial_cache.put(key, self._get_slices())
+
+        # 조각이 나뉘었을 수 있으므로 각도와 vector를 조각에 맞춘다.
+        self.radial_angles = [a1 for a1, _, _ in slices] + [slices[-1][1]]
+        self.radial_vectors = [
+            geo.Vector3d(math.cos(angle), math.sin(angle), 0)
+            for angle in self.radial_angles
+        ]
+        self.ring = Ring.from_slices(self.center, slices)
+        return list(self.ring)
+
+    def _get_slices(self):
+        # type: () -> List[Tuple[float, float, float]]
+        slices = []
+        for i in range(len(self.radial_angles) - 1):
+            angle1 = self.radial_angles[i]
+            angle2 = self.radial_angles[i + 1]
+            slices.append((angle1, angle2, self._get_slice_radius(angle1, angle2)))
+        if self.refine_radius_jump is not None:
+            slices = self._refine_slices(slices)
+        return slices
+
+    def _refine_slices(self, slices):
+        # type: (List[Tuple[float, float, float]]) -> List[Tuple[float, float, float]]
+        """앞 뒤 조각과 반지름이 refine_radius_jump 보다 차이나는 조각을 반으로 나눈다.
+        대지 경계가 꺾이는 곳만 잘게 나뉘므로 전체를 잘게 나누는 것보다 탐색이 적다."""
+        for _ in range(self.refine_max_depth):
+            count = len(slices)
+            refined = []
+            for i, (angle1, angle2, radius) in enumerate(slices):
+                jump = max(
+                    abs(radius - slices[i - 1][2]),
+                    abs(radius - slices[(i + 1) % count][2]),
+                )
+                if jump <= self.refine_radius_jump:
+                    refined.append((angle1, angle2, radius))
+                    continue
+                mid = (angle1 + angle2) / 2
+                refined.append((angle1, mid, self._get_slice_radius(angle1, mid)))
+                refined.append((mid, angle2, self._get_slice_radius(mid, angle2)))
+            if len(refined) == count:
+                break
+            slices = refined
+        return slices
+
+    def _get_slice_radius(self, angle1, angle2):
+        # type: (float, float) -> float
         # vector를 두개씩 체크한다. 기준에 맞는 지점에서 뻗을 수 있는 최대한의 피자조각을 찾는다.
         # vec_1, vec_2, max_radius 이렇게 세가지로 정의된다.
         # 현재는 lot_boundary
         # park_geom
         # slope_geom
         # forest_entrance_geom체크한다.
-        radial_areas = []
-        for i in range(len(self.radial_angles) - 1):
-            angle1 = self.radial_angles[i]
-            angle2 = self.radial_angles[i + 1]
-            radius = 3  # minimum radius == 3
-            for _ in range(30):
-                radial_area = RadialArea(self.center, angle1, angle2, 0, radius)
-                radial_area_geom = radial_area.geom
-
-                if radial_area_geom is None:  # ERROR
-                    radius -= 1
-                    radial_area = RadialArea(self.center, angle1, angle2, 0, radius)
-                    radial_areas.append(radial_area)
-                    break
-
-                elif (
-                    check_intersection(radial_area_geom, self.lot_boundary)
-                    or check_intersection(radial_area_geom, self.park_geom)
-                    or check_intersection(radial_area_geom, self.slope_geom)
-                    or check_intersection(radial_area_geom, self.forest_entrance_geom)
-                ):
-                    radius -= 1
-                    radial_area = RadialArea(self.center, angle1, angle2, 0, radius)
-                    radial_areas.append(radial_area)
-                    break
-                else:
-                    radius += 1
-        return radial_areas
+        # 반지름을 1m씩 키워가며 curve intersection을 하는 대신
+        # polyline 근사에 대해 최대 반지름을 바로 계산한다.
+        search_bbox = Sector(
+            self.center.X, self.center.Y, angle1, angle2, 0, MAX_SEARCH_RADIUS
+        ).bbox
+        segments = self.site_index.get_segments(search_bbox, RADIAL_CONSTRAINT_KEYS)
+        return get_max_radius(
+            self.center.X,
+            self.center.Y,
+            angle1,
+            angle2,
+            segments,
+            precision=self.radius_precision,
+        )
 
     def set_target_area(self, area_distribute_options):
         self.area_distribute_options = area_distribute_options
 
     @property
     def area(self):
-        if len(self.radial_area_groups) == 0:
-            return sum([radial_area.area for radial_area in self.radial_areas])
-        else:
-            return sum(
-                [
-                    radial_area_group.area
-                    for radial_area_group in self.radial_area_groups
-                ]
-            )
+        if self.ring is None:
+            return 0
+        return self.ring.area
 
     @property
     def geom(self):
@@ -416,8 +599,14 @@ class RadialMass:
 
     @property
     def max_radius(self):
-        return max(area_group.radial_area.r2 for area_group in self.radial_area_groups)
+        return self.ring.max_radius
 
     @property
     def min_radius(self):
-        return min(area_group.radial_area.r2 for area_group in self.radial_area_groups)
+        return self.ring.min_radius
+
+    @property
+    def shape_ok(self):
+        # type: () -> np.ndarray
+        """조각별 shape_ok"""
+        return self.ring.shape_ok
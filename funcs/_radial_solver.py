@@ -0,0 +1,240 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import math
+
+from funcs._sector import Sector, TOL
+
+MIN_SEARCH_RADIUS = 3
+MAX_SEARCH_RADIUS = 32
+INF = float("inf")
+
+
+def _clip_to_half_plane(ax, ay, dx, dy, nx, ny, t0, t1, eps):
+    # nx, ny 방향의 half plane(n . P >= 0) 안에 있는 선분 구간 [t0, t1]
+    base = nx * ax + ny * ay
+    slope = nx * dx + ny * dy
+    if abs(slope) <= eps:
+        if base < -eps:
+            return None
+        return t0, t1
+    t_zero = -base / slope
+    if slope > 0:
+        t0 = max(t0, t_zero)
+    else:
+        t1 = min(t1, t_zero)
+    if t0 > t1:
+        return None
+    return t0, t1
+
+
+def get_contact_intervals(cx, cy, a1, a2, p, q, tol=TOL):
+    # type: (float, float, float, float, Tuple[float, float], Tuple[float, float], float) -> List[Tuple[float, float]]
+    """중심 (cx, cy), 각도 a1~a2인 피자(r1 == 0)의 경계가 선분 pq와 만나는 반지름 구간들.
+
+    r을 키워갈 때 경계는 두 ray [0, r]와 반지름 r의 호로 이루어진다.
+    호는 wedge 안에 있는 선분 부분까지의 거리 [dmin, dmax] 동안 선분과 만나고,
+    ray 위에 있는 점까지 닿으면 그 이후로는 계속 만난다."""
+    span = a2 - a1
+    if span > math.pi + 1e-9:
+        mid = a1 + span / 2
+        return get_contact_intervals(
+            cx, cy, a1, mid, p, q, tol
+        ) + get_contact_intervals(cx, cy, mid, a2, p, q, tol)
+
+    ax = p[0] - cx
+    ay = p[1] - cy
+    dx = q[0] - p[0]
+    dy = q[1] - p[1]
+    seg_length = math.hypot(dx, dy)
+    eps = tol * max(seg_length, 1.0)
+
+    # wedge 는 v1의 왼쪽, v2의 오른쪽
+    v1x, v1y = math.cos(a1), math.sin(a1)
+    v2x, v2y = math.cos(a2), math.sin(a2)
+    clipped = _clip_to_half_plane(ax, ay, dx, dy, -v1y, v1x, 0.0, 1.0, eps)
+    if clipped is not None:
+        clipped = _clip_to_half_plane(
+            ax, ay, dx, dy, v2y, -v2x, clipped[0], clipped[1], eps
+        )
+    if clipped is None:
+        return []
+    t0, t1 = clipped
+
+    def _point(t):
+        return ax + t * dx, ay + t * dy
+
+    def _dist(t):
+        x, y = _point(t)
+        return math.hypot(x, y)
+
+    if seg_length > 0:
+        t_closest = -(ax * dx + ay * dy) / (seg_length**2)
+    else:
+        t_closest = 0.0
+    t_closest = min(max(t_closest, t0), t1)
+    d_min = _dist(t_closest)
+    d_max = max(_dist(t0), _dist(t1))
+    intervals = [(d_min, d_max)]
+
+    for t in (t0, t1):
+        x, y = _point(t)
+        for vx, vy in ((v1x, v1y), (v2x, v2y)):
+            on_ray = abs(vx * y - vy * x) <= tol and vx * x + vy * y >= -tol
+            if on_ray:
+                intervals.append((math.hypot(x, y), INF))
+    return intervals
+
+
+def get_max_radius(
+    cx,
+    cy,
+    a1,
+    a2,
+    polylines,
+    min_radius=MIN_SEARCH_RADIUS,
+    max_radius=MAX_SEARCH_RADIUS,
+    precision=1,
+    tol=TOL,
+):
+    # type: (float, float, float, float, List[List[Tuple[float, float]]], float, float, float, float) -> float
+    """polylines는 점 리스트들이고, 닫힌 curve는 마지막 점이 첫 점과 같아야 한다.
+    RadialMass._get_radial_areas의 1m씩 키워보는 탐색을 대신한다.
+    min_radius부터 precision 간격으로 반지름을 검사했을 때
+    처음으로 경계와 만나는 반지름의 한 단계 전 반지름을 돌려준다.
+    끝까지 만나지 않으면 검사한 가장 큰 반지름을 돌려준다.
+    precision == 1 이면 기존 정수 반지름과 같은 결과가 나온다."""
+    step_count = int(math.floor((max_radius - min_radius) / precision + 1e-9)) + 1
+    search_bbox = Sector(cx, cy, a1, a2, 0, max_radius).bbox
+
+    first_hit = step_count
+    for polyline in polylines:
+        for i in range(1, len(polyline)):
+            p = polyline[i - 1]
+            q = polyline[i]
+            if (
+                max(p[0], q[0]) < search_bbox[0] - tol
+                or min(p[0], q[0]) > search_bbox[2] + tol
+                or max(p[1], q[1]) < search_bbox[1] - tol
+                or min(p[1], q[1]) > search_bbox[3] + tol
+            ):
+                continue
+            for lo, hi in get_contact_intervals(cx, cy, a1, a2, p, q, tol):
+                k = max(0, int(math.ceil((lo - tol - min_radius) / precision - 1e-9)))
+                if k < first_hit and min_radius + k * precision <= hi + tol:
+                    first_hit = k
+        if first_hit == 0:
+            break
+
+    if first_hit == step_count:
+        return min_radius + (step_count - 1) * precision
+    return min_radius + (first_hit - 1) * precision
+
+
+def _get_total_area(widths, inner_radii, outer_radii):
+    # type: (List[float], List[float], List[float]) -> float
+    # RadialArea.area의 합과 같은 순서, 같은 식으로 계산한다.
+    return sum(
+        [
+            width * ((outer_radius**2) - (inner_radius**2))
+            for width, inner_radius, outer_radius in zip(widths, inner_radii, outer_radii)
+        ]
+    )
+
+
+def _match_radii_by_level(widths, inner_radii, outer_radii, shrinkable, target_area, floor_radius):
+    # type: (List[float], List[float], List[float], List[int], float, float) -> List[float]
+    # level 보다 긴 반지름만 level로 자른다. (water filling)
+    # 긴 것부터 k개가 잘린다고 하면 면적은 C + W * level^2 이므로 level을 바로 구한다.
+    radii = list(outer_radii)
+    order = sorted(shrinkable, key=lambda i: -outer_radii[i])
+    fixed = _get_total_area(
+        [widths[i] for i in range(len(radii)) if i not in shrinkable],
+        [inner_radii[i] for i in range(len(radii)) if i not in shrinkable],
+        [radii[i] for i in range(len(radii)) if i not in shrinkable],
+    )
+    for k in range(1, len(order) + 1):
+        active = order[:k]
+        rest = order[k:]
+        lower = max(outer_radii[rest[0]], floor_radius) if rest else floor_radius
+        width = sum([widths[i] for i in active])
+        constant = (
+            fixed
+            + _get_total_area(
+                [widths[i] for i in rest],
+                [inner_radii[i] for i in rest],
+                [outer_radii[i] for i in rest],
+            )
+            - sum([widths[i] * inner_radii[i] ** 2 for i in active])
+        )
+        level_square = (target_area - constant) / width
+        if level_square >= lower**2:
+            for i in active:
+                radii[i] = math.sqrt(level_square)
+            return radii
+    for i in order:
+        radii[i] = floor_radius
+    return radii
+
+
+def match_radii(
+    widths, inner_radii, outer_radii, shrinkable, target_area, floor_radius, step=None
+):
+    # type: (List[float], List[float], List[float], List[int], float, float, Optional[float]) -> List[float]
+    """면적 합 sum(width * (r2^2 - r1^2))이 target_area 이하가 되도록 줄인 바깥 반지름들.
+    shrinkable은 줄일 수 있는 index들이고, floor_radius 이하인 반지름은 줄이지 않는다.
+
+    step이 있으면 RadialMass._match_area의 기존 방식과 같은 결과를 낸다.
+    shrinkable 순서로 돌아가며 한번에 step씩 줄이고, 면적이 target_area 이하가 되면 멈춘다.
+    한 바퀴를 다 돈 뒤의 면적은 바퀴 수에 대해 단조감소하므로
+    바퀴 수를 이분탐색하고 마지막 바퀴만 순서대로 줄인다.
+
+    step이 None이면 긴 반지름부터 같은 level로 잘라서 면적을 정확히 맞춘다."""
+    radii = list(outer_radii)
+    if _get_total_area(widths, inner_radii, radii) <= target_area:
+        return radii
+    candidates = [i for i in shrinkable if radii[i] > floor_radius]
+    if len(candidates) == 0:
+        return radii
+    if step is None:
+        return _match_radii_by_level(
+            widths, inner_radii, outer_radii, candidates, target_area, floor_radius
+        )
+
+    # group마다 줄여가는 반지름. 기존처럼 step을 반복해서 빼서 만든다.
+    sequences = []
+    for i in candidates:
+        sequence = [radii[i]]
+        while sequence[-1] > floor_radius:
+            sequence.append(sequence[-1] - step)
+        sequences.append(sequence)
+
+    def _get_radii(rounds):
+        res = list(radii)
+        for i, sequence in zip(candidates, sequences):
+            res[i] = sequence[min(rounds, len(sequence) - 1)]
+        return res
+
+    max_rounds = max([len(sequence) for sequence in sequences]) - 1
+    if _get_total_area(widths, inner_radii, _get_radii(max_rounds)) > target_area:
+        return _get_radii(max_rounds)
+
+    lo, hi = 0, max_rounds  # lo 바퀴 후에는 target_area 보다 크고, hi 바퀴 후에는 이하
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _get_total_area(widths, inner_radii, _get_radii(mid)) > target_area:
+            lo = mid
+        else:
+            hi = mid
+
+    res = _get_radii(lo)
+    for i, sequence in zip(candidates, sequences):
+        if len(sequence) - 1 > lo:
+            res[i] = sequence[lo + 1]
+            if _get_total_area(widths, inner_radii, res) <= target_area:
+                break
+    return res
@@ -0,0 +1,306 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import os
+import re
+import sqlite3
+from collections import namedtuple
+
+from funcs.base import MassResults, MassResult
+from funcs._metrics import get_layout_cost, get_room_data, get_shape_ok
+from funcs._result_store import STORE_EXTENSION, load_mass_results
+from funcs._legacy_results import load_legacy_shard
+from funcs._sweep import SHARD_PATTERN
+
+# RadialMassFinder.masses 순서. 예전 shard의 mass_name은 "mass1" 처럼 index로 되어 있다.
+MASS_NAMES = ["A1", "A2", "B"]
+LEGACY_MASS_NAME = re.compile(r"^mass(\d+)$")
+ORDER_KEYS = ["area_error", "skipped_area", "shape_metric", "radius"]
+
+CatalogEntry = namedtuple(
+    "CatalogEntry",
+    [
+        "id",
+        "path",
+        "result_index",
+        "mass_name",
+        "radius",
+        "center_x",
+        "center_y",
+        "point_index",
+        "area_error",
+        "skipped_count",
+        "skipped_area",
+        "shape_metric",
+    ],
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    mass_index INTEGER,
+    point_index INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    shard_id INTEGER NOT NULL REFERENCES shards(id) ON DELETE CASCADE,
+    result_index INTEGER NOT NULL,
+    mass_name TEXT NOT NULL,
+    radius REAL NOT NULL,
+    center_x REAL NOT NULL,
+    center_y REAL NOT NULL,
+    area_error REAL NOT NULL,
+    skipped_count INTEGER NOT NULL,
+    skipped_area REAL NOT NULL,
+    shape_metric INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    room TEXT NOT NULL,
+    target_area REAL NOT NULL,
+    assigned_area REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_mass_radius ON results(mass_name, radius);
+CREATE INDEX IF NOT EXISTS rooms_room_area ON rooms(room, assigned_area);
+CREATE INDEX IF NOT EXISTS rooms_result ON rooms(result_id);
+"""
+
+
+def parse_shard_path(path):
+    # type: (str) -> Optional[Tuple[int, int, int]]
+    """mass1_3_14_180results.pickle / .npz -> (mass index, radius, point index)"""
+    file_name = os.path.splitext(os.path.basename(path))[0] + ".pickle"
+    match = SHARD_PATTERN.match(file_name)
+    if match is None:
+        return None
+    mass_index, center_radius, point_index, _ = [int(x) for x in match.groups()]
+    return mass_index, center_radius, point_index
+
+
+def get_mass_name(mass_name, mass_index=None):
+    # type: (str, Optional[int]) -> str
+    """"mass1" 같은 예전 이름을 "A2" 처럼 RadialMass.name으로 바꾼다."""
+    match = LEGACY_MASS_NAME.match(str(mass_name))
+    if match is not None:
+        mass_index = int(match.group(1))
+    elif mass_name in MASS_NAMES:
+        return mass_name
+    if mass_index is not None and 0 <= mass_index < len(MASS_NAMES):
+        return MASS_NAMES[mass_index]
+    return str(mass_name)
+
+
+def get_room_areas(area_groups):
+    # type: (List[Any]) -> Dict[str, Tuple[float, float]]
+    """room 이름 -> (목표 면적, 실제로 받은 면적)
+    area_group 하나에 room이 여러개 들어가면 목표 면적 비율로 나눠 갖는다."""
+    room_areas = {}  # type: Dict[str, Tuple[float, float]]
+    for area_group in area_groups:
+        room_data = get_room_data(area_group.area_data)
+        target_area = sum([data[0] for data in room_data])
+        if target_area <= 0:
+            continue
+        for area, name in room_data:
+            assigned_area = area_group.area * area / target_area
+            prev_target, prev_assigned = room_areas.get(name, (0.0, 0.0))
+            room_areas[name] = (prev_target + area, prev_assigned + assigned_area)
+    return room_areas
+
+
+def get_shape_metric(area_groups):
+    # type: (List[Any]) -> int
+    """area가 set된 area_group 중 shape_ok가 아닌 것의 개수"""
+    count = 0
+    for area_group in area_groups:
+        if not area_group.is_area_set:
+            continue
+        radial_area = area_group.radial_area
+        if not get_shape_ok(radial_area.a1, radial_area.a2, radial_area.r1, radial_area.r2):
+            count += 1
+    return count
+
+
+def load_shard(path):
+    # type: (str) -> MassResults
+    if path.endswith(STORE_EXTENSION):
+        return load_mass_results(path)
+    return load_legacy_shard(path)
+
+
+class ResultCatalog:
+    """
+    sweep shard(.pickle, .npz)의 MassResult를 한 줄씩 SQLite에 색인한다.
+    shard를 하나씩 열지 않고 mass, radius, room 면적, skip 여부 등으로 결과를 찾는다.
+    찾은 결과의 area_group이 필요하면 load_result로 해당 shard만 읽는다.
+
+    catalog = ResultCatalog("results.sqlite")
+    catalog.add_folder("first_res_m1")
+    catalog.query("A2", radius=4, min_room_areas={"community_corridor": 100}, no_skipped=True)
+    """
+
+    def __init__(self, path=":memory:"):
+        # type: (str) -> None
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._loaded_path = None  # type: Optional[str]
+        self._loaded_shard = None  # type: Optional[MassResults]
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def add_shard(self, path):
+        # type: (str) -> int
+        """shard 하나를 색인한다. 이미 색인되었고 수정 시간이 같으면 건너뛴다.
+        새로 색인한 결과 개수를 돌려준다."""
+        with self.connection:
+            return self._add_shard(path)
+
+    def _add_shard(self, path):
+        # type: (str) -> int
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        row = self.connection.execute(
+            "SELECT id, mtime FROM shards WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None:
+            if row[1] == mtime:
+                return 0
+            self.connection.execute("DELETE FROM shards WHERE id = ?", (row[0],))
+
+        parsed = parse_shard_path(path)
+        mass_index, _, point_index = parsed if parsed is not None else (None, None, None)
+        mass_results = load_shard(path)
+        mass_name = get_mass_name(mass_results.mass_name, mass_index)
+
+        shard_id = self.connection.execute(
+            "INSERT INTO shards (path, mtime, mass_index, point_index) VALUES (?, ?, ?, ?)",
+            (path, mtime, mass_index, point_index),
+        ).lastrowid
+        for result_index, mass_result in enumerate(mass_results.outputs):
+            self._add_result(shard_id, result_index, mass_name, mass_results, mass_result)
+        return len(mass_results.outputs)
+
+    def _add_result(self, shard_id, result_index, mass_name, mass_results, mass_result):
+        # type: (int, int, str, MassResults, MassResult) -> None
+        area_groups = mass_result.area_groups
+        skipped_cluster = getattr(mass_result, "skipped_cluster", None) or []
+        skipped_area = sum([sum(area_cluster.values()) for area_cluster in skipped_cluster])
+        result_id = self.connection.execute(
+            "INSERT INTO results (shard_id, result_index, mass_name, radius, center_x, center_y,"
+            " area_error, skipped_count, skipped_area, shape_metric)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                shard_id,
+                result_index,
+                mass_name,
+                mass_results.radius,
+                mass_results.point.X,
+                mass_results.point.Y,
+                get_layout_cost("area_error", area_groups),
+                len(skipped_cluster),
+                skipped_area,
+                get_shape_metric(area_groups),
+            ),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT INTO rooms (result_id, room, target_area, assigned_area) VALUES (?, ?, ?, ?)",
+            [
+                (result_id, name, target_area, assigned_area)
+                for name, (target_area, assigned_area) in get_room_areas(area_groups).items()
+            ],
+        )
+
+    def add_folder(self, folder):
+        # type: (str) -> int
+        """folder 안의 shard를 모두 색인한다. commit은 folder 단위로 한번만 한다."""
+        count = 0
+        with self.connection:
+            for file_name in sorted(os.listdir(folder)):
+                path = os.path.join(folder, file_name)
+                if parse_shard_path(path) is not None:
+                    count += self._add_shard(path)
+        return count
+
+    def query(
+        self,
+        mass_name=None,
+        radius=None,
+        min_room_areas=None,
+        no_skipped=False,
+        max_area_error=None,
+        max_shape_metric=None,
+        order_by=None,
+        limit=None,
+    ):
+        # type: (Optional[str], Optional[float], Optional[Dict[str, float]], bool, Optional[float], Optional[int], Optional[str], Optional[int]) -> List[CatalogEntry]
+        """조건에 맞는 결과들. min_room_areas는 room 이름 -> 최소로 받아야 하는 면적이다.
+        order_by는 ORDER_KEYS 중 하나이고, 없으면 색인된 순서이다."""
+        where = []
+        params = []  # type: List[Any]
+        if mass_name is not None:
+            where.append("results.mass_name = ?")
+            params.append(mass_name)
+        if radius is not None:
+            where.append("results.radius = ?")
+            params.append(radius)
+        if no_skipped:
+            where.append("results.skipped_count = 0")
+        if max_area_error is not None:
+            where.append("results.area_error <= ?")
+            params.append(max_area_error)
+        if max_shape_metric is not None:
+            where.append("results.shape_metric <= ?")
+            params.append(max_shape_metric)
+        for room, min_area in (min_room_areas or {}).items():
+            where.append(
+                "EXISTS (SELECT 1 FROM rooms WHERE rooms.result_id = results.id"
+                " AND rooms.room = ? AND rooms.assigned_area >= ?)"
+            )
+            params.extend([room, min_area])
+
+        sql = (
+            "SELECT results.id, shards.path, results.result_index, results.mass_name,"
+            " results.radius, results.center_x, results.center_y, shards.point_index,"
+            " results.area_error, results.skipped_count, results.skipped_area,"
+            " results.shape_metric FROM results JOIN shards ON shards.id = results.shard_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by is not None:
+            if order_by not in ORDER_KEYS:
+                raise Exception("unknown order_by : {}".format(order_by))
+            sql += " ORDER BY results.{}, results.id".format(order_by)
+        else:
+            sql += " ORDER BY results.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [CatalogEntry(*row) for row in self.connection.execute(sql, params)]
+
+    def get_room_areas(self, entry):
+        # type: (CatalogEntry) -> Dict[str, Tuple[float, float]]
+        """room 이름 -> (목표 면적, 받은 면적)"""
+        rows = self.connection.execute(
+            "SELECT room, target_area, assigned_area FROM rooms WHERE result_id = ?",
+            (entry.id,),
+        )
+        return {room: (target_area, assigned_area) for room, target_area, assigned_area in rows}
+
+    def load_result(self, entry):
+        # type: (CatalogEntry) -> MassResult
+        """entry의 MassResult를 shard에서 읽는다. 마지막으로 읽은 shard는 기억해둔다."""
+        if self._loaded_path != entry.path:
+            self._loaded_shard = load_shard(entry.path)
+            self._loaded_path = entry.path
+        return self._loaded_shard.outputs[entry.result_index]
@@ -0,0 +1,216 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import numpy as np
+
+from funcs.base import MassResults, MassResult
+from funcs._metrics import get_room_data, INVALID_AREA_DATA
+
+STORE_EXTENSION = ".npz"
+STORE_VERSION = 2
+# group_state : area_data가 None / room 리스트 / INVALID_AREA_DATA
+GROUP_NOT_SET = 0
+GROUP_SET = 1
+GROUP_INVALID = 2
+
+
+class StoredPoint:
+    """Rhino 없이 읽을 때 geo.Point3d 대신 쓰는 점"""
+
+    def __init__(self, x, y, z=0.0):
+        self.X = x
+        self.Y = y
+        self.Z = z
+
+    def __repr__(self):
+        return "StoredPoint({}, {}, {})".format(self.X, self.Y, self.Z)
+
+
+class StoredRadialArea:
+    """RadialArea의 숫자만 가진 버전"""
+
+    def __init__(self, c, a1, a2, r1, r2):
+        # type: (StoredPoint, float, float, float, float) -> None
+        self.c = c
+        self.a1 = a1
+        self.a2 = a2
+        self.r1 = r1
+        self.r2 = r2
+
+    @property
+    def area(self):
+        return (self.a2 - self.a1) * ((self.r2**2) - (self.r1**2))
+
+    def duplicate(self):
+        # type: () -> RadialArea
+        """geo.Point3d 중심을 갖는 RadialArea로 복사한다.
+        PlanMaker 등 geometry가 필요한 곳에서 저장된 결과를 쓸 때 부른다."""
+        from funcs._backend import geo
+        from funcs._radial_mass import RadialArea
+
+        c = geo.Point3d(self.c.X, self.c.Y, self.c.Z)
+        return RadialArea(c, self.a1, self.a2, self.r1, self.r2)
+
+
+class StoredAreaGroup:
+    """저장된 결과를 읽을 때 RadialAreaGroup 대신 쓴다.
+    prev, next 관계는 저장하지 않는다."""
+
+    def __init__(self, radial_area, area_data):
+        # type: (StoredRadialArea, Optional[List[Tuple[float, str]]]) -> None
+        self.radial_area = radial_area
+        self.radial_areas = [radial_area]
+        self.area_data = area_data
+        self.prev = None
+        self.next = None
+
+    @property
+    def is_area_set(self):
+        if self.area_data:
+            return True
+        else:
+            return False
+
+    @property
+    def target_area(self):
+        if self.area_data is None:
+            raise Exception("area_data not set")
+        return sum([data[0] for data in self.area_data])
+
+    @property
+    def area(self):
+        return self.radial_area.area
+
+
+def save_mass_results(path, mass_results):
+    # type: (str, MassResults) -> None
+    """MassResults를 숫자 배열(.npz)로 저장한다.
+    area_group 하나가 (c.x, c.y, a1, a2, r1, r2) 한 줄이고
+    room 이름은 room_names table의 index로 저장한다."""
+    room_names = []  # type: List[str]
+    room_ids = {}  # type: Dict[str, int]
+
+    def _room_id(name):
+        if name not in room_ids:
+            room_ids[name] = len(room_names)
+            room_names.append(name)
+        return room_ids[name]
+
+    groups = []
+    group_result = []
+    group_state = []
+    data_rows = []  # (group index, room id, area)
+    skipped_rows = []  # (result index, cluster index, room id, area)
+
+    for result_index, mass_result in enumerate(mass_results.outputs):
+        for area_group in mass_result.area_groups:
+            radial_area = area_group.radial_area
+            group_index = len(groups)
+            groups.append(
+                (
+                    radial_area.c.X,
+                    radial_area.c.Y,
+                    radial_area.a1,
+                    radial_area.a2,
+                    radial_area.r1,
+                    radial_area.r2,
+                )
+            )
+            group_result.append(result_index)
+            if area_group.area_data is None:
+                group_state.append(GROUP_NOT_SET)
+            elif area_group.area_data == INVALID_AREA_DATA:
+                group_state.append(GROUP_INVALID)
+            else:
+                group_state.append(GROUP_SET)
+            for area, name in get_room_data(area_group.area_data):
+                data_rows.append((group_index, _room_id(name), area))
+        skipped_cluster = getattr(mass_result, "skipped_cluster", None) or []
+        for cluster_index, area_cluster in enumerate(skipped_cluster):
+            for name, area in area_cluster.items():
+                skipped_rows.append((result_index, cluster_index, _room_id(name), area))
+
+    point = mass_results.point
+    np.savez_compressed(
+        path,
+        version=np.array(STORE_VERSION),
+        radius=np.array(mass_results.radius, dtype=float),
+        point=np.array([point.X, point.Y, point.Z], dtype=float),
+        mass_name=np.array(str(mass_results.mass_name)),
+        result_count=np.array(len(mass_results.outputs)),
+        room_names=np.array(room_names, dtype=str),
+        groups=np.array(groups, dtype=float).reshape(-1, 6),
+        group_result=np.array(group_result, dtype=np.int32),
+        group_state=np.array(group_state, dtype=np.int8),
+        data_group=np.array([row[0] for row in data_rows], dtype=np.int32),
+        data_room=np.array([row[1] for row in data_rows], dtype=np.int32),
+        data_area=np.array([row[2] for row in data_rows], dtype=float),
+        skipped_result=np.array([row[0] for row in skipped_rows], dtype=np.int32),
+        skipped_cluster=np.array([row[1] for row in skipped_rows], dtype=np.int32),
+        skipped_room=np.array([row[2] for row in skipped_rows], dtype=np.int32),
+        skipped_area=np.array([row[3] for row in skipped_rows], dtype=float),
+    )
+
+
+def load_mass_results(path):
+    # type: (str) -> MassResults
+    """save_mass_results로 저장한 파일을 읽는다. Rhino가 없어도 된다.
+    area_group은 StoredAreaGroup, point는 StoredPoint로 돌아온다."""
+    with np.load(path, allow_pickle=False) as store:
+        data = {key: store[key] for key in store.files}
+
+    room_names = data["room_names"].tolist()
+    point = StoredPoint(*data["point"].tolist())
+    radius = data["radius"].item()
+    if float(radius).is_integer():
+        radius = int(radius)
+
+    area_data_list = [
+        [] for _ in range(len(data["groups"]))
+    ]  # type: List[List[Tuple[float, str]]]
+    for group_index, room_id, area in zip(
+        data["data_group"].tolist(), data["data_room"].tolist(), data["data_area"].tolist()
+    ):
+        area_data_list[group_index].append((area, room_names[room_id]))
+
+    result_count = int(data["result_count"])
+    area_groups_list = [[] for _ in range(result_count)]  # type: List[List[StoredAreaGroup]]
+    if "group_state" in data:
+        group_state = data["group_state"].tolist()
+    else:
+        # version 1은 area_data가 None인지만 저장했다.
+        group_state = [
+            GROUP_SET if is_set else GROUP_NOT_SET for is_set in data["group_is_set"].tolist()
+        ]
+    for group_index, (row, result_index, state) in enumerate(
+        zip(data["groups"].tolist(), data["group_result"].tolist(), group_state)
+    ):
+        cx, cy, a1, a2, r1, r2 = row
+        radial_area = StoredRadialArea(StoredPoint(cx, cy, point.Z), a1, a2, r1, r2)
+        if state == GROUP_SET:
+            area_data = area_data_list[group_index]
+        elif state == GROUP_INVALID:
+            area_data = INVALID_AREA_DATA
+        else:
+            area_data = None
+        area_groups_list[result_index].append(StoredAreaGroup(radial_area, area_data))
+
+    skipped_list = [{} for _ in range(result_count)]  # type: List[Dict[int, Dict[str, float]]]
+    for result_index, cluster_index, room_id, area in zip(
+        data["skipped_result"].tolist(),
+        data["skipped_cluster"].tolist(),
+        data["skipped_room"].tolist(),
+        data["skipped_area"].tolist(),
+    ):
+        cluster = skipped_list[result_index].setdefault(cluster_index, {})
+        cluster[room_names[room_id]] = area
+
+    outputs = [
+        MassResult(area_groups, [skipped[i] for i in sorted(skipped)])
+        for area_groups, skipped in zip(area_groups_list, skipped_list)
+    ]
+    return MassResults(radius, point, data["mass_name"].item(), outputs)
@@ -0,0 +1,307 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Iterator
+except ImportError:
+    pass
+
+import math
+import numpy as np
+
+from funcs._backend import geo
+from funcs._utils import get_radial_area_curve
+from funcs._metrics import LENGTH_DEPTH_RATIO, get_shape_ok
+
+
+def get_shape_ok_array(a1, a2, r1, r2):
+    # type: (np.ndarray, np.ndarray, np.ndarray, np.ndarray) -> np.ndarray
+    """_metrics.get_shape_ok를 배열 전체에 한번에 적용한다."""
+    valid = r2 > r1
+    depth = np.where(valid, r2 - r1, 1.0)
+    return valid & (r1 * (a2 - a1) / depth > LENGTH_DEPTH_RATIO)
+
+
+class Ring:
+    """
+    RadialMass 한바퀴의 조각들을 a1, a2, r1, r2 배열로 갖는다.
+    조각마다 RadialArea 객체를 두지 않으므로 메모리가 작고,
+    전체 면적, 최대/최소 반지름, 형태 확인, create_center를 배열 연산 한번으로 한다.
+    객체가 필요한 곳에는 ring[i]로 RingRange view를 준다.
+    RadialMass.generate가 끝난 ring은 바꾸지 않는다. (create_center는 새 ring을 만든다.)
+    """
+
+    __slots__ = ("center", "a1", "a2", "r1", "r2")
+
+    def __init__(self, center, a1, a2, r1, r2):
+        # type: (geo.Point3d, List[float], List[float], List[float], List[float]) -> None
+        self.center = center
+        self.a1 = np.array(a1, dtype=float)
+        self.a2 = np.array(a2, dtype=float)
+        self.r1 = np.array(r1, dtype=float)
+        self.r2 = np.array(r2, dtype=float)
+
+    @classmethod
+    def from_slices(cls, center, slices):
+        # type: (geo.Point3d, List[Tuple[float, float, float]]) -> Ring
+        """RadialCache의 (a1, a2, 최대 반지름) 조각들로 만든다. r1은 0이다."""
+        return cls(
+            center,
+            [a1 for a1, _, _ in slices],
+            [a2 for _, a2, _ in slices],
+            [0.0] * len(slices),
+            [radius for _, _, radius in slices],
+        )
+
+    def __getstate__(self):
+        return (self.center, self.a1, self.a2, self.r1, self.r2)
+
+    def __setstate__(self, state):
+        self.center, self.a1, self.a2, self.r1, self.r2 = state
+
+    def __len__(self):
+        return len(self.a1)
+
+    def __getitem__(self, index):
+        # type: (int) -> RingRange
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return RingRange(self, index)
+
+    def __iter__(self):
+        # type: () -> Iterator[RingRange]
+        for index in range(len(self)):
+            yield RingRange(self, index)
+
+    def duplicate(self):
+        # type: () -> Ring
+        return Ring(self.center, self.a1, self.a2, self.r1, self.r2)
+
+    @property
+    def areas(self):
+        # type: () -> np.ndarray
+        return (self.a2 - self.a1) * ((self.r2**2) - (self.r1**2))
+
+    @property
+    def area(self):
+        # type: () -> float
+        return float(self.areas.sum())
+
+    @property
+    def max_radius(self):
+        # type: () -> float
+        return float(self.r2.max())
+
+    @property
+    def min_radius(self):
+        # type: () -> float
+        return float(self.r2.min())
+
+    @property
+    def shape_ok(self):
+        # type: () -> np.ndarray
+        return get_shape_ok_array(self.a1, self.a2, self.r1, self.r2)
+
+    def with_center(self, radius):
+        # type: (float) -> Ring
+        """모든 조각의 r1이 radius인 새 ring"""
+        ring = self.duplicate()
+        ring.r1[:] = radius
+        return ring
+
+
+class RingRange:
+    """
+    Ring의 start부터 count개 조각을 합친 것을 RadialArea처럼 보여주는 view.
+    값은 ring 배열에 있고, 객체에는 (ring, start, count)만 있다.
+    합친 형태는 RadialAreaGroup.create_radial_mass처럼 a1은 첫 조각, a2는 마지막 조각,
+    r1은 조각들 중 큰 것, r2는 작은 것이고, 필요할 때 계산한다.
+    ring은 바꾸지 않으므로 여러 area group이 같은 ring을 나눠 쓰고,
+    합친 값과 area, shape_ok는 처음 쓸 때 한번만 계산한다.
+    """
+
+    __slots__ = ("ring", "start", "count", "_values", "_area", "_shape_ok")
+
+    def __init__(self, ring, start, count=1):
+        # type: (Ring, int, int) -> None
+        self.ring = ring
+        self.start = start
+        self.count = count
+        self._values = None  # type: Optional[Tuple[float, float, float, float]]
+        self._area = None  # type: Optional[float]
+        self._shape_ok = None  # type: Optional[bool]
+
+    def __reduce__(self):
+        # 결과 shard에는 ring 전체 대신 합친 값만 RadialArea로 저장한다. (예전 shard와 같은 형식)
+        from funcs._radial_mass import RadialArea
+
+        return (RadialArea, (self.c, self.a1, self.a2, self.r1, self.r2))
+
+    @property
+    def indices(self):
+        # type: () -> np.ndarray
+        return (np.arange(self.count) + self.start) % len(self.ring)
+
+    @property
+    def end(self):
+        # type: () -> int
+        """마지막 조각 다음 index"""
+        return (self.start + self.count) % len(self.ring)
+
+    def is_followed_by(self, other):
+        # type: (Any) -> bool
+        """other가 같은 ring에서 바로 다음에 이어지는 range인지"""
+        return (
+            isinstance(other, RingRange)
+            and other.ring is self.ring
+            and other.start == self.end
+        )
+
+    def extended(self, count):
+        # type: (int) -> RingRange
+        """뒤로 count개 조각을 더 합친 range"""
+        return RingRange(self.ring, self.start, self.count + count)
+
+    @property
+    def c(self):
+        return self.ring.center
+
+    @property
+    def values(self):
+        # type: () -> Tuple[float, float, float, float]
+        """(a1, a2, r1, r2)"""
+        if self._values is None:
+            ring = self.ring
+            a1 = float(ring.a1[self.start])
+            a2 = float(ring.a2[(self.start + self.count - 1) % len(ring)])
+            if a2 < a1:
+                a1 = a1 - 2 * math.pi
+            if self.count == 1:
+                r1 = float(ring.r1[self.start])
+                r2 = float(ring.r2[self.start])
+            else:
+                indices = self.indices
+                r1 = float(ring.r1[indices].max())
+                r2 = float(ring.r2[indices].min())
+            self._values = (a1, a2, r1, r2)
+        return self._values
+
+    @property
+    def a1(self):
+        # type: () -> float
+        return self.values[0]
+
+    @property
+    def a2(self):
+        # type: () -> float
+        return self.values[1]
+
+    @property
+    def r1(self):
+        # type: () -> float
+        return self.values[2]
+
+    @property
+    def r2(self):
+        # type: () -> float
+        return self.values[3]
+
+    @property
+    def v1(self):
+        a1 = self.a1
+        return geo.Vector3d(math.cos(a1), math.sin(a1), 0)
+
+    @property
+    def v2(self):
+        a2 = self.a2
+        return geo.Vector3d(math.cos(a2), math.sin(a2), 0)
+
+    def duplicate(self):
+        """ring과 떨어진 RadialArea로 복사한다. 값을 바꿀 때 쓴다."""
+        from funcs._radial_mass import RadialArea
+
+        return RadialArea(self.c, self.a1, self.a2, self.r1, self.r2)
+
+    @property
+    def geom(self):
+        return get_radial_area_curve(self.c, self.a1, self.a2, self.r1, self.r2)
+
+    @property
+    def area(self):
+        if self._area is None:
+            a1, a2, r1, r2 = self.values
+            self._area = (a2 - a1) * ((r2**2) - (r1**2))
+        return self._area
+
+    @property
+    def shape_ok(self):
+        if self._shape_ok is None:
+            self._shape_ok = get_shape_ok(*self.values)
+        return self._shape_ok
+
+
+class RingWindows:
+    """
+    ring에서 연속된 length개 조각을 합친 area group(window)들을 조각 배열로 계산한다.
+    start index마다 window가 하나씩 있고, grow()로 length를 하나씩 늘린다.
+    합친 area group은 RadialAreaGroup.create_radial_mass처럼
+    r1은 조각들 중 큰 것, r2는 작은 것이므로 길이를 늘릴 때 이전 길이의 값에 한 조각만 더 본다.
+    area group 객체는 필요한 window만 RingRange(ring, start, length)로 만든다.
+    """
+
+    def __init__(self, ring):
+        # type: (Ring) -> None
+        self.ring = ring
+        self.length = 1
+        self.r1 = ring.r1.copy()
+        self.r2 = ring.r2.copy()
+
+    def grow(self):
+        ring = self.ring
+        added = (np.arange(len(ring)) + self.length) % len(ring)
+        self.r1 = np.maximum(self.r1, ring.r1[added])
+        self.r2 = np.minimum(self.r2, ring.r2[added])
+        self.length += 1
+
+    @property
+    def a1(self):
+        # type: () -> np.ndarray
+        """끝 각도보다 크면 한바퀴 뺀다. (0도를 지나는 window)"""
+        a1 = self.ring.a1
+        return np.where(self.a2 < a1, a1 - 2 * math.pi, a1)
+
+    @property
+    def a2(self):
+        # type: () -> np.ndarray
+        last = (np.arange(len(self.ring)) + self.length - 1) % len(self.ring)
+        return self.ring.a2[last]
+
+    @property
+    def spans(self):
+        # type: () -> np.ndarray
+        return self.a2 - self.a1
+
+    @property
+    def areas(self):
+        # type: () -> np.ndarray
+        return self.spans * ((self.r2**2) - (self.r1**2))
+
+
+def get_prefix_areas(areas):
+    # type: (List[float]) -> List[float]
+    """[0, a0, a0 + a1, ...] sum()과 같은 순서로 더한다."""
+    prefix_areas = [0]
+    for area in areas:
+        prefix_areas.append(prefix_areas[-1] + area)
+    return prefix_areas
+
+
+def get_covering_count(prefix_areas, area):
+    # type: (List[float], float) -> Optional[int]
+    """앞에서부터 몇 개를 합치면 area 이상이 되는지. 모두 합쳐도 모자라면 None
+    면적이 음수인 조각이 있을 수 있으므로 이분탐색하지 않는다."""
+    for count, prefix_area in enumerate(prefix_areas):
+        if prefix_area >= area:
+            return count
+    return None
@@ -0,0 +1,57 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+from funcs._interval_index import AngularIntervalIndex
+
+
+class ScenarioRecord:
+    """
+    시나리오 조합을 deepcopy 없이 표현하기 위한 불변 기록이다.
+    index는 해당 단계(depth)의 후보 table에서의 위치이고,
+    parent를 공유하기 때문에 조합을 하나 늘리는 데는 O(1)이 든다.
+    후보 table(area_group 후보, extension scenario 후보)은 모든 기록이 공유하고 수정하지 않는다.
+    interval_index는 지금까지 고른 후보들의 각도 구간이고, 자식은 부모 것을 복사해서 늘린다.
+    """
+
+    def __init__(self, index, parent=None, interval_index=None):
+        # type: (int, Optional[ScenarioRecord], Optional[AngularIntervalIndex]) -> None
+        self.index = index
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.interval_index = interval_index or AngularIntervalIndex()
+
+    @classmethod
+    def first(cls, index, intervals=None):
+        # type: (int, Optional[List[Tuple[float, float]]]) -> ScenarioRecord
+        """첫 단계의 기록"""
+        return cls(index, interval_index=AngularIntervalIndex(intervals))
+
+    def extend(self, index, intervals=None):
+        # type: (int, Optional[List[Tuple[float, float]]]) -> ScenarioRecord
+        return ScenarioRecord(index, self, self.interval_index.added(intervals or []))
+
+    def overlaps(self, intervals):
+        # type: (List[Tuple[float, float]]) -> bool
+        """intervals가 이미 고른 후보들의 각도 구간과 겹치는지 확인한다."""
+        return self.interval_index.overlaps(intervals)
+
+    @property
+    def indices(self):
+        # type: () -> Tuple[int, ...]
+        res = []
+        record = self
+        while record is not None:
+            res.append(record.index)
+            record = record.parent
+        res.reverse()
+        return tuple(res)
+
+    def resolve(self, tables):
+        # type: (List[List[Any]]) -> List[Any]
+        """depth별 table에서 실제 후보 객체를 꺼낸다."""
+        return [table[index] for table, index in zip(tables, self.indices)]
+
@@ -0,0 +1,121 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Callable, Iterator
+except ImportError:
+    pass
+
+import time
+import heapq
+
+from funcs._scenario_record import ScenarioRecord
+
+OBJECTIVES = ["area_error", "shape"]
+
+
+class SearchEngine:
+    """
+    AreaToMass의 배치 조합을 depth first로 탐색한다.
+    depth마다 후보 table이 있고, 부분 조합은 ScenarioRecord로 부모에 이어 붙인다.
+    찾은 조합은 depth별 index의 tuple로 돌려준다.
+
+    - 각도 구간이 이미 고른 후보와 겹치면 그 아래는 보지 않는다.
+    - is_feasible(candidates)가 False인 부분 조합도 그 아래를 보지 않는다.
+    - objective가 있으면 get_cost(depth, candidate)의 합이 작은 max_results개만 남긴다.
+      cost는 음수가 아니어야 하고, 부분 조합의 cost가 이미 남긴 것 중 가장 나쁜 것보다
+      나쁘면 가지치기 한다. (branch and bound)
+    - objective가 없으면 max_results개를 찾는 대로 멈춘다. (first-k)
+    - time_budget(초)이 지나면 지금까지 찾은 것만 돌려준다.
+    max_results, objective, time_budget이 모두 None이면 기존처럼 모든 조합을 찾는다.
+    """
+
+    def __init__(self, max_results=None, objective=None, time_budget=None):
+        # type: (Optional[int], Optional[str], Optional[float]) -> None
+        if objective is not None and objective not in OBJECTIVES:
+            raise Exception("unknown objective : {}".format(objective))
+        self.max_results = max_results
+        self.objective = objective
+        self.time_budget = time_budget
+        self.deadline = None  # type: Optional[float]
+
+    def start(self):
+        """time_budget을 여기서부터 잰다. AreaToMass.process 시작 시 호출된다."""
+        if self.time_budget is not None:
+            self.deadline = time.time() + self.time_budget
+
+    @property
+    def is_timeout(self):
+        return self.deadline is not None and time.time() > self.deadline
+
+    def iterate(
+        self, tables, get_intervals, get_cost=None, is_feasible=None, bound=None
+    ):
+        # type: (List[List[Any]], Callable, Optional[Callable], Optional[Callable], Optional[Callable]) -> Iterator[Tuple[float, Tuple[int, ...]]]
+        """(cost, indices)를 사전순(기존 전체 조합 순서)으로 하나씩 돌려준다.
+        bound()가 주어지면 부분 조합의 cost가 bound() 이상일 때 가지치기 한다."""
+        if len(tables) == 0:
+            return
+        intervals_tables = [
+            [get_intervals(candidate) for candidate in table] for table in tables
+        ]
+        def _search(record, cost):
+            # type: (Optional[ScenarioRecord], float) -> Iterator[Tuple[float, Tuple[int, ...]]]
+            if self.is_timeout:
+                return
+            depth = 0 if record is None else record.depth + 1
+            for i, candidate in enumerate(tables[depth]):
+                intervals = intervals_tables[depth][i]
+                if record is not None and record.overlaps(intervals):
+                    continue
+                next_cost = cost
+                if get_cost is not None:
+                    next_cost += get_cost(depth, candidate)
+                    if bound is not None and next_cost >= bound():
+                        continue
+                if record is None:
+                    next_record = ScenarioRecord.first(i, intervals)
+                else:
+                    next_record = record.extend(i, intervals)
+                if is_feasible is None or is_feasible(next_record.resolve(tables)):
+                    if depth == len(tables) - 1:
+                        yield next_cost, next_record.indices
+                    else:
+                        for res in _search(next_record, next_cost):
+                            yield res
+                if self.is_timeout:
+                    return
+
+        for res in _search(None, 0.0):
+            yield res
+
+    def search(
+        self, tables, get_intervals, get_cost=None, is_feasible=None, limit=True
+    ):
+        # type: (List[List[Any]], Callable, Optional[Callable], Optional[Callable], bool) -> List[Tuple[int, ...]]
+        """조건에 맞는 조합의 index tuple 리스트.
+        objective가 있으면 cost가 작은 순서, 없으면 사전순이다.
+        limit이 False이면 max_results를 적용하지 않는다. (중간 단계 탐색용)"""
+        max_results = self.max_results if limit else None
+        if self.objective is None or get_cost is None:
+            res = []
+            for _, indices in self.iterate(tables, get_intervals, None, is_feasible):
+                res.append(indices)
+                if max_results is not None and len(res) >= max_results:
+                    break
+            return res
+
+        # heap에는 (-cost, -순서, indices)를 넣어서 가장 나쁜 것이 맨 앞에 오게 한다.
+        best = []  # type: List[Tuple[float, int, Tuple[int, ...]]]
+
+        def _bound():
+            if max_results is None or len(best) < max_results:
+                return float("inf")
+            return -best[0][0]
+
+        generator = self.iterate(tables, get_intervals, get_cost, is_feasible, _bound)
+        for order, (cost, indices) in enumerate(generator):
+            heapq.heappush(best, (-cost, -order, indices))
+            if max_results is not None and len(best) > max_results:
+                heapq.heappop(best)
+        best.sort(key=lambda x: (-x[0], -x[1]))
+        return [indices for _, _, indices in best]
@@ -0,0 +1,80 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import math
+
+TOL = 0.001
+
+
+def bbox_overlaps(bbox_1, bbox_2, tol=TOL):
+    # type: (Tuple[float, float, float, float], Tuple[float, float, float, float], float) -> bool
+    """(xmin, ymin, xmax, ymax) 형태의 bbox 두개가 겹치는지 확인한다."""
+    return not (
+        bbox_1[2] < bbox_2[0] - tol
+        or bbox_2[2] < bbox_1[0] - tol
+        or bbox_1[3] < bbox_2[1] - tol
+        or bbox_2[3] < bbox_1[1] - tol
+    )
+
+
+def get_polyline_bbox(points):
+    # type: (List[Tuple[float, float]]) -> Tuple[float, float, float, float]
+    xs = [pt[0] for pt in points]
+    ys = [pt[1] for pt in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+class Sector:
+    """
+    RadialArea를 Rhino geometry 없이 해석적으로 표현한 것이다.
+    (cx, cy) 중심
+    a1 시작 각도
+    a2 종료 각도 (a1 < a2, a1은 음수일 수 있다.)
+    r1 시작 반지름
+    r2 종료 반지름
+    반지름 탐색에서 근처 constraint만 고를 때 쓰는 bounding box를 이 값들만으로 계산한다.
+    area_group끼리의 겹침은 각도 구간으로 확인하므로 여기서 하지 않는다.
+    Rhino Curve는 필요할 때만 _utils.get_radial_area_curve로 만든다.
+    """
+
+    def __init__(self, cx, cy, a1, a2, r1, r2):
+        # type: (float, float, float, float, float, float) -> None
+        self.cx = cx
+        self.cy = cy
+        self.a1 = a1
+        self.a2 = a2
+        self.r1 = r1
+        self.r2 = r2
+
+    def __repr__(self):
+        return "Sector(c=({:.3f}, {:.3f}), a=({:.4f}, {:.4f}), r=({}, {}))".format(
+            self.cx, self.cy, self.a1, self.a2, self.r1, self.r2
+        )
+
+    def point_at(self, angle, radius):
+        # type: (float, float) -> Tuple[float, float]
+        return (
+            self.cx + radius * math.cos(angle),
+            self.cy + radius * math.sin(angle),
+        )
+
+    @property
+    def bbox(self):
+        # type: () -> Tuple[float, float, float, float]
+        """(xmin, ymin, xmax, ymax). 호의 극값(0, pi/2, pi, 3pi/2)을 포함해서 계산한다."""
+        points = [
+            self.point_at(self.a1, self.r1),
+            self.point_at(self.a1, self.r2),
+            self.point_at(self.a2, self.r1),
+            self.point_at(self.a2, self.r2),
+        ]
+        quarter = math.pi / 2
+        k = int(math.ceil(self.a1 / quarter))
+        while k * quarter <= self.a2:
+            points.append(self.point_at(k * quarter, self.r2))
+            k += 1
+        return get_polyline_bbox(points)
@@ -5,11 +5,22 @@ try:
 except ImportError:
     pass
 
+from funcs._backend import geo
+
 from funcs._utils import (
     is_pt_inside,
     get_difference_regions,
     get_intersection_regions,
-    get_points_in_boundary,
+    get_curve_points,
+)
+from funcs._site_index import SiteIndex
+from funcs._radial_cache import get_site_fingerprint
+from funcs._site_grid import (
+    CONDITION_KEYS,
+    CONDITION_BITS,
+    get_grid_points,
+    get_condition_mask,
+    filter_mask,
 )
 
 
@@ -21,6 +32,14 @@ class SitePoint:
         self.is_on_slope = False
         self.is_on_forest_entrance = False
 
+    def set_condition_mask(self, mask):
+        # type: (int) -> None
+        """_site_grid.get_condition_mask로 계산한 bit로 조건을 set한다."""
+        self.is_close_street = bool(mask & CONDITION_BITS["close_street"])
+        self.is_close_park = bool(mask & CONDITION_BITS["close_park"])
+        self.is_on_slope = bool(mask & CONDITION_BITS["on_slope"])
+        self.is_on_forest_entrance = bool(mask & CONDITION_BITS["on_forest_entrance"])
+
     def evaluate(self, param_geom):
         for key, geom in param_geom.items():
             if key == "close_street" and is_pt_inside(self.point, geom):
@@ -37,6 +56,8 @@ class Site:
     def __init__(self, boundary, point_dist, param_geoms):
         self.boundary = boundary
         self.points = []
+        self.grid_points = None  # (N, 2) 배열
+        self.condition_mask = None  # 점마다 CONDITION_BITS를 합친 값
         self.point_dist = point_dist
         self.param_geoms = param_geoms
         self.street_geom = param_geoms["close_street"]
@@ -44,12 +65,24 @@ class Site:
         self.slope_geom = param_geoms["on_slope"]
         self.forest_entrance_geom = param_geoms["on_forest_entrance"]
         self.conditions = None
+        # 조건 geometry의 polyline 근사와 공간 인덱스. Site 하나당 한번만 만든다.
+        self.constraint_polylines = {"lot": get_curve_points(boundary)}
+        for key in CONDITION_KEYS:
+            self.constraint_polylines[key] = get_curve_points(param_geoms[key])
+        self.index = SiteIndex(self.constraint_polylines)
+        self.fingerprint = get_site_fingerprint(self.constraint_polylines)
         self._generate_points()
-        # self._evaluate_points()
+        self._evaluate_points()
 
     def get_conditioned_area(self, conditions, offset):
         output = [self.boundary]
+        lot_bbox = self.index.bboxes["lot"]
         for condition in conditions:
+            if not self.index.may_touch(condition.lstrip("!"), lot_bbox):
+                # 조건 geometry가 대지와 멀리 떨어져 있으면 boolean 연산을 하지 않는다.
+                if condition in CONDITION_KEYS:
+                    output = []
+                continue
             if condition == "all":
                 pass
             if condition == "close_street":
@@ -72,44 +105,29 @@ class Site:
         return output
 
     def _evaluate_points(self):
+        # 모든 점을 한번에 판별한다. 점 하나씩 is_pt_inside를 하지 않는다.
+        self.condition_mask = get_condition_mask(
+            self.grid_points, self.constraint_polylines
+        )
         evaluated_points = []
-        for point in self.points:
+        for point, mask in zip(self.points, self.condition_mask):
             site_point = SitePoint(point)
-            site_point.evaluate(self.param_geoms)
+            site_point.set_condition_mask(int(mask))
             evaluated_points.append(site_point)
         self.points = evaluated_points
 
     def _generate_points(self):
-        self.points = get_points_in_boundary(self.boundary, self.point_dist)
+        self.grid_points = get_grid_points(
+            self.constraint_polylines["lot"], self.point_dist
+        )
+        z = self.boundary.PointAtStart.Z
+        self.points = [geo.Point3d(x, y, z) for x, y in self.grid_points]
 
-    def filter_by_condition(self, conditions):
-        res = []
-        for condition in conditions:
-            if condition == "all":
-                res.extend(self.points)
-                res = list(set(res))
-            if condition == "close_street":
-                res.extend([point for point in self.points if point.is_close_street])
-                res = list(set(res))  # 중복삭제
-            if condition == "close_park":
-                res.extend([point for point in self.points if point.is_close_park])
-                res = list(set(res))  # 중복삭제
-            if condition == "on_slope":
-                res.extend([point for point in self.points if point.is_on_slope])
-                res = list(set(res))  # 중복삭제
-            if condition == "on_forest_entrance":
-                res.extend(
-                    [point for point in self.points if point.is_on_forest_entrance]
-                )
-                res = list(set(res))  # 중복삭제
-            if "!" in condition:
-                if condition == "!close_street":
-                    res = [point for point in res if not point.is_close_street]
-                if condition == "!close_park":
-                    res = [point for point in res if not point.is_close_park]
-                if condition == "!on_slope":
-                    res = [point for point in res if not point.is_on_slope]
-                if condition == "!on_forest_entrance":
-                    res = [point for point in res if not point.is_on_forest_entrance]
+    def filter_indices(self, conditions):
+        # type: (List[str]) -> List[int]
+        """조건식을 만족하는 점들의 index. 조건식은 한번만 해석하고 bit 연산으로 거른다."""
+        return filter_mask(self.condition_mask, conditions).tolist()
 
-        return res
+    def filter_by_condition(self, conditions):
+        # type: (List[str]) -> List[SitePoint]
+        return [self.points[i] for i in self.filter_indices(conditions)]
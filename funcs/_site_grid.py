@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import math
+import numpy as np
+
+from funcs._sector import TOL
+
+CONDITION_KEYS = ["close_street", "close_park", "on_slope", "on_forest_entrance"]
+CONDITION_BITS = {key: 1 << i for i, key in enumerate(CONDITION_KEYS)}
+ALL_POINTS = -1  # "all" 조건
+CHUNK_SIZE = 4096
+
+
+def points_in_polygon(points, polygon, tol=TOL):
+    # type: (np.ndarray, List[Tuple[float, float]], float) -> np.ndarray
+    """(N, 2) 점 배열 전체를 한번에 crossing number로 판별한다.
+    경계 위(tol 이내)의 점은 Curve.Contains의 Coincident처럼 안쪽으로 본다."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    poly = np.asarray(polygon, dtype=float)
+    if len(poly) < 3:
+        return np.zeros(len(points), dtype=bool)
+    if not np.array_equal(poly[0], poly[-1]):
+        poly = np.vstack([poly, poly[:1]])
+
+    x1 = poly[:-1, 0][None, :]
+    y1 = poly[:-1, 1][None, :]
+    y2 = poly[1:, 1][None, :]
+    dx = (poly[1:, 0] - poly[:-1, 0])[None, :]
+    dy = (poly[1:, 1] - poly[:-1, 1])[None, :]
+    length2 = dx**2 + dy**2
+    safe_dy = np.where(dy == 0, 1.0, dy)
+    safe_length2 = np.where(length2 == 0, 1.0, length2)
+
+    res = np.empty(len(points), dtype=bool)
+    # 점이 많을 때 (N, 선분 수) 배열이 너무 커지지 않도록 잘라서 계산한다.
+    for start in range(0, len(points), CHUNK_SIZE):
+        x = points[start : start + CHUNK_SIZE, 0:1]
+        y = points[start : start + CHUNK_SIZE, 1:2]
+
+        crosses = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * dx / safe_dy
+        inside = np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+
+        t = np.clip(((x - x1) * dx + (y - y1) * dy) / safe_length2, 0.0, 1.0)
+        dist2 = (x1 + t * dx - x) ** 2 + (y1 + t * dy - y) ** 2
+        on_boundary = np.any(dist2 <= tol**2, axis=1)
+
+        res[start : start + CHUNK_SIZE] = inside | on_boundary
+    return res
+
+
+def get_grid_points(polygon, step):
+    # type: (List[Tuple[float, float]], float) -> np.ndarray
+    """_utils.get_points_in_boundary의 batch 버전.
+    bbox 최소점부터 step 간격의 격자 중 polygon 안에 있는 점을 (N, 2) 배열로 돌려준다.
+    순서는 기존과 같이 x 방향 index가 바깥 loop이다."""
+    poly = np.asarray(polygon, dtype=float)
+    x_min, y_min = poly.min(axis=0)
+    x_max, y_max = poly.max(axis=0)
+    xs = x_min + step * np.arange(int(math.ceil((x_max - x_min) / step)))
+    ys = y_min + step * np.arange(int(math.ceil((y_max - y_min) / step)))
+    grid_x, grid_y = np.meshgrid(xs, ys, indexing="ij")
+    grid = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+    return grid[points_in_polygon(grid, polygon)]
+
+
+def get_condition_mask(points, polylines):
+    # type: (np.ndarray, Dict[str, List[Tuple[float, float]]]) -> np.ndarray
+    """점마다 조건 bit(CONDITION_BITS)를 합친 uint8 배열을 만든다."""
+    mask = np.zeros(len(points), dtype=np.uint8)
+    for key in CONDITION_KEYS:
+        if key in polylines:
+            inside = points_in_polygon(points, polylines[key])
+            mask[inside] |= CONDITION_BITS[key]
+    return mask
+
+
+_compiled_conditions = {}  # type: Dict[Tuple[str, ...], List[Tuple[bool, int]]]
+
+
+def compile_conditions(conditions):
+    # type: (List[str]) -> List[Tuple[bool, int]]
+    """["all", "!on_slope", "close_street"] 같은 조건식을 (추가 여부, bit) 리스트로 바꾼다.
+    Site.filter_by_condition과 같이 앞에서부터 차례로 적용한다.
+    일반 조건은 해당 bit를 가진 점을 더하고, "!" 조건은 지금까지 고른 점에서 뺀다."""
+    key = tuple(conditions)
+    if key in _compiled_conditions:
+        return _compiled_conditions[key]
+    compiled = []
+    for condition in conditions:
+        if condition == "all":
+            compiled.append((True, ALL_POINTS))
+        elif condition in CONDITION_BITS:
+            compiled.append((True, CONDITION_BITS[condition]))
+        elif condition.startswith("!") and condition[1:] in CONDITION_BITS:
+            compiled.append((False, CONDITION_BITS[condition[1:]]))
+    _compiled_conditions[key] = compiled
+    return compiled
+
+
+def filter_mask(mask, conditions):
+    # type: (np.ndarray, List[str]) -> np.ndarray
+    """조건식을 만족하는 점의 index 배열"""
+    selected = np.zeros(len(mask), dtype=bool)
+    for is_add, bits in compile_conditions(conditions):
+        if bits == ALL_POINTS:
+            selected[:] = True
+        elif is_add:
+            selected |= (mask & bits) != 0
+        else:
+            selected &= (mask & bits) == 0
+    return np.flatnonzero(selected)
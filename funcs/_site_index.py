@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional
+except ImportError:
+    pass
+
+import math
+
+from funcs._sector import TOL, bbox_overlaps, get_polyline_bbox
+
+
+class SiteIndex:
+    """
+    Site의 조건 geometry(lot, close_street, close_park, on_slope, on_forest_entrance)를
+    polyline 선분 단위로 uniform grid에 넣어둔 공간 인덱스이다.
+    Site 하나당 한번 만들고, 반지름 탐색은 get_segments로 근처 선분만 가져간다.
+    질의 bbox가 조건 geometry의 bbox와 아예 안 겹치면 may_touch가 바로 False를 돌려준다.
+    """
+
+    def __init__(self, polylines, cell_size=None):
+        # type: (Dict[str, List[Tuple[float, float]]], Optional[float]) -> None
+        self.polylines = polylines
+        self.bboxes = {}  # type: Dict[str, Tuple[float, float, float, float]]
+        self.segments = []  # type: List[Tuple[str, Tuple[float, float], Tuple[float, float]]]
+
+        for key, points in polylines.items():
+            if len(points) < 2:
+                continue
+            self.bboxes[key] = get_polyline_bbox(points)
+            for i in range(1, len(points)):
+                self.segments.append((key, points[i - 1], points[i]))
+
+        all_points = [pt for points in polylines.values() for pt in points]
+        self.bbox = get_polyline_bbox(all_points) if all_points else (0, 0, 0, 0)
+        if cell_size is None:
+            extent = max(self.bbox[2] - self.bbox[0], self.bbox[3] - self.bbox[1], 1.0)
+            cell_size = extent / max(1, int(math.sqrt(len(self.segments))))
+        self.cell_size = cell_size
+
+        self.grid = {}  # type: Dict[Tuple[int, int], List[int]]
+        for segment_id, (_, p, q) in enumerate(self.segments):
+            for cell in self._cells(get_polyline_bbox([p, q])):
+                self.grid.setdefault(cell, []).append(segment_id)
+
+    def _cell_index(self, value, origin):
+        return int(math.floor((value - origin) / self.cell_size))
+
+    def _cell_range(self, bbox):
+        ix0 = self._cell_index(bbox[0] - TOL, self.bbox[0])
+        ix1 = self._cell_index(bbox[2] + TOL, self.bbox[0])
+        iy0 = self._cell_index(bbox[1] - TOL, self.bbox[1])
+        iy1 = self._cell_index(bbox[3] + TOL, self.bbox[1])
+        return ix0, ix1, iy0, iy1
+
+    def _cells(self, bbox):
+        ix0, ix1, iy0, iy1 = self._cell_range(bbox)
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                yield ix, iy
+
+    def _segment_ids(self, bbox):
+        ix0, ix1, iy0, iy1 = self._cell_range(bbox)
+        # 인덱스 밖 영역은 cell을 돌지 않도록 잘라낸다.
+        ix0, iy0 = max(ix0, 0), max(iy0, 0)
+        ix1 = min(ix1, self._cell_index(self.bbox[2], self.bbox[0]))
+        iy1 = min(iy1, self._cell_index(self.bbox[3], self.bbox[1]))
+        found = set()
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                found.update(self.grid.get((ix, iy), ()))
+        return sorted(found)
+
+    def may_touch(self, key, bbox):
+        # type: (str, Tuple[float, float, float, float]) -> bool
+        """bbox가 key 조건 geometry의 bbox와 겹치지 않으면 False. (빠른 reject 용도)"""
+        return key in self.bboxes and bbox_overlaps(self.bboxes[key], bbox)
+
+    def get_segments(self, bbox, keys=None):
+        # type: (Tuple[float, float, float, float], Optional[List[str]]) -> List[Tuple[Tuple[float, float], Tuple[float, float]]]
+        """bbox와 겹치는 선분들. keys가 있으면 해당 조건의 선분만 돌려준다."""
+        if keys is not None:
+            keys = [key for key in keys if self.may_touch(key, bbox)]
+            if not keys:
+                return []
+        res = []
+        for segment_id in self._segment_ids(bbox):
+            key, p, q = self.segments[segment_id]
+            if keys is not None and key not in keys:
+                continue
+            if bbox_overlaps(get_polyline_bbox([p, q]), bbox):
+                res.append((p, q))
+        return res
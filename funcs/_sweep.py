@@ -0,0 +1,147 @@
+# -*- coding:utf-8 -*-
+# pylint: disable=bare-except
+try:
+    from typing import List, Tuple, Dict, Any, Optional, Callable, Iterator
+except ImportError:
+    pass
+
+import os
+import re
+import pickle
+import multiprocessing
+from collections import namedtuple
+from functools import partial
+
+from funcs.base import MassResults
+
+SHARD_FORMAT = "mass{}_{}_{}_{}results.pickle"
+SHARD_PATTERN = re.compile(r"^mass(\d+)_(\d+)_(\d+)_(\d+)results\.pickle$")
+
+SweepJob = namedtuple("SweepJob", ["mass_index", "center_radius", "point_index"])
+
+# worker process마다 한번만 만드는 RadialMassFinder와 후보 center point
+_worker_state = {}  # type: Dict[str, Any]
+
+
+def get_sweep_jobs(mass_indices, center_radii, point_indices):
+    # type: (List[int], List[int], List[int]) -> List[SweepJob]
+    return [
+        SweepJob(mass_index, center_radius, point_index)
+        for mass_index in mass_indices
+        for center_radius in center_radii
+        for point_index in point_indices
+    ]
+
+
+def parse_shard_name(file_name):
+    # type: (str) -> Optional[Tuple[SweepJob, int]]
+    """mass1_3_14_180results.pickle -> (SweepJob(1, 3, 14), 180)"""
+    match = SHARD_PATTERN.match(file_name)
+    if match is None:
+        return None
+    mass_index, center_radius, point_index, count = [int(x) for x in match.groups()]
+    return SweepJob(mass_index, center_radius, point_index), count
+
+
+def get_finished_jobs(folder):
+    # type: (str) -> Dict[SweepJob, str]
+    """folder에 이미 shard가 있는 job들. 중간에 죽은 sweep을 이어서 돌릴 때 사용한다."""
+    finished = {}
+    if not os.path.isdir(folder):
+        return finished
+    for file_name in os.listdir(folder):
+        parsed = parse_shard_name(file_name)
+        if parsed is not None:
+            finished[parsed[0]] = os.path.join(folder, file_name)
+    return finished
+
+
+def write_shard(folder, job, mass_results):
+    # type: (str, SweepJob, MassResults) -> str
+    """임시 파일에 쓰고 rename한다. 쓰다가 죽어도 완성된 shard로 보이지 않는다."""
+    file_name = SHARD_FORMAT.format(
+        job.mass_index, job.center_radius, job.point_index, len(mass_results.outputs)
+    )
+    path = os.path.join(folder, file_name)
+    temp_path = os.path.join(folder, ".{}_{}_{}.tmp".format(*job))
+    with open(temp_path, "wb") as f:
+        pickle.dump(mass_results, f)
+    os.replace(temp_path, path)
+    return path
+
+
+def _init_worker(finder_factory, conditions):
+    finder = finder_factory()
+    _worker_state["finder"] = finder
+    _worker_state["points"] = finder.site.filter_by_condition(conditions)
+
+
+def run_sweep_job(job, folder):
+    # type: (SweepJob, str) -> str
+    """job 하나를 계산하고 바로 shard로 저장한다."""
+    finder = _worker_state["finder"]
+    site_point = _worker_state["points"][job.point_index]
+    point = getattr(site_point, "point", site_point)
+
+    mass = finder.masses[job.mass_index]
+    mass.set_center(point)
+    mass.generate()
+    outputs = finder.finalize(job.mass_index, job.center_radius)
+
+    mass_results = MassResults(job.center_radius, point, mass.name, outputs)
+    return write_shard(folder, job, mass_results)
+
+
+class SweepRunner:
+    """
+    (mass, center radius, point index) sweep을 process pool로 돌린다.
+    finder_factory는 load_detail_area까지 끝난 RadialMassFinder를 돌려주는
+    pickle 가능한 함수여야 한다. (worker마다 한번 호출)
+    conditions는 center 후보를 고르는 Site.filter_by_condition 조건식이다.
+    결과는 끝나는 대로 folder에 mass{m}_{r}_{p}_{count}results.pickle로 저장하고
+    이미 shard가 있는 job은 건너뛴다.
+    """
+
+    def __init__(self, finder_factory, conditions, folder, processes=None):
+        # type: (Callable, List[str], str, Optional[int]) -> None
+        self.finder_factory = finder_factory
+        self.conditions = conditions
+        self.folder = folder
+        self.processes = processes or multiprocessing.cpu_count()
+
+    def get_pending_jobs(self, jobs):
+        # type: (List[SweepJob]) -> List[SweepJob]
+        finished = get_finished_jobs(self.folder)
+        return [job for job in jobs if SweepJob(*job) not in finished]
+
+    def run(self, jobs):
+        # type: (List[SweepJob]) -> Iterator[str]
+        """끝난 shard의 경로를 끝나는 순서대로 돌려준다."""
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        pending_jobs = self.get_pending_jobs(jobs)
+        print("sweep jobs : {} / pending : {}".format(len(jobs), len(pending_jobs)))
+        if len(pending_jobs) == 0:
+            return
+        run_job = partial(run_sweep_job, folder=self.folder)
+
+        if self.processes == 1:
+            _init_worker(self.finder_factory, self.conditions)
+            for job in pending_jobs:
+                yield run_job(job)
+            return
+
+        pool = multiprocessing.Pool(
+            self.processes,
+            initializer=_init_worker,
+            initargs=(self.finder_factory, self.conditions),
+        )
+        try:
+            for path in pool.imap_unordered(run_job, pending_jobs):
+                yield path
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
@@ -1,6 +1,6 @@
 # -*- coding:utf-8 -*-
 # pylint: disable=bare-except
-import Rhino.Geometry as geo
+from funcs._backend import geo
 
 # from _radial_mass import RadialAreaGroup
 import math
@@ -59,6 +59,17 @@ def extract_points_from_polyline(
     return points
 
 
+def get_curve_points(curve, tol=TOL):
+    # type: (geo.Curve, float) -> List[Tuple[float, float]]
+    """curve를 polyline으로 근사해서 (x, y) 리스트로 만든다.
+    닫힌 curve는 마지막 점이 첫 점과 같다."""
+    is_polyline, polyline = curve.TryGetPolyline()
+    if not is_polyline:
+        polyline_curve = curve.ToPolyline(0, 0, math.pi / 180, 0, 0, tol, 0, 0, True)
+        _, polyline = polyline_curve.TryGetPolyline()
+    return [(pt.X, pt.Y) for pt in polyline]
+
+
 def get_center(crv: geo.PolylineCurve) -> geo.Point3d:
     points = extract_points_from_polyline(crv)
     x_sum = 0
@@ -120,6 +131,27 @@ def get_joined_curve(crvs):
         raise Exception("check this curve")
 
 
+def get_radial_area_curve(c, a1, a2, r1, r2):
+    # type: (geo.Point3d, float, float, float, float) -> Optional[geo.Curve]
+    """RadialArea의 다섯개 parameter로 Rhino Curve를 만든다.
+    geometry가 실제로 필요할 때만 호출하도록 하자. 실패하면 None"""
+    v1 = geo.Vector3d(math.cos(a1), math.sin(a1), 0)
+    v2 = geo.Vector3d(math.cos(a2), math.sin(a2), 0)
+
+    crv1 = geo.Polyline([c + r1 * v1, c + r2 * v1]).ToNurbsCurve()
+    crv2 = geo.Polyline([c + r1 * v2, c + r2 * v2]).ToNurbsCurve()
+    crv3 = geo.ArcCurve(geo.Arc(geo.Circle(c, r2), geo.Interval(a1, a2)))
+    crvs = [crv1, crv2, crv3]
+
+    if r1 != 0:  # 중간에 비어 있으면
+        crvs.append(geo.ArcCurve(geo.Arc(geo.Circle(c, r1), geo.Interval(a1, a2))))
+    try:
+        return get_joined_curve(crvs)
+    except:
+        print("ERROR")
+        return None
+
+
 def move_curve(crv_to_move, vec):
     # type: (geo.Curve, geo.Vector3d) -> geo.Curve
     crv_moved = crv_to_move.DuplicateCurve()
@@ -128,6 +160,8 @@ def move_curve(crv_to_move, vec):
 
 
 def is_pt_inside(pt, curve):
+    if not curve.GetBoundingBox(True).Contains(pt):
+        return False
     point_containment = curve.Contains(pt, geo.Plane.WorldXY, TOL)
 
     return point_containment in [
@@ -2,10 +2,14 @@
 # pylint: disable=bare-except
 try:
     from typing import List, Tuple, Dict, Any, Optional
+
+    # type comment 용도. Rhino 없이 저장된 결과를 읽을 때는 import 하지 않는다.
+    import Rhino.Geometry as geo
+    from funcs._radial_mass import RadialAreaGroup
 except ImportError:
     pass
-import Rhino.Geometry as geo
-from funcs._radial_mass import RadialAreaGroup
+
+from funcs._metrics import get_layout_fingerprint
 
 
 class MassResults:
@@ -26,3 +30,9 @@ class MassResult:
         크기가 너무 작아서 skip된 area_cluster를 함께 리턴한다."""
         self.area_groups = area_groups
         self.skipped_cluster = skipped_cluster
+
+    @property
+    def fingerprint(self):
+        # type: () -> Tuple
+        """같은 배치인지 비교할 때 쓴다. (_metrics.get_layout_fingerprint)"""
+        return get_layout_fingerprint(self.area_groups)
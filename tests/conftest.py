@@ -0,0 +1,67 @@
+# -*- coding:utf-8 -*-
+# Rhino 없이 headless backend로 테스트한다.
+import math
+import os
+import sys
+
+os.environ["RAD_MASS_HEADLESS"] = "1"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+LEGACY_FOLDER = os.path.join(ROOT, "first_res_m1")
+LEGACY_SHARD = os.path.join(LEGACY_FOLDER, "mass1_3_4_6results.pickle")
+
+from funcs._backend import geo  # noqa: E402
+from funcs._sector import Sector  # noqa: E402
+from funcs._interval_index import OVERLAP_TOL, get_angle_intervals, get_overlap  # noqa: E402
+
+
+def random_sector(rng, cx=0.0, cy=0.0):
+    a1 = rng.uniform(-math.pi, 2 * math.pi)
+    a2 = a1 + rng.uniform(0.05, math.pi * 1.5)
+    r1 = rng.choice([0.0, rng.uniform(1, 8)])
+    r2 = r1 + rng.uniform(1, 15)
+    return Sector(cx, cy, a1, a2, r1, r2)
+
+
+def random_polygon(rng):
+    """조금 찌그러진 사각형. 마지막 점은 첫 점과 같다."""
+    x0, y0 = rng.uniform(-40, 10), rng.uniform(-40, 10)
+    w, h = rng.uniform(5, 60), rng.uniform(5, 60)
+    points = [(x0, y0), (x0 + w, y0), (x0 + w, y0 + h), (x0, y0 + h)]
+    points = [(x + rng.uniform(-3, 3), y + rng.uniform(-3, 3)) for x, y in points]
+    return points + points[:1]
+
+
+def random_angles(rng):
+    """area_group 하나의 (a1, a2). a1은 음수일 수 있다."""
+    a1 = rng.uniform(-1, 2 * math.pi)
+    a2 = min(a1 + rng.uniform(0, 2), 2 * math.pi)
+    return a1, a2
+
+
+def random_angle_intervals(rng):
+    return get_angle_intervals(*random_angles(rng))
+
+
+def brute_overlaps(intervals_1, intervals_2):
+    return any(
+        get_overlap(interval_1, interval_2) > OVERLAP_TOL
+        for interval_1 in intervals_1
+        for interval_2 in intervals_2
+    )
+
+
+def rect(x0, y0, x1, y1):
+    """(x0, y0) - (x1, y1) 사각형 PolylineCurve"""
+    return geo.PolylineCurve(
+        [
+            geo.Point3d(x0, y0, 0),
+            geo.Point3d(x1, y0, 0),
+            geo.Point3d(x1, y1, 0),
+            geo.Point3d(x0, y1, 0),
+            geo.Point3d(x0, y0, 0),
+        ]
+    )
@@ -0,0 +1,87 @@
+# -*- coding:utf-8 -*-
+import random
+from itertools import product
+
+from funcs._backend import geo
+from funcs._radial_mass import RadialArea, RadialAreaGroup, merge_area_groups
+from funcs._area_to_mass import Seed, SeedExtensionScenario, iter_area_divisions
+
+
+def _get_area_divisions(target_list, prev_capacity, next_capacity):
+    """itertools.product로 모두 나눠 보고 면적 구성이 같은 것은 처음 것만 남긴다."""
+    res = []
+    seen = set()
+    if not (0 < prev_capacity and 0 < next_capacity):
+        return res
+    for is_prev_list in product([True, False], repeat=len(target_list)):
+        prev_data = [data for data, is_prev in zip(target_list, is_prev_list) if is_prev]
+        next_data = [data for data, is_prev in zip(target_list, is_prev_list) if not is_prev]
+        if sum([x[0] for x in prev_data]) >= prev_capacity and prev_data:
+            continue
+        if sum([x[0] for x in next_data]) >= next_capacity and next_data:
+            continue
+        key = (
+            tuple(sorted([x[0] for x in prev_data])),
+            tuple(sorted([x[0] for x in next_data])),
+        )
+        if key not in seen:
+            seen.add(key)
+            res.append((prev_data, next_data))
+    return res
+
+
+def test_area_divisions_match_product():
+    rng = random.Random(1)
+    for _ in range(500):
+        target_list = [
+            (rng.choice([5, 10, 12, 20, 35]), "room{}".format(i)) for i in range(rng.randint(0, 7))
+        ]
+        prev_capacity = rng.uniform(-5, 80)
+        next_capacity = rng.uniform(-5, 80)
+        assert list(iter_area_divisions(target_list, prev_capacity, next_capacity)) == (
+            _get_area_divisions(target_list, prev_capacity, next_capacity)
+        )
+
+
+def test_seed_area_left_follows_area_data():
+    area_group = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 0, 1, 0, 5)])
+    area_group.set_area_data([(20, "office")])
+    seed = Seed(area_group, {"office": 20, "kitchen": 10, "toilet": 5})
+    assert seed.area_left_data == {"kitchen": 10, "toilet": 5}
+    assert seed.area_left == 15
+
+    area_group.set_area_data([(20, "office"), (10, "kitchen")])
+    assert seed.area_left_data == {"toilet": 5}
+    assert seed.area_left == 5
+
+    other = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 1, 2, 0, 5)])
+    other.set_area_data([(5, "toilet")])
+    seed.area_groups.append(other)
+    assert seed.area_left_data == {}
+    assert seed.area_left == 0
+
+    # filter_invalid_radius의 표시는 room이 아니다.
+    invalid = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 2, 3, 0, 2)])
+    invalid.set_area_data(("invalid", 0))
+    seed.area_groups.append(invalid)
+    assert seed.area_left_data == {}
+    assert seed.area_left == 0
+
+
+def test_two_sided_scenario_cost():
+    # seed는 [0, 0.5] 이고 양쪽으로 조각 두개씩 합친다.
+    area_groups = [
+        RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 0.5 * i, 0.5 * (i + 1), 6, 9)])
+        for i in range(-2, 3)
+    ]
+    seed = Seed(area_groups[2], {"office": 40})
+    # prev 쪽은 seed에서 멀어지는 순서이다.
+    prev_area_groups = [area_groups[1], area_groups[0]]
+    next_area_groups = area_groups[3:]
+    scenario = SeedExtensionScenario(
+        seed, prev_area_groups, next_area_groups, [(40.0, "office")], [(40.0, "office")]
+    )
+    assert merge_area_groups(prev_area_groups[::-1]).shape_ok
+    assert merge_area_groups(next_area_groups).shape_ok
+    assert scenario.get_cost("shape") == 0
+    assert scenario.get_cost(None) == 0
@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+import json
+import math
+import os
+
+import pytest
+
+from conftest import ROOT, rect
+from funcs import _backend, _headless
+from funcs._backend import geo
+from funcs._site import Site
+from funcs._mass_finder import RadialMassFinder
+
+
+def _get_areas(curves):
+    return sorted([round(curve.get_signed_area(), 6) for curve in curves])
+
+
+def test_backend_is_headless():
+    assert _backend.IS_HEADLESS
+    assert geo is _headless
+    # sticky에 저장하는 디버그 값은 기억하지 않는다.
+    _backend.sc.sticky["debug"] = 1
+    assert "debug" not in _backend.sc.sticky
+
+
+def test_point_and_vector():
+    point = geo.Point3d(1, 2, 0) + geo.Vector3d(3, -1, 0) * 2
+    assert point == geo.Point3d(7, 0, 0)
+    assert point.DistanceTo(geo.Point3d(4, 4, 0)) == 5
+    vector = geo.Vector3d(3, 4, 0)
+    assert vector.Length == 5
+    assert vector.Unitize()
+    assert vector.EpsilonEquals(geo.Vector3d(0.6, 0.8, 0), 1e-9)
+    interval = geo.Interval.FromIntersection(geo.Interval(0, 2), geo.Interval(1, 5))
+    assert (interval.T0, interval.T1, interval.Length) == (1, 2, 1)
+
+
+def test_contains():
+    square = rect(0, 0, 10, 10)
+    assert square.Contains(geo.Point3d(5, 5, 0)) == geo.PointContainment.Inside
+    assert square.Contains(geo.Point3d(10, 5, 0)) == geo.PointContainment.Coincident
+    assert square.Contains(geo.Point3d(11, 5, 0)) == geo.PointContainment.Outside
+    line = geo.PolylineCurve([geo.Point3d(0, 0, 0), geo.Point3d(1, 0, 0)])
+    assert line.Contains(geo.Point3d(0.5, 0, 0)) == geo.PointContainment.Unset
+
+
+def test_curve_intersection_and_join():
+    square = rect(0, 0, 10, 10)
+    line = geo.PolylineCurve([geo.Point3d(-5, 5, 0), geo.Point3d(15, 5, 0)])
+    events = geo.Intersect.Intersection.CurveCurve(line, square, 0.001, 0.001)
+    assert sorted([(event.PointA.X, event.PointA.Y) for event in events]) == [
+        (0, 5),
+        (10, 5),
+    ]
+    outside = geo.PolylineCurve([geo.Point3d(20, 0, 0), geo.Point3d(20, 10, 0)])
+    assert geo.Intersect.Intersection.CurveCurve(outside, square, 0.001, 0.001) == []
+
+    joined = geo.Curve.JoinCurves(
+        [
+            geo.PolylineCurve([geo.Point3d(0, 0, 0), geo.Point3d(1, 0, 0)]),
+            geo.PolylineCurve([geo.Point3d(1, 1, 0), geo.Point3d(1, 0, 0)]),
+        ]
+    )
+    assert len(joined) == 1
+    assert [(point.X, point.Y) for point in joined[0].points] == [(0, 0), (1, 0), (1, 1)]
+
+
+def test_arc_curve():
+    arc = geo.ArcCurve(
+        geo.Arc(geo.Circle(geo.Point3d(0, 0, 0), 5), geo.Interval(0, math.pi / 2))
+    )
+    assert arc.PointAtStart.EpsilonEquals(geo.Point3d(5, 0, 0), 1e-9)
+    assert arc.PointAtEnd.EpsilonEquals(geo.Point3d(0, 5, 0), 1e-9)
+    # 1도 간격 polyline이므로 길이는 호보다 조금 짧다.
+    assert arc.GetLength() == pytest.approx(5 * math.pi / 2, rel=1e-4)
+
+
+@pytest.mark.parametrize(
+    "square_b, intersection, difference",
+    [
+        ((5, 5, 15, 15), [25], [75]),
+        ((3, 3, 7, 7), [16], [-16, 100]),  # 구멍은 시계 방향이다.
+        ((10, 0, 20, 10), [], [100]),  # 변만 닿는다.
+        ((20, 20, 30, 30), [], [100]),
+        ((0, 0, 10, 10), [100], []),
+    ],
+)
+def test_boolean_squares(square_b, intersection, difference):
+    square_a = rect(0, 0, 10, 10)
+    square_b = rect(*square_b)
+    assert _get_areas(geo.Curve.CreateBooleanIntersection(square_a, square_b)) == intersection
+    assert _get_areas(geo.Curve.CreateBooleanDifference(square_a, square_b)) == difference
+
+
+def test_site_and_masses():
+    params = {
+        "close_street": rect(0, 0, 30, 10),
+        "close_park": rect(-20, -20, -10, -10),
+        "on_slope": rect(-20, -20, -10, -10),
+        "on_forest_entrance": rect(-40, -40, -35, -35),
+    }
+    site = Site(rect(0, 0, 30, 30), 4, params)
+    assert len(site.points) > 0
+    assert all(
+        0 <= site_point.point.X <= 30 and 0 <= site_point.point.Y <= 30
+        for site_point in site.points
+    )
+    # 아래쪽 10m는 도로에 가깝다.
+    assert [site_point.is_close_street for site_point in site.points] == [
+        site_point.point.Y <= 10 for site_point in site.points
+    ]
+
+    finder = RadialMassFinder(site)
+    for mass, name in zip(finder.masses, ["a1", "a2", "b"]):
+        with open(os.path.join(ROOT, "funcs", "area_detail_{}.json".format(name))) as f:
+            mass.set_target_area(json.load(f))
+    finder.set_center_point(geo.Point3d(15, 15, 0), geo.Point3d(15, 15, 0))
+    finder.generate_masses()
+    # 중심에서 대지 경계까지 15m 이고, 대각선 방향 조각은 더 길게 뻗는다.
+    assert [area_group.radial_area.r2 for area_group in finder.masses[2].radial_area_groups] == (
+        [14, 17, 14] * 4
+    )
@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+import random
+
+from conftest import random_angles, random_angle_intervals, brute_overlaps
+from funcs._backend import geo
+from funcs._utils import (
+    get_ag_interaval,
+    check_interval_intersection,
+    check_area_group_intersection,
+)
+from funcs._radial_mass import RadialArea, RadialAreaGroup
+from funcs._interval_index import (
+    AngularIntervalIndex,
+    get_angle_intervals,
+    get_area_group_intervals,
+    get_first_overlaps,
+)
+
+
+def test_angle_intervals_match_geo_intervals():
+    rng = random.Random(1)
+    for _ in range(500):
+        a1, a2 = random_angles(rng)
+        area_group = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), a1, a2, 0, 10)])
+        geo_intervals = get_ag_interaval(area_group)
+        assert get_angle_intervals(a1, a2) == [
+            (interval.T0, interval.T1) for interval in geo_intervals
+        ]
+
+
+def test_overlap_matches_check_interval_intersection():
+    rng = random.Random(2)
+    for _ in range(2000):
+        intervals_1 = random_angle_intervals(rng)
+        intervals_2 = random_angle_intervals(rng)
+        assert brute_overlaps(intervals_1, intervals_2) == check_interval_intersection(
+            [geo.Interval(*interval) for interval in intervals_1],
+            [geo.Interval(*interval) for interval in intervals_2],
+        )
+
+
+def test_index_overlaps_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(300):
+        intervals = [
+            interval
+            for _ in range(rng.randint(0, 10))
+            for interval in random_angle_intervals(rng)
+        ]
+        index = AngularIntervalIndex(intervals)
+        assert len(index) == len(intervals)
+        assert index.intervals == sorted(intervals)
+        for _ in range(20):
+            query = random_angle_intervals(rng)
+            assert index.overlaps(query) == brute_overlaps(intervals, query)
+
+
+def test_added_keeps_parent():
+    rng = random.Random(4)
+    for _ in range(200):
+        intervals = random_angle_intervals(rng)
+        index = AngularIntervalIndex(intervals)
+        extra = random_angle_intervals(rng)
+        child = index.added(extra)
+        assert index.intervals == sorted(intervals)
+        assert child.intervals == sorted(intervals + extra)
+        query = random_angle_intervals(rng)
+        assert child.overlaps(query) == brute_overlaps(intervals + extra, query)
+
+
+def test_first_overlaps_matches_pairwise_check():
+    rng = random.Random(5)
+
+    def random_area_group():
+        a1, a2 = random_angles(rng)
+        return RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), a1, a2, 0, 10)])
+
+    for _ in range(2000):
+        area_groups = [random_area_group() for _ in range(rng.randint(0, 12))]
+        placed = [random_area_group() for _ in range(rng.randint(0, 6))]
+        expected = []
+        for area_group in area_groups:
+            first = None
+            for i, placed_group in enumerate(placed):
+                if check_area_group_intersection(area_group, placed_group):
+                    first = i
+                    break
+            expected.append(first)
+        assert get_first_overlaps(
+            [get_area_group_intervals(area_group) for area_group in area_groups],
+            [get_area_group_intervals(area_group) for area_group in placed],
+        ) == expected
@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+import os
+import pickle
+import struct
+
+import pytest
+
+from conftest import LEGACY_FOLDER, LEGACY_SHARD
+from test_result_store import _get_rows
+from funcs.base import MassResults
+from funcs._result_store import StoredPoint, StoredRadialArea, save_mass_results, load_mass_results
+from funcs._legacy_results import (
+    LegacyUnpickler,
+    deserialize_clr,
+    load_legacy_shard,
+    iter_legacy_results,
+    convert_legacy_folder,
+)
+
+
+def test_legacy_shard_types():
+    mass_results = load_legacy_shard(LEGACY_SHARD)
+    assert isinstance(mass_results.point, StoredPoint)
+    assert len(mass_results.outputs) > 0
+    for mass_result in mass_results.outputs:
+        assert mass_result.skipped_cluster is not None
+        for area_group in mass_result.area_groups:
+            radial_area = area_group.radial_area
+            assert isinstance(radial_area, StoredRadialArea)
+            assert isinstance(radial_area.c, StoredPoint)
+            assert area_group.area == (radial_area.a2 - radial_area.a1) * (
+                radial_area.r2**2 - radial_area.r1**2
+            )
+
+
+def test_iter_legacy_results():
+    expected = load_legacy_shard(LEGACY_SHARD)
+    found = []
+    for shard_results, mass_result in iter_legacy_results(LEGACY_SHARD):
+        # shard 전체를 읽지만 outputs에는 남겨 두지 않는다.
+        assert shard_results.outputs == []
+        assert shard_results.radius == expected.radius
+        found.append(mass_result)
+    assert _get_rows(
+        MassResults(expected.radius, expected.point, expected.mass_name, found)
+    ) == _get_rows(expected)
+
+
+def test_round_trip_legacy_shard(tmp_path):
+    mass_results = load_legacy_shard(LEGACY_SHARD)
+    path = os.path.join(str(tmp_path), "legacy.npz")
+    save_mass_results(path, mass_results)
+    assert _get_rows(load_mass_results(path)) == _get_rows(mass_results)
+
+
+def test_deserialize_clr_point():
+    payload = b"\x00\x01Rhino.Geometry.Point3d\x03x\x03y\x03z" + struct.pack(
+        "<3d", 1.5, -2.0, 0.25
+    ) + b"\x0b"
+    point = deserialize_clr(None, payload.decode("latin-1"))
+    assert (point.X, point.Y, point.Z) == (1.5, -2.0, 0.25)
+
+    with pytest.raises(pickle.UnpicklingError):
+        payload = b"System.String" + struct.pack("<3d", 0, 0, 0) + b"\x0b"
+        deserialize_clr(None, payload.decode("latin-1"))
+
+
+def test_unpickler_rejects_other_classes(tmp_path):
+    path = os.path.join(str(tmp_path), "other.pickle")
+    with open(path, "wb") as f:
+        pickle.dump(os.path.join, f, protocol=2)
+    with open(path, "rb") as f:
+        with pytest.raises(pickle.UnpicklingError):
+            LegacyUnpickler(f).load()
+
+
+def test_convert_legacy_folder(tmp_path):
+    dst_folder = os.path.join(str(tmp_path), "converted")
+    converted = convert_legacy_folder(LEGACY_FOLDER, dst_folder)
+    shard_names = [name for name in os.listdir(LEGACY_FOLDER) if name.endswith("results.pickle")]
+    assert len(converted) == len(shard_names)
+    modified = [os.path.getmtime(path) for path in converted]
+
+    # 이미 변환된 shard는 다시 쓰지 않는다.
+    assert convert_legacy_folder(LEGACY_FOLDER, dst_folder) == converted
+    assert [os.path.getmtime(path) for path in converted] == modified
+
+    for path in converted:
+        legacy_path = os.path.join(
+            LEGACY_FOLDER, os.path.splitext(os.path.basename(path))[0] + ".pickle"
+        )
+        assert _get_rows(load_mass_results(path)) == _get_rows(load_legacy_shard(legacy_path))
@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+import json
+import math
+import os
+
+from conftest import ROOT, rect
+from funcs._backend import geo
+from funcs._site import Site
+from funcs._mass_finder import RadialMassFinder
+
+
+def _get_finder(width, height, center=None):
+    params = {
+        "close_street": rect(0, 0, width, 10),
+        "close_park": rect(-20, -20, -10, -10),
+        "on_slope": rect(-20, -20, -10, -10),
+        "on_forest_entrance": rect(-40, -40, -35, -35),
+    }
+    finder = RadialMassFinder(Site(rect(0, 0, width, height), 4, params))
+    for mass, name in zip(finder.masses, ["a1", "a2", "b"]):
+        with open(os.path.join(ROOT, "funcs", "area_detail_{}.json".format(name))) as f:
+            mass.set_target_area(json.load(f))
+    if center is None:
+        center = (width / 2.0, height / 2.0)
+    center = geo.Point3d(center[0], center[1], 0)
+    finder.set_center_point(center, center)
+    finder.generate_masses()
+    return finder
+
+
+def test_iter_finalize_matches_finalize():
+    results = _get_finder(30, 30).finalize(2, 4)
+    iterated = list(_get_finder(30, 30).iter_finalize(2, 4))
+    assert [result.fingerprint for result in iterated] == [
+        result.fingerprint for result in results
+    ]
+
+
+def test_finalize_on_small_lot():
+    # 예전에는 get_combined_area_groups에서 AttributeError가 났다.
+    results = _get_finder(28, 24).finalize(1, 4)
+    # 기본 12 분할에서 horizontal_expand는 예전처럼 최대 10번 확장한다.
+    assert len(results) == 309
+    for result in results:
+        assert len(result.area_groups) > 0
+        for area_group in result.area_groups:
+            assert area_group.is_area_set
+            # 합친 area group이 한바퀴를 감싸지 않는다.
+            radial_area = area_group.radial_area
+            assert 0 < radial_area.a2 - radial_area.a1 < 2 * math.pi
+
+    # 첫 결과만 꺼내도 finalize의 첫 결과와 같다.
+    first = next(_get_finder(28, 24).iter_finalize(1, 4))
+    assert first.fingerprint == results[0].fingerprint
+
+
+def test_finalize_with_thin_seed():
+    # 중심 반지름 6에서는 두께 3m 미만인 seed가 생긴다.
+    # 예전에는 filter_invalid_radius가 seed의 area_data를 덮어써서 TypeError가 났다.
+    results = _get_finder(28, 24, (8, 8)).finalize(2, 6)
+    for result in results:
+        assert all(area_group.is_area_set for area_group in result.area_groups)
@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+import math
+import os
+import random
+
+from conftest import LEGACY_FOLDER, LEGACY_SHARD
+from funcs._result_store import StoredPoint, StoredRadialArea, StoredAreaGroup
+from funcs._legacy_results import load_legacy_shard
+from funcs._metrics import get_layout_fingerprint, unique_layouts, iter_unique_layouts
+
+
+def _area_group(a1, a2, r1, r2, area_data=None):
+    return StoredAreaGroup(StoredRadialArea(StoredPoint(0, 0), a1, a2, r1, r2), area_data)
+
+
+def test_fingerprint_ignores_order_and_wrap():
+    rng = random.Random(1)
+    for _ in range(100):
+        angles = sorted([rng.uniform(-1, 2 * math.pi - 1) for _ in range(rng.randint(1, 6))])
+        layout = [
+            _area_group(a1, a2, 3, rng.uniform(5, 12), [(10.0, "room{}".format(i))])
+            for i, (a1, a2) in enumerate(zip(angles, angles[1:] + [angles[0] + 2 * math.pi]))
+        ]
+        shuffled = list(layout)
+        rng.shuffle(shuffled)
+        assert get_layout_fingerprint(shuffled) == get_layout_fingerprint(layout)
+
+        # 시작 각도를 2pi 돌려도 같은 배치이다.
+        area_group = layout[0]
+        radial_area = area_group.radial_area
+        turned = [
+            _area_group(
+                radial_area.a1 + 2 * math.pi,
+                radial_area.a2 + 2 * math.pi,
+                radial_area.r1,
+                radial_area.r2,
+                area_group.area_data,
+            )
+        ] + layout[1:]
+        assert get_layout_fingerprint(turned) == get_layout_fingerprint(layout)
+
+
+def test_fingerprint_tolerance():
+    layout = [_area_group(0.5, 1.5, 3, 8, [(40.0, "stair"), (10.0, "toilet")])]
+    assert get_layout_fingerprint(
+        [_area_group(0.5 + 1e-5, 1.5 + 1e-5, 3, 8.001, [(10.0, "toilet"), (40.0, "stair")])]
+    ) == get_layout_fingerprint(layout)
+    assert get_layout_fingerprint([_area_group(0.5, 1.5, 3, 8.1, layout[0].area_data)]) != (
+        get_layout_fingerprint(layout)
+    )
+    assert get_layout_fingerprint([_area_group(0.5, 1.5, 3, 8, [(40.0, "stair")])]) != (
+        get_layout_fingerprint(layout)
+    )
+
+
+def test_unique_layouts():
+    mass_results = load_legacy_shard(LEGACY_SHARD)
+    outputs = mass_results.outputs
+    unique = unique_layouts(outputs, get_area_groups=lambda output: output.area_groups)
+    # 0, 1번 결과와 2, 4번 결과, 3, 5번 결과는 같은 배치이다.
+    assert unique == [outputs[0], outputs[2], outputs[3]]
+    assert [output.fingerprint for output in unique] == [
+        get_layout_fingerprint(output.area_groups) for output in unique
+    ]
+
+    # seen에 이미 있는 것은 다시 남기지 않는다.
+    seen = set()
+    layouts = [output.area_groups for output in outputs]
+    assert unique_layouts(layouts[:3], seen) == [layouts[0], layouts[2]]
+    assert unique_layouts(layouts[3:], seen) == [layouts[3]]
+
+
+def test_legacy_folder_fingerprints():
+    count = 0
+    unique = set()
+    for file_name in sorted(os.listdir(LEGACY_FOLDER)):
+        mass_results = load_legacy_shard(os.path.join(LEGACY_FOLDER, file_name))
+        count += len(mass_results.outputs)
+        unique.update([output.fingerprint for output in mass_results.outputs])
+    assert (count, len(unique)) == (290, 135)
+
+
+def test_iter_unique_layouts_is_lazy():
+    outputs = load_legacy_shard(LEGACY_SHARD).outputs
+    consumed = []
+
+    def layouts():
+        for output in outputs:
+            consumed.append(output)
+            yield output.area_groups
+
+    iterator = iter_unique_layouts(layouts())
+    assert consumed == []
+    assert next(iterator) is outputs[0].area_groups
+    assert next(iterator) is outputs[2].area_groups
+    # 두 번째 배치를 찾을 때까지만 꺼냈다.
+    assert consumed == outputs[:3]
+    assert list(iterator) == [outputs[3].area_groups]
+    assert unique_layouts(output.area_groups for output in outputs) == [
+        outputs[0].area_groups,
+        outputs[2].area_groups,
+        outputs[3].area_groups,
+    ]
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+import os
+
+from conftest import LEGACY_SHARD
+from funcs._legacy_results import load_legacy_shard
+from funcs._result_store import save_mass_results, load_mass_results
+from funcs._plan_batch import PlanBatch, make_plan
+from funcs._plan_maker import PlanMaker
+
+
+def _load_stored(tmp_path):
+    path = os.path.join(str(tmp_path), "mass1_3_4_6results.npz")
+    save_mass_results(path, load_legacy_shard(LEGACY_SHARD))
+    return load_mass_results(path)
+
+
+def test_batch_runs_on_stored_results(tmp_path):
+    mass_results = _load_stored(tmp_path)
+    batch = PlanBatch(processes=1)
+    passed = list(batch.run(mass_results.outputs))
+
+    assert len(passed) > 0
+    assert len(passed) + batch.rejected_count == len(mass_results.outputs)
+    for index, plan_maker in passed:
+        assert plan_maker.mass_result is mass_results.outputs[index]
+        assert plan_maker.filter()
+        crvs, names, _ = plan_maker.get_2d()
+        assert len(crvs) == len(names) > 0
+
+
+def test_stored_duplicate_is_radial_area(tmp_path):
+    mass_results = _load_stored(tmp_path)
+    radial_area = mass_results.outputs[0].area_groups[0].radial_area
+    duplicated = radial_area.duplicate()
+
+    assert (duplicated.a1, duplicated.a2, duplicated.r1, duplicated.r2) == (
+        radial_area.a1,
+        radial_area.a2,
+        radial_area.r1,
+        radial_area.r2,
+    )
+    assert duplicated.c.X == radial_area.c.X and duplicated.c.Y == radial_area.c.Y
+    assert abs(duplicated.area - radial_area.area) < 1e-9
+
+
+def test_precheck_matches_filter(tmp_path):
+    mass_results = _load_stored(tmp_path)
+    for mass_result in mass_results.outputs:
+        plan_maker = make_plan(mass_result)
+        try:
+            expected = PlanMaker(mass_result)
+            expected.process()
+            is_passed = expected.filter()
+        except (ValueError, ZeroDivisionError):
+            is_passed = False
+        assert (plan_maker is not None) == is_passed
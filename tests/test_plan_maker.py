@@ -0,0 +1,113 @@
+# -*- coding:utf-8 -*-
+import os
+import random
+
+from conftest import ROOT
+from funcs._backend import geo
+from funcs.base import MassResult
+from funcs._legacy_results import iter_legacy_shards, iter_legacy_results
+from funcs._radial_mass import RadialArea, RadialAreaGroup
+from funcs._plan_maker import (
+    CHECK_ROOM_NAMES,
+    PlanMaker,
+    RoomMaker,
+    check_plan_width,
+    check_room_widths,
+    get_room_widths,
+)
+
+LEGACY_FOLDERS = [
+    "first_res_m1",
+    "first_res_m2",
+    "res_m2",
+    "second_res_m0",
+    "second_res_m1",
+    "third_res_m1",
+]
+ROOM_NAMES = CHECK_ROOM_NAMES + ["toilet", "storage", "lobby"]
+
+
+def _random_area_group(rng):
+    a1 = rng.uniform(-1, 5)
+    a2 = a1 + rng.uniform(0.3, 3)
+    r1 = rng.choice([4, 5, 6, 7])
+    names = rng.sample(ROOM_NAMES, rng.randint(1, 4))
+    area_data = [(rng.choice([rng.uniform(5, 150), 20.0]), name) for name in names]
+    area_group = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), a1, a2, r1, r1 + 5)])
+    area_group.set_area_data(area_data)
+    return area_group
+
+
+def _get_made_widths(area_group):
+    rooms = RoomMaker(area_group).process()
+    res = []
+    for room in rooms:
+        radial_area = max(room.radial_areas, key=lambda k: k.area)
+        res.append((room.name, radial_area.r1 * (radial_area.a2 - radial_area.a1)))
+    return res
+
+
+def test_room_widths_match_room_maker():
+    rng = random.Random(1)
+    checked = 0
+    for _ in range(3000):
+        area_group = _random_area_group(rng)
+        try:
+            expected = _get_made_widths(area_group)
+        except (ValueError, ZeroDivisionError):
+            continue
+        radial_area = area_group.radial_area
+        widths = get_room_widths(
+            area_group.area_data, radial_area.a1, radial_area.a2, radial_area.r1
+        )
+        assert [name for name, _ in widths] == [name for name, _ in expected]
+        for (_, width), (_, expected_width) in zip(widths, expected):
+            assert abs(width - expected_width) < 1e-9
+        checked += 1
+    assert checked > 1000
+
+
+def test_room_widths_check_matches_filter():
+    rng = random.Random(2)
+    for _ in range(1000):
+        area_group = _random_area_group(rng)
+        try:
+            rooms = RoomMaker(area_group).process()
+        except (ValueError, ZeroDivisionError):
+            continue
+        plan_maker = PlanMaker.__new__(PlanMaker)
+        plan_maker.rooms = rooms
+        assert check_room_widths(area_group) == plan_maker.filter()
+
+
+def test_plan_width_matches_filter():
+    rng = random.Random(3)
+    count = 0
+    passed = 0
+    for _ in range(300):
+        area_groups = [_random_area_group(rng) for _ in range(rng.randint(1, 3))]
+        mass_result = MassResult(area_groups, [])
+        try:
+            plan_maker = PlanMaker(mass_result)
+            plan_maker.process()
+        except (ValueError, ZeroDivisionError):
+            continue
+        is_passed = plan_maker.filter()
+        assert check_plan_width(mass_result) == is_passed
+        count += 1
+        passed += is_passed
+    assert count > 0 and 0 < passed < count
+
+
+def test_plan_width_matches_filter_on_legacy_results():
+    count = 0
+    passed = 0
+    for shard in iter_legacy_shards([os.path.join(ROOT, folder) for folder in LEGACY_FOLDERS]):
+        for _, mass_result in iter_legacy_results(shard):
+            plan_maker = PlanMaker(mass_result)
+            plan_maker.process()
+            is_passed = plan_maker.filter()
+            assert check_plan_width(mass_result) == is_passed
+            count += 1
+            passed += is_passed
+    assert count > 0 and 0 < passed < count
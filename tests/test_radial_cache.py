@@ -0,0 +1,65 @@
+# -*- coding:utf-8 -*-
+import os
+import random
+
+from conftest import random_polygon
+from funcs._result_store import StoredPoint
+from funcs._radial_cache import RadialCache, get_cache_key, get_site_fingerprint
+
+
+def _key(x, y=0.0, angle_division=12, precision=1, refine=None):
+    return get_cache_key("site", StoredPoint(x, y), angle_division, precision, refine)
+
+
+def test_site_fingerprint():
+    rng = random.Random(1)
+    polylines = {"lot": random_polygon(rng), "on_slope": random_polygon(rng)}
+    reordered = {"on_slope": polylines["on_slope"], "lot": polylines["lot"]}
+    assert get_site_fingerprint(reordered) == get_site_fingerprint(polylines)
+    # 좌표 반올림 아래의 차이는 같은 대지로 본다.
+    noisy = {key: [(x + 1e-8, y) for x, y in points] for key, points in polylines.items()}
+    assert get_site_fingerprint(noisy) == get_site_fingerprint(polylines)
+    moved = dict(polylines, lot=[(x + 0.01, y) for x, y in polylines["lot"]])
+    assert get_site_fingerprint(moved) != get_site_fingerprint(polylines)
+
+
+def test_cache_key():
+    assert _key(1.0000000001) == _key(1.0)
+    assert _key(1.0) != _key(1.0, angle_division=24)
+    assert _key(1.0) != _key(1.0, precision=0.5)
+    assert _key(1.0) != _key(1.0, refine=(3, 2))
+
+
+def test_lru():
+    cache = RadialCache(max_size=2)
+    assert cache.get(_key(0)) is None
+    assert cache.put(_key(0), [[0, 1, 3], [1, 2, 4.5]]) == ((0, 1, 3), (1, 2, 4.5))
+    cache.put(_key(1), [(0, 2, 5)])
+    # 0을 쓰면 1이 가장 오래 안 쓴 것이 된다.
+    assert cache.get(_key(0)) == ((0, 1, 3), (1, 2, 4.5))
+    cache.put(_key(2), [(0, 2, 6)])
+    assert len(cache) == 2
+    assert cache.get(_key(1)) is None
+    assert cache.get(_key(0)) == ((0, 1, 3), (1, 2, 4.5))
+    assert cache.get(_key(2)) == ((0, 2, 6),)
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_disk_tier(tmp_path):
+    folder = os.path.join(str(tmp_path), "radii")
+    cache = RadialCache(max_size=1, folder=folder)
+    cache.put(_key(0), [(0.0, 1.0, 3.0), (1.0, 2.0, 4.0)])
+    cache.put(_key(1), [(0.0, 2.0, 5.0)])
+    assert len(cache) == 1
+    assert not [name for name in os.listdir(folder) if name.endswith(".tmp")]
+    assert len(os.listdir(folder)) == 2
+
+    # 메모리에서 밀려난 것도 파일에서 다시 읽는다.
+    assert cache.get(_key(0)) == ((0.0, 1.0, 3.0), (1.0, 2.0, 4.0))
+    assert list(cache.items) == [_key(0)]
+
+    # 다른 process / 세션의 cache도 같은 folder를 쓰면 읽는다.
+    other = RadialCache(folder=folder)
+    assert other.get(_key(1)) == ((0.0, 2.0, 5.0),)
+    assert other.get(_key(2)) is None
+    assert (other.hits, other.misses) == (1, 1)
@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+import math
+
+import pytest
+
+from funcs._backend import geo
+from funcs._radial_mass import RadialArea, RadialAreaGroup, RadialMass, get_ring_size
+
+
+def _get_ring(count):
+    angles = [2 * math.pi * i / count for i in range(count + 1)]
+    area_groups = [
+        RadialAreaGroup(
+            [RadialArea(geo.Point3d(0, 0, 0), a1, a2, 3, 10)]
+        )
+        for a1, a2 in zip(angles[:-1], angles[1:])
+    ]
+    for i, area_group in enumerate(area_groups):
+        area_group.next = area_groups[(i + 1) % count]
+        area_group.prev = area_groups[i - 1]
+    return area_groups
+
+
+def test_ring_size():
+    for count in [1, 6, 12, 24]:
+        area_groups = _get_ring(count)
+        assert [get_ring_size(area_group) for area_group in area_groups] == [
+            count
+        ] * count
+    # 끊긴 고리는 끝까지만 센다.
+    area_groups = _get_ring(6)
+    area_groups[3].next = None
+    assert get_ring_size(area_groups[0]) == 4
+
+
+class _RefineHolder:
+    """_refine_slices가 쓰는 RadialMass 속성만 가진다.
+    최대 반지름은 각도가 1 rad 보다 작으면 20m, 아니면 8m인 대지로 본다."""
+
+    def __init__(self, refine_radius_jump, refine_max_depth):
+        self.refine_radius_jump = refine_radius_jump
+        self.refine_max_depth = refine_max_depth
+        self.solved = []
+
+    def _get_slice_radius(self, angle1, angle2):
+        self.solved.append((angle1, angle2))
+        return 20.0 if angle2 <= 1 else 8.0
+
+
+def _get_uniform_slices(holder, count):
+    angles = [2 * math.pi * i / count for i in range(count + 1)]
+    return [
+        (a1, a2, holder._get_slice_radius(a1, a2)) for a1, a2 in zip(angles[:-1], angles[1:])
+    ]
+
+
+def test_refine_slices_splits_jumps_only():
+    holder = _RefineHolder(3, 2)
+    slices = _get_uniform_slices(holder, 12)
+    refined = RadialMass._refine_slices(holder, slices)
+
+    # 조각들은 빈틈 없이 이어진다.
+    assert refined[0][0] == 0
+    assert refined[-1][1] == pytest.approx(2 * math.pi)
+    assert all(prev[1] == cur[0] for prev, cur in zip(refined[:-1], refined[1:]))
+    for a1, a2, radius in refined:
+        assert radius == (20.0 if a2 <= 1 else 8.0)
+
+    step = 2 * math.pi / 12
+    widths = [round((a2 - a1) / step, 9) for a1, a2, _ in refined]
+    # 반지름이 바뀌는 0 rad, 1 rad 근처만 두번까지 나뉜다.
+    assert widths == [0.25, 0.25, 0.5, 0.25, 0.25, 0.25, 0.25] + [1] * 9 + [0.5, 0.25, 0.25]
+    assert len(holder.solved) == 12 + 6 + 8
+
+
+def test_refine_slices_depth_and_threshold():
+    holder = _RefineHolder(3, 0)
+    slices = _get_uniform_slices(holder, 12)
+    assert RadialMass._refine_slices(holder, slices) == slices
+
+    holder = _RefineHolder(20, 2)
+    slices = _get_uniform_slices(holder, 12)
+    assert RadialMass._refine_slices(holder, slices) == slices
+    assert len(holder.solved) == 12
+
+
+def test_duplicate_keeps_area_data():
+    area_group = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 0, 1, 3, 10)])
+    area_group.set_area_data([(20.0, "office"), (5.0, "toilet")])
+    duplicated = area_group.duplicate()
+    assert duplicated.area_data == area_group.area_data
+    assert duplicated.is_area_set
+    assert duplicated.radial_area is not area_group.radial_area
+    assert (duplicated.prev, duplicated.next) == (None, None)
@@ -0,0 +1,165 @@
+# -*- coding:utf-8 -*-
+import math
+import random
+
+from conftest import random_polygon
+from funcs._radial_solver import get_max_radius, match_radii
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _segments_cross(p1, p2, q1, q2):
+    return (_cross(q1, q2, p1) > 0) != (_cross(q1, q2, p2) > 0) and (
+        _cross(p1, p2, q1) > 0
+    ) != (_cross(p1, p2, q2) > 0)
+
+
+def _arc_touches(cx, cy, a1, a2, radius, p, q):
+    dx = q[0] - p[0]
+    dy = q[1] - p[1]
+    fx = p[0] - cx
+    fy = p[1] - cy
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return False
+    for t in ((-b - math.sqrt(disc)) / (2 * a), (-b + math.sqrt(disc)) / (2 * a)):
+        if 0 <= t <= 1:
+            angle = math.atan2(fy + t * dy, fx + t * dx)
+            if any(a1 <= angle + k * 2 * math.pi <= a2 for k in (-1, 0, 1, 2)):
+                return True
+    return False
+
+
+def _touches(cx, cy, a1, a2, radius, polylines):
+    """반지름 radius인 피자의 경계(두 ray와 호)가 polyline과 만나는지 직접 확인한다."""
+    ends = [
+        (cx + radius * math.cos(angle), cy + radius * math.sin(angle)) for angle in (a1, a2)
+    ]
+    for polyline in polylines:
+        for p, q in zip(polyline[:-1], polyline[1:]):
+            if _arc_touches(cx, cy, a1, a2, radius, p, q):
+                return True
+            if any(_segments_cross((cx, cy), end, p, q) for end in ends):
+                return True
+    return False
+
+
+def _grow_radius(cx, cy, a1, a2, polylines, precision):
+    """기존 RadialMass._get_radial_areas처럼 3m부터 precision씩 키워 본다."""
+    radii = []
+    while 3 + len(radii) * precision <= 32 + 1e-9:
+        radii.append(3 + len(radii) * precision)
+    for k, radius in enumerate(radii):
+        if _touches(cx, cy, a1, a2, radius, polylines):
+            return 3 + (k - 1) * precision
+    return radii[-1]
+
+
+def test_max_radius_matches_growth():
+    rng = random.Random(1)
+    for _ in range(300):
+        polylines = [random_polygon(rng) for _ in range(rng.randint(1, 3))]
+        cx, cy = rng.uniform(-20, 20), rng.uniform(-20, 20)
+        a1 = rng.uniform(-1, 2 * math.pi)
+        a2 = a1 + rng.uniform(0.1, math.pi / 2)
+        assert get_max_radius(cx, cy, a1, a2, polylines) == _grow_radius(
+            cx, cy, a1, a2, polylines, 1
+        )
+
+
+def test_max_radius_precision():
+    rng = random.Random(2)
+    for _ in range(100):
+        polylines = [random_polygon(rng) for _ in range(rng.randint(1, 3))]
+        cx, cy = rng.uniform(-20, 20), rng.uniform(-20, 20)
+        a1 = rng.uniform(0, 2 * math.pi)
+        a2 = a1 + rng.uniform(0.1, math.pi / 2)
+        radius = get_max_radius(cx, cy, a1, a2, polylines, precision=0.25)
+        assert abs(radius - _grow_radius(cx, cy, a1, a2, polylines, 0.25)) < 1e-9
+        # 더 촘촘히 찾으면 정수 반지름보다 작아지지 않는다.
+        assert radius >= get_max_radius(cx, cy, a1, a2, polylines) - 1e-9
+
+
+def test_max_radius_without_constraints():
+    assert get_max_radius(0, 0, 0, 0.5, []) == 32
+    assert get_max_radius(0, 0, 0, 0.5, [[(100, 100), (101, 100)]]) == 32
+
+
+def _get_area(widths, inner_radii, outer_radii):
+    return sum([w * (r2**2 - r1**2) for w, r1, r2 in zip(widths, inner_radii, outer_radii)])
+
+
+def _shrink_round_robin(
+    widths, inner_radii, outer_radii, shrinkable, target_area, floor_radius, step
+):
+    """기존 RadialMass._match_area의 loop"""
+    radii = list(outer_radii)
+    index = 0
+    counter = 0
+    while _get_area(widths, inner_radii, radii) > target_area:
+        i = shrinkable[index % len(shrinkable)]
+        if radii[i] <= floor_radius:
+            if counter == len(shrinkable):
+                break
+            index += 1
+            counter += 1
+            continue
+        radii[i] = radii[i] - step
+        counter = 0
+        index += 1
+    return radii
+
+
+def _random_ring(rng):
+    count = rng.choice([6, 12, 24])
+    widths = [2 * math.pi / count] * count
+    inner_radii = [rng.choice([0, 3, 4])] * count
+    precision = rng.choice([1, 0.5, 0.25])
+    outer_radii = [
+        inner_radii[0] + 3 + precision * rng.randint(0, int(26 / precision)) for _ in range(count)
+    ]
+    shrinkable = [i for i, radius in enumerate(outer_radii) if radius > 11]
+    target_area = _get_area(widths, inner_radii, outer_radii) * rng.uniform(0.2, 1.1)
+    return widths, inner_radii, outer_radii, shrinkable, target_area
+
+
+def test_match_radii_matches_round_robin():
+    rng = random.Random(3)
+    for _ in range(500):
+        widths, inner_radii, outer_radii, shrinkable, target_area = _random_ring(rng)
+        if not shrinkable:
+            continue
+        assert match_radii(
+            widths, inner_radii, outer_radii, shrinkable, target_area, 7, 0.5
+        ) == _shrink_round_robin(widths, inner_radii, outer_radii, shrinkable, target_area, 7, 0.5)
+
+
+def test_match_radii_by_level():
+    rng = random.Random(4)
+    for _ in range(500):
+        widths, inner_radii, outer_radii, shrinkable, target_area = _random_ring(rng)
+        radii = match_radii(widths, inner_radii, outer_radii, shrinkable, target_area, 7)
+        cut = [i for i, (radius, outer) in enumerate(zip(radii, outer_radii)) if radius != outer]
+        assert set(cut) <= set(shrinkable)
+        if not cut:
+            continue
+        level = radii[cut[0]]
+        assert all(abs(radii[i] - level) < 1e-9 for i in cut)
+        assert level >= 7
+        # 자르지 않은 shrinkable 반지름은 level 이하이다.
+        assert all(radii[i] <= level + 1e-9 for i in shrinkable if i not in cut)
+        if level > 7:
+            assert abs(_get_area(widths, inner_radii, radii) - target_area) < 1e-6
+
+
+def test_match_radii_without_shrinkable():
+    widths, inner_radii, outer_radii = [1.0, 1.0], [0, 0], [10.0, 6.0]
+    # 기존 loop는 ZeroDivisionError를 냈다.
+    assert match_radii(widths, inner_radii, outer_radii, [], 10, 7, 0.5) == outer_radii
+    assert match_radii(widths, inner_radii, outer_radii, [1], 10, 7) == outer_radii
+    assert match_radii(widths, inner_radii, outer_radii, [0], 1000, 7) == outer_radii
@@ -0,0 +1,154 @@
+# -*- coding:utf-8 -*-
+import os
+import shutil
+
+import pytest
+
+from conftest import LEGACY_FOLDER, LEGACY_SHARD
+from funcs._result_store import save_mass_results
+from funcs._legacy_results import load_legacy_shard
+from funcs._result_catalog import ResultCatalog, parse_shard_path, get_mass_name
+
+
+def _get_expected_rows(mass_results):
+    """catalog 코드를 쓰지 않고 결과마다 (area_error, skipped_count, shape_metric, rooms)를 구한다."""
+    rows = []
+    for mass_result in mass_results.outputs:
+        area_error = 0.0
+        shape_metric = 0
+        rooms = {}
+        for area_group in mass_result.area_groups:
+            if not area_group.area_data:
+                continue
+            radial_area = area_group.radial_area
+            target_area = sum([area for area, _ in area_group.area_data])
+            area_error += abs(area_group.area - target_area)
+            ratio = radial_area.r1 * (radial_area.a2 - radial_area.a1) / (
+                radial_area.r2 - radial_area.r1
+            )
+            if ratio <= 0.8:
+                shape_metric += 1
+            for area, name in area_group.area_data:
+                rooms[name] = (area, area_group.area * area / target_area)
+        rows.append((area_error, len(mass_result.skipped_cluster), shape_metric, rooms))
+    return rows
+
+
+def _get_rows(catalog, entries):
+    return [
+        (entry.area_error, entry.skipped_count, entry.shape_metric, catalog.get_room_areas(entry))
+        for entry in entries
+    ]
+
+
+def _assert_rows_equal(rows, expected):
+    assert len(rows) == len(expected)
+    for row, expected_row in zip(rows, expected):
+        assert row[:3] == pytest.approx(expected_row[:3])
+        assert sorted(row[3]) == sorted(expected_row[3])
+        for name, areas in expected_row[3].items():
+            assert row[3][name] == pytest.approx(areas)
+
+
+def test_parse_shard_path():
+    assert parse_shard_path("a/mass1_3_14_180results.pickle") == (1, 3, 14)
+    assert parse_shard_path("mass0_5_2_7results.npz") == (0, 5, 2)
+    assert parse_shard_path("catalog.sqlite") is None
+    assert get_mass_name("mass1") == "A2"
+    assert get_mass_name("B") == "B"
+    assert get_mass_name("custom", 0) == "A1"
+
+
+def test_fixture_shard_rows():
+    catalog = ResultCatalog()
+    assert catalog.add_shard(LEGACY_SHARD) == 6
+    entries = catalog.query()
+    assert [entry.result_index for entry in entries] == list(range(6))
+    for entry in entries:
+        assert (entry.mass_name, entry.radius, entry.point_index) == ("A2", 3, 4)
+        assert (entry.center_x, entry.center_y) == pytest.approx(
+            (1335746.3207589602, 1210979.1627215627)
+        )
+        assert entry.skipped_count == 0
+        assert entry.skipped_area == 0
+    _assert_rows_equal(
+        _get_rows(catalog, entries), _get_expected_rows(load_legacy_shard(LEGACY_SHARD))
+    )
+    assert sorted(catalog.get_room_areas(entries[0])) == [
+        "community_corridor",
+        "mech_room",
+        "meeting_room",
+        "office",
+        "stair",
+        "storage",
+        "toilet",
+        "tool_room",
+    ]
+
+    mass_result = catalog.load_result(entries[2])
+    assert mass_result.area_groups[0].area_data == [(63.0, "office"), (17.0, "meeting_room")]
+
+
+def test_npz_shard_rows(tmp_path):
+    path = os.path.join(str(tmp_path), "mass1_3_4_6results.npz")
+    save_mass_results(path, load_legacy_shard(LEGACY_SHARD))
+    catalog = ResultCatalog()
+    assert catalog.add_shard(path) == 6
+    _assert_rows_equal(
+        _get_rows(catalog, catalog.query()), _get_expected_rows(load_legacy_shard(LEGACY_SHARD))
+    )
+
+
+def test_query_matches_filter():
+    catalog = ResultCatalog()
+    count = catalog.add_folder(LEGACY_FOLDER)
+    shard_names = [name for name in os.listdir(LEGACY_FOLDER) if parse_shard_path(name)]
+    assert count == len(catalog) == sum(
+        [len(load_legacy_shard(os.path.join(LEGACY_FOLDER, name)).outputs) for name in shard_names]
+    )
+    # 이미 색인된 folder는 다시 읽지 않는다.
+    assert catalog.add_folder(LEGACY_FOLDER) == 0
+
+    entries = catalog.query()
+    for radius in [3, 4, 5]:
+        assert catalog.query("A2", radius=radius) == [
+            entry for entry in entries if entry.radius == radius
+        ]
+    min_room_areas = {"community_corridor": 200, "toilet": 40}
+    assert catalog.query(min_room_areas=min_room_areas, max_shape_metric=2) == [
+        entry
+        for entry in entries
+        if entry.shape_metric <= 2
+        and all(
+            name in catalog.get_room_areas(entry)
+            and catalog.get_room_areas(entry)[name][1] >= min_area
+            for name, min_area in min_room_areas.items()
+        )
+    ]
+    ordered = catalog.query(order_by="area_error", limit=10)
+    assert ordered == sorted(entries, key=lambda entry: (entry.area_error, entry.id))[:10]
+    assert catalog.query("A1") == []
+    with pytest.raises(Exception):
+        catalog.query(order_by="unknown")
+
+
+def test_reindex_on_mtime(tmp_path):
+    path = os.path.join(str(tmp_path), os.path.basename(LEGACY_SHARD))
+    shutil.copy(LEGACY_SHARD, path)
+    catalog_path = os.path.join(str(tmp_path), "catalog.sqlite")
+    catalog = ResultCatalog(catalog_path)
+    assert catalog.add_folder(str(tmp_path)) == 6
+    catalog.close()
+
+    # 파일로 저장된 catalog를 다시 열어도 이미 색인된 shard는 건너뛴다.
+    catalog = ResultCatalog(catalog_path)
+    assert catalog.add_shard(path) == 0
+
+    # 수정된 shard는 예전 줄을 지우고 다시 색인한다.
+    mtime = os.path.getmtime(path)
+    os.utime(path, (mtime + 10, mtime + 10))
+    assert catalog.add_shard(path) == 6
+    assert len(catalog) == 6
+    row_count = catalog.connection.execute("SELECT COUNT(*) FROM rooms").fetchone()[0]
+    assert row_count == sum([len(catalog.get_room_areas(entry)) for entry in catalog.query()])
+    catalog.close()
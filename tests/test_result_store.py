@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+import os
+
+import numpy as np
+
+from funcs._backend import geo
+from funcs.base import MassResults, MassResult
+from funcs._radial_mass import RadialArea, RadialAreaGroup
+from funcs._metrics import INVALID_AREA_DATA
+from funcs._result_store import (
+    StoredPoint,
+    StoredRadialArea,
+    StoredAreaGroup,
+    save_mass_results,
+    load_mass_results,
+)
+
+
+def _get_rows(mass_results):
+    rows = []
+    for mass_result in mass_results.outputs:
+        groups = []
+        for area_group in mass_result.area_groups:
+            radial_area = area_group.radial_area
+            groups.append(
+                (
+                    radial_area.c.X,
+                    radial_area.c.Y,
+                    radial_area.a1,
+                    radial_area.a2,
+                    radial_area.r1,
+                    radial_area.r2,
+                    area_group.area_data,
+                )
+            )
+        rows.append((groups, mass_result.skipped_cluster))
+    point = mass_results.point
+    return (mass_results.radius, (point.X, point.Y, point.Z), mass_results.mass_name, rows)
+
+
+def _round_trip(tmp_path, mass_results, name="results"):
+    path = os.path.join(str(tmp_path), name + ".npz")
+    save_mass_results(path, mass_results)
+    return load_mass_results(path)
+
+
+def test_round_trip_stored_results(tmp_path):
+    center = StoredPoint(3.5, -2.25)
+
+    def _area_group(a1, a2, r1, r2, area_data):
+        return StoredAreaGroup(StoredRadialArea(center, a1, a2, r1, r2), area_data)
+
+    outputs = [
+        MassResult(
+            [
+                _area_group(-0.5, 1.0, 4, 11.5, [(40.5, "office"), (12, "kitchen")]),
+                _area_group(1.0, 3.0, 4, 9, None),
+                _area_group(3.0, 5.5, 4, 12, [(60, "exhibit_experience")]),
+                _area_group(5.5, 6.0, 4, 6.5, INVALID_AREA_DATA),
+            ],
+            [{"toilet": 8, "office": 3}, {"kitchen": 2}],
+        ),
+        MassResult([], []),
+    ]
+    mass_results = MassResults(4.5, StoredPoint(1, 2), "mass1", outputs)
+    loaded = _round_trip(tmp_path, mass_results)
+    assert _get_rows(loaded) == _get_rows(mass_results)
+    assert loaded.radius == 4.5
+
+    # 다시 저장해도 같다.
+    assert _get_rows(_round_trip(tmp_path, loaded, "again")) == _get_rows(mass_results)
+
+
+def test_round_trip_live_results(tmp_path):
+    center = geo.Point3d(3.5, -2.25, 0)
+    area_group_1 = RadialAreaGroup([RadialArea(center, -0.5, 1.0, 4, 11.5)])
+    area_group_1.set_area_data([(40.5, "office"), (12, "kitchen")])
+    area_group_2 = RadialAreaGroup([RadialArea(center, 1.0, 3.0, 4, 9)])
+    area_group_3 = RadialAreaGroup([RadialArea(center, 3.0, 3.5, 4, 6)])
+    area_group_3.set_area_data(INVALID_AREA_DATA)
+    outputs = [
+        MassResult([area_group_1, area_group_2, area_group_3], [{"toilet": 8}]),
+        MassResult([], []),
+    ]
+    mass_results = MassResults(4, geo.Point3d(1, 2, 0), "mass1", outputs)
+
+    loaded = _round_trip(tmp_path, mass_results)
+    assert _get_rows(loaded) == _get_rows(mass_results)
+    assert isinstance(loaded.radius, int)
+    for mass_result, loaded_result in zip(mass_results.outputs, loaded.outputs):
+        for area_group, loaded_group in zip(mass_result.area_groups, loaded_result.area_groups):
+            assert loaded_group.is_area_set == area_group.is_area_set
+            assert loaded_group.area == area_group.area
+
+
+def test_load_version_1(tmp_path):
+    center = StoredPoint(0, 0)
+    outputs = [
+        MassResult(
+            [
+                StoredAreaGroup(StoredRadialArea(center, 0, 1, 4, 10), [(30, "office")]),
+                StoredAreaGroup(StoredRadialArea(center, 1, 2, 4, 10), None),
+            ],
+            [],
+        )
+    ]
+    mass_results = MassResults(4, center, "mass1", outputs)
+    path = os.path.join(str(tmp_path), "results.npz")
+    save_mass_results(path, mass_results)
+
+    # version 1은 group_state 대신 bool인 group_is_set을 저장했다.
+    with np.load(path) as store:
+        data = {key: store[key] for key in store.files}
+    data["version"] = np.array(1)
+    data["group_is_set"] = data.pop("group_state") != 0
+    np.savez_compressed(path, **data)
+    assert _get_rows(load_mass_results(path)) == _get_rows(mass_results)
@@ -0,0 +1,167 @@
+# -*- coding:utf-8 -*-
+import math
+import pickle
+import random
+
+from funcs._backend import geo
+from funcs._metrics import get_shape_ok
+from funcs._radial_mass import RadialArea, RadialAreaGroup, merge_area_groups
+from funcs._ring import Ring, RingRange, RingWindows, get_prefix_areas, get_covering_count
+
+
+def _random_ring(rng):
+    count = rng.randint(3, 30)
+    cuts = sorted(rng.uniform(0, 2 * math.pi) for _ in range(count - 1))
+    angles = [0.0] + cuts + [2 * math.pi]
+    return Ring(
+        geo.Point3d(rng.uniform(-10, 10), rng.uniform(-10, 10), 0),
+        angles[:-1],
+        angles[1:],
+        [rng.choice([0, 3, 5])] * count,
+        [rng.uniform(2, 20) for _ in range(count)],
+    )
+
+
+def _values(radial_area):
+    return (radial_area.a1, radial_area.a2, radial_area.r1, radial_area.r2)
+
+
+def _merged(ring, start, count):
+    """RadialAreaGroup.create_radial_mass로 조각들을 하나씩 합친다."""
+    indices = [(start + i) % len(ring) for i in range(count)]
+    return RadialAreaGroup([ring[index].duplicate() for index in indices]).radial_area
+
+
+def test_ring_arrays_match_slices():
+    rng = random.Random(5)
+    for _ in range(100):
+        ring = _random_ring(rng)
+        slices = list(ring)
+        assert abs(ring.area - sum(ring_slice.area for ring_slice in slices)) < 1e-9
+        assert ring.max_radius == max(ring_slice.r2 for ring_slice in slices)
+        assert ring.min_radius == min(ring_slice.r2 for ring_slice in slices)
+        assert ring.shape_ok.tolist() == [
+            get_shape_ok(*_values(ring_slice)) for ring_slice in slices
+        ]
+
+
+def test_ring_range_matches_create_radial_mass():
+    rng = random.Random(1)
+    for _ in range(100):
+        ring = _random_ring(rng)
+        for _ in range(10):
+            start = rng.randrange(len(ring))
+            count = rng.randint(1, len(ring))
+            ring_range = RingRange(ring, start, count)
+            merged = _merged(ring, start, count)
+            assert ring_range.values == _values(merged)
+            assert ring_range.area == merged.area
+            assert ring_range.shape_ok == merged.shape_ok
+
+
+def test_ring_from_slices():
+    ring = Ring.from_slices(geo.Point3d(0, 0, 0), [(0, 1, 10), (1, 2.5, 12)])
+    assert ring.r1.tolist() == [0, 0]
+    assert ring.r2.tolist() == [10, 12]
+    assert abs(ring.area - (100 + 1.5 * 144)) < 1e-9
+
+
+def test_windows_match_ring_ranges():
+    rng = random.Random(2)
+    for _ in range(100):
+        ring = _random_ring(rng)
+        windows = RingWindows(ring)
+        for length in range(1, len(ring) + 1):
+            areas = windows.areas.tolist()
+            spans = windows.spans.tolist()
+            for start in range(len(ring)):
+                merged = _merged(ring, start, length)
+                # 배열 제곱과 python 제곱은 1 ulp 차이가 날 수 있다.
+                assert abs(areas[start] - merged.area) <= 1e-9 * max(1.0, abs(merged.area))
+                assert abs(spans[start] - (merged.a2 - merged.a1)) <= 1e-12
+            if length < len(ring):
+                windows.grow()
+
+
+def test_prefix_areas_and_covering_count():
+    rng = random.Random(4)
+    for _ in range(500):
+        # 조각 면적은 음수일 수 있다. (r1 > r2)
+        areas = [rng.uniform(-5, 20) for _ in range(rng.randint(0, 15))]
+        prefix_areas = get_prefix_areas(areas)
+        assert prefix_areas[-1] == sum(areas)
+        assert prefix_areas == [sum(areas[:i]) for i in range(len(areas) + 1)]
+        target = rng.uniform(-5, 100)
+        expected = None
+        for count in range(len(areas) + 1):
+            if sum(areas[:count]) >= target:
+                expected = count
+                break
+        assert get_covering_count(prefix_areas, target) == expected
+
+
+def test_merge_area_groups_extends_range():
+    rng = random.Random(3)
+    for _ in range(100):
+        ring = _random_ring(rng)
+        start = rng.randrange(len(ring))
+        count = rng.randint(1, len(ring))
+        area_groups = [
+            RadialAreaGroup.from_ring(ring, (start + i) % len(ring)) for i in range(count)
+        ]
+        merged = merge_area_groups(area_groups)
+        assert isinstance(merged.radial_area, RingRange)
+        assert (merged.radial_area.start, merged.radial_area.count) == (start, count)
+        merged_area = _merged(ring, start, count)
+        assert _values(merged.radial_area) == _values(merged_area)
+
+
+def test_with_center_keeps_ring():
+    rng = random.Random(6)
+    ring = _random_ring(rng)
+    r1 = ring.r1.tolist()
+    centered = ring.with_center(4)
+    assert ring.r1.tolist() == r1
+    assert centered.r1.tolist() == [4] * len(ring)
+    assert centered.r2.tolist() == ring.r2.tolist()
+
+
+def test_ring_range_pickles_as_radial_area():
+    rng = random.Random(7)
+    ring = _random_ring(rng)
+    ring_range = RingRange(ring, len(ring) - 1, 2)
+    loaded = pickle.loads(pickle.dumps(ring_range))
+    assert isinstance(loaded, RadialArea)
+    assert (loaded.a1, loaded.a2, loaded.r1, loaded.r2) == _values(ring_range)
+    assert loaded.area == ring_range.area
+
+    area_group = RadialAreaGroup.from_radial_area(ring_range)
+    area_group.set_area_data([(10, "office")])
+    loaded_group = pickle.loads(pickle.dumps(area_group))
+    assert loaded_group.area_data == [(10, "office")]
+    assert loaded_group.area == area_group.area
+    assert loaded_group.is_area_set
+
+
+def test_radial_area_cache_follows_setters():
+    radial_area = RadialArea(geo.Point3d(0, 0, 0), 0, 2, 2, 5)
+    assert radial_area.area == 42
+    assert radial_area.shape_ok
+    radial_area.r2 = 6
+    assert radial_area.area == 64
+    radial_area.a2 = 0.1
+    assert not radial_area.shape_ok
+    assert radial_area.shape_ok == get_shape_ok(0, 0.1, 2, 6)
+    assert abs(radial_area.v2.X - math.cos(0.1)) < 1e-12
+
+
+def test_area_data_version():
+    area_group = RadialAreaGroup([RadialArea(geo.Point3d(0, 0, 0), 0, 1, 0, 5)])
+    version = area_group.area_data_version
+    assert not area_group.is_area_set
+    area_group.set_area_data([(10, "office"), (5, "kitchen")])
+    assert area_group.area_data_version == version + 1
+    assert area_group.target_area == 15
+    area_group.area_data = [(3, "office")]
+    assert area_group.area_data_version == version + 2
+    assert area_group.target_area == 3
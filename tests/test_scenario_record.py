@@ -0,0 +1,28 @@
+# -*- coding:utf-8 -*-
+from funcs._scenario_record import ScenarioRecord
+
+
+def test_record_indices():
+    root = ScenarioRecord(2)
+    child = root.extend(0)
+    sibling = root.extend(1)
+    grandchild = child.extend(3)
+    assert grandchild.indices == (2, 0, 3)
+    assert sibling.indices == (2, 1)
+    assert (root.depth, child.depth, grandchild.depth) == (0, 1, 2)
+    # 형제끼리 부모를 공유하고 부모는 바뀌지 않는다.
+    assert child.parent is sibling.parent is root
+    assert root.indices == (2,)
+
+    tables = [["a", "b", "c"], ["d", "e"], ["f", "g", "h", "i"]]
+    assert grandchild.resolve(tables) == ["c", "d", "i"]
+
+
+def test_record_overlaps():
+    root = ScenarioRecord.first(0, [(0.0, 1.0)])
+    child = root.extend(1, [(2.0, 3.0)])
+    assert child.overlaps([(2.5, 4.0)])
+    assert not root.overlaps([(2.5, 4.0)])
+    # 0.2 이하로 겹치는 건 겹친 것으로 보지 않는다.
+    assert not child.overlaps([(0.9, 2.1)])
+
@@ -0,0 +1,129 @@
+# -*- coding:utf-8 -*-
+import random
+from itertools import product
+
+import pytest
+
+from conftest import random_angle_intervals, brute_overlaps
+from funcs._search import SearchEngine
+
+
+def _random_tables(rng):
+    """후보는 (각도 구간, cost) 쌍이다."""
+    return [
+        [
+            (random_angle_intervals(rng), rng.choice([0.0, rng.uniform(0, 5)]))
+            for _ in range(rng.randint(0, 4))
+        ]
+        for _ in range(rng.randint(1, 4))
+    ]
+
+
+def _get_intervals(candidate):
+    return candidate[0]
+
+
+def _get_cost(_, candidate):
+    return candidate[1]
+
+
+def _brute_force(tables, is_feasible=None):
+    res = []
+    for indices in product(*[range(len(table)) for table in tables]):
+        candidates = [table[index] for table, index in zip(tables, indices)]
+        if any(
+            brute_overlaps(candidates[i][0], candidates[j][0])
+            for j in range(len(candidates))
+            for i in range(j)
+        ):
+            continue
+        if is_feasible is not None and not all(
+            is_feasible(candidates[: depth + 1]) for depth in range(len(candidates))
+        ):
+            continue
+        res.append(indices)
+    return res
+
+
+def test_search_matches_product():
+    rng = random.Random(1)
+    for _ in range(300):
+        tables = _random_tables(rng)
+        assert SearchEngine().search(tables, _get_intervals) == _brute_force(tables)
+
+
+def test_search_prunes_infeasible():
+    rng = random.Random(2)
+    for _ in range(300):
+        tables = _random_tables(rng)
+        limit = rng.uniform(0, 10)
+
+        def _is_feasible(candidates):
+            return sum([cost for _, cost in candidates]) <= limit
+
+        assert SearchEngine().search(
+            tables, _get_intervals, is_feasible=_is_feasible
+        ) == _brute_force(tables, _is_feasible)
+
+
+def test_first_k():
+    rng = random.Random(3)
+    for _ in range(200):
+        tables = _random_tables(rng)
+        max_results = rng.randint(1, 5)
+        engine = SearchEngine(max_results=max_results)
+        assert engine.search(tables, _get_intervals, _get_cost) == _brute_force(tables)[
+            :max_results
+        ]
+        # limit=False이면 max_results를 적용하지 않는다.
+        assert engine.search(tables, _get_intervals, limit=False) == _brute_force(tables)
+
+
+def test_top_k_matches_brute_force():
+    rng = random.Random(4)
+    for _ in range(300):
+        tables = _random_tables(rng)
+        max_results = rng.choice([None, 1, 3])
+        engine = SearchEngine(max_results=max_results, objective="area_error")
+        found = engine.search(tables, _get_intervals, _get_cost)
+
+        def _cost(indices):
+            return sum(table[index][1] for table, index in zip(tables, indices))
+
+        # cost가 같으면 먼저 찾은 것이 앞에 온다.
+        expected = sorted(_brute_force(tables), key=_cost)[:max_results]
+        assert [_cost(indices) for indices in found] == pytest.approx(
+            [_cost(indices) for indices in expected]
+        )
+        if max_results is None:
+            assert found == expected
+
+
+def test_bound_prunes_branches():
+    tables = [[([(0.0, 0.5)], 0.0), ([(0.0, 0.5)], 1.0)], [([(1.0, 1.5)], 0.0)] * 3]
+    visited = []
+
+    def _get_cost_and_record(depth, candidate):
+        visited.append(depth)
+        return candidate[1]
+
+    engine = SearchEngine(max_results=1, objective="shape")
+    assert engine.search(tables, _get_intervals, _get_cost_and_record) == [(0, 0)]
+    # 두번째 첫 후보는 cost가 이미 bound 이상이라 그 아래를 보지 않는다.
+    assert visited == [0, 1, 1, 1, 0]
+
+
+def test_unknown_objective():
+    with pytest.raises(Exception):
+        SearchEngine(objective="unknown")
+
+
+def test_time_budget():
+    rng = random.Random(5)
+    tables = _random_tables(rng)
+    engine = SearchEngine(time_budget=10)
+    engine.start()
+    assert engine.search(tables, _get_intervals) == _brute_force(tables)
+    engine.deadline -= 20
+    assert engine.is_timeout
+    assert engine.search(tables, _get_intervals) == []
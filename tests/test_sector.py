@@ -0,0 +1,64 @@
+# -*- coding:utf-8 -*-
+import math
+import random
+
+from conftest import random_sector
+from funcs._sector import bbox_overlaps, get_polyline_bbox
+
+
+def _get_boundary_points(sector, count=720):
+    """호와 두 ray 위의 점들"""
+    res = []
+    for i in range(count + 1):
+        angle = sector.a1 + (sector.a2 - sector.a1) * i / count
+        res.append(sector.point_at(angle, sector.r2))
+        res.append(sector.point_at(angle, sector.r1))
+    for i in range(count + 1):
+        radius = sector.r1 + (sector.r2 - sector.r1) * i / count
+        res.append(sector.point_at(sector.a1, radius))
+        res.append(sector.point_at(sector.a2, radius))
+    return res
+
+
+def test_bbox_is_tight():
+    rng = random.Random(1)
+    for _ in range(200):
+        sector = random_sector(rng, rng.uniform(-10, 10), rng.uniform(-10, 10))
+        bbox = sector.bbox
+        expected = get_polyline_bbox(_get_boundary_points(sector))
+        # 경계 점들을 모두 덮고, 호의 극값을 샘플링 간격 이내로 맞춘다.
+        for value, expected_value in zip(bbox[:2], expected[:2]):
+            assert value <= expected_value + 1e-9
+            assert value >= expected_value - sector.r2 * (math.pi / 720) ** 2
+        for value, expected_value in zip(bbox[2:], expected[2:]):
+            assert value >= expected_value - 1e-9
+            assert value <= expected_value + sector.r2 * (math.pi / 720) ** 2
+
+
+def test_full_circle_bbox():
+    sector = random_sector(random.Random(2))
+    sector.a1 = -0.3
+    sector.a2 = -0.3 + 2 * math.pi
+    sector.r1 = 0
+    assert sector.bbox == (
+        sector.cx - sector.r2,
+        sector.cy - sector.r2,
+        sector.cx + sector.r2,
+        sector.cy + sector.r2,
+    )
+
+
+def test_bbox_overlaps():
+    rng = random.Random(3)
+    for _ in range(1000):
+        bbox_1 = get_polyline_bbox([(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(2)])
+        bbox_2 = get_polyline_bbox([(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(2)])
+        expected = (
+            max(bbox_1[0], bbox_2[0]) <= min(bbox_1[2], bbox_2[2])
+            and max(bbox_1[1], bbox_2[1]) <= min(bbox_1[3], bbox_2[3])
+        )
+        assert bbox_overlaps(bbox_1, bbox_2, tol=0.0) == expected
+        assert bbox_overlaps(bbox_1, bbox_2) == bbox_overlaps(bbox_2, bbox_1)
+    # 맞닿은 bbox는 tol 안에서 겹친다.
+    assert bbox_overlaps((0, 0, 1, 1), (1.0005, 0, 2, 1))
+    assert not bbox_overlaps((0, 0, 1, 1), (1.01, 0, 2, 1))
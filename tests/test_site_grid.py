@@ -0,0 +1,112 @@
+# -*- coding:utf-8 -*-
+import math
+import random
+
+import numpy as np
+
+from conftest import random_polygon
+from funcs._site_grid import (
+    CONDITION_KEYS,
+    CONDITION_BITS,
+    ALL_POINTS,
+    points_in_polygon,
+    get_grid_points,
+    get_condition_mask,
+    compile_conditions,
+    filter_mask,
+)
+
+
+def _is_inside(x, y, polygon, tol=0.001):
+    """점 하나씩 crossing number로 판별한다. 경계 위의 점은 안쪽으로 본다."""
+    inside = False
+    for (x1, y1), (x2, y2) in zip(polygon[:-1], polygon[1:]):
+        dx, dy = x2 - x1, y2 - y1
+        t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+        if math.hypot(x1 + t * dx - x, y1 + t * dy - y) <= tol:
+            return True
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * dx / dy:
+            inside = not inside
+    return inside
+
+
+def test_points_in_polygon_matches_loop():
+    rng = random.Random(1)
+    for _ in range(50):
+        polygon = random_polygon(rng)
+        points = np.array(
+            [(rng.uniform(-50, 80), rng.uniform(-50, 80)) for _ in range(300)]
+            + polygon[:-1]
+        )
+        res = points_in_polygon(points, polygon)
+        assert res.tolist() == [_is_inside(x, y, polygon) for x, y in points]
+        # 꼭지점은 경계 위에 있다.
+        assert res[-4:].all()
+        # 닫는 점이 없어도 같다.
+        assert points_in_polygon(points, polygon[:-1]).tolist() == res.tolist()
+
+
+def test_grid_points_order():
+    rng = random.Random(2)
+    for _ in range(20):
+        polygon = random_polygon(rng)
+        step = rng.choice([1.0, 2.5, 4.0])
+        x_min = min(x for x, _ in polygon)
+        y_min = min(y for _, y in polygon)
+        x_count = int(math.ceil((max(x for x, _ in polygon) - x_min) / step))
+        y_count = int(math.ceil((max(y for _, y in polygon) - y_min) / step))
+        expected = []
+        # _utils.get_points_in_boundary와 같이 x index가 바깥 loop이다.
+        for i in range(x_count):
+            for j in range(y_count):
+                x, y = x_min + step * i, y_min + step * j
+                if _is_inside(x, y, polygon):
+                    expected.append((x, y))
+        assert [tuple(point) for point in get_grid_points(polygon, step).tolist()] == expected
+
+
+def test_condition_mask_bits():
+    rng = random.Random(3)
+    for _ in range(20):
+        polylines = {key: random_polygon(rng) for key in CONDITION_KEYS}
+        del polylines[rng.choice(CONDITION_KEYS)]
+        points = np.array([(rng.uniform(-50, 80), rng.uniform(-50, 80)) for _ in range(200)])
+        mask = get_condition_mask(points, polylines)
+        assert mask.dtype == np.uint8
+        for key in CONDITION_KEYS:
+            expected = [
+                key in polylines and _is_inside(x, y, polylines[key]) for x, y in points
+            ]
+            assert ((mask & CONDITION_BITS[key]) != 0).tolist() == expected
+
+
+def _filter_by_condition(masks, conditions):
+    """예전 Site.filter_by_condition을 점 index로 옮긴 것"""
+    res = set()
+    for condition in conditions:
+        if condition == "all":
+            res.update(range(len(masks)))
+        elif condition in CONDITION_BITS:
+            res.update(i for i, mask in enumerate(masks) if mask & CONDITION_BITS[condition])
+        elif condition.startswith("!") and condition[1:] in CONDITION_BITS:
+            res = {i for i in res if not masks[i] & CONDITION_BITS[condition[1:]]}
+    return sorted(res)
+
+
+def test_filter_mask_matches_filter_by_condition():
+    rng = random.Random(4)
+    words = ["all", "unknown"] + CONDITION_KEYS + ["!" + key for key in CONDITION_KEYS]
+    for _ in range(500):
+        masks = [rng.randrange(16) for _ in range(rng.randint(0, 50))]
+        conditions = [rng.choice(words) for _ in range(rng.randint(0, 5))]
+        res = filter_mask(np.array(masks, dtype=np.uint8), conditions)
+        assert res.tolist() == _filter_by_condition(masks, conditions)
+
+
+def test_compile_conditions():
+    assert compile_conditions(["all", "!on_slope", "close_street", "unknown"]) == [
+        (True, ALL_POINTS),
+        (False, CONDITION_BITS["on_slope"]),
+        (True, CONDITION_BITS["close_street"]),
+    ]
+    assert compile_conditions(["!close_park"]) is compile_conditions(["!close_park"])
@@ -0,0 +1,64 @@
+# -*- coding:utf-8 -*-
+import random
+
+from conftest import random_polygon
+from funcs._sector import bbox_overlaps, get_polyline_bbox
+from funcs._site_index import SiteIndex
+
+KEYS = ["lot", "close_street", "close_park", "on_slope", "on_forest_entrance"]
+
+
+def _random_polylines(rng):
+    return {key: random_polygon(rng) for key in rng.sample(KEYS, rng.randint(1, 5))}
+
+
+def _random_bbox(rng):
+    return get_polyline_bbox(
+        [(rng.uniform(-50, 80), rng.uniform(-50, 80)) for _ in range(2)]
+    )
+
+
+def _brute_segments(polylines, bbox, keys):
+    res = []
+    for key, points in polylines.items():
+        if keys is not None and key not in keys:
+            continue
+        for p, q in zip(points[:-1], points[1:]):
+            if bbox_overlaps(get_polyline_bbox([p, q]), bbox):
+                res.append((p, q))
+    return sorted(res)
+
+
+def test_segments_match_brute_force():
+    rng = random.Random(1)
+    for _ in range(200):
+        polylines = _random_polylines(rng)
+        cell_size = rng.choice([None, 0.5, 3.0, 100.0])
+        index = SiteIndex(polylines, cell_size)
+        for _ in range(20):
+            bbox = _random_bbox(rng)
+            keys = rng.choice([None, rng.sample(KEYS, rng.randint(1, 3))])
+            assert sorted(index.get_segments(bbox, keys)) == _brute_segments(
+                polylines, bbox, keys
+            )
+
+
+def test_may_touch():
+    rng = random.Random(2)
+    for _ in range(200):
+        polylines = _random_polylines(rng)
+        index = SiteIndex(polylines)
+        for _ in range(20):
+            bbox = _random_bbox(rng)
+            for key in KEYS:
+                expected = key in polylines and bbox_overlaps(
+                    get_polyline_bbox(polylines[key]), bbox
+                )
+                assert index.may_touch(key, bbox) == expected
+
+
+def test_query_outside_index():
+    index = SiteIndex({"lot": [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]}, 1.0)
+    assert index.get_segments((100, 100, 200, 200)) == []
+    assert index.get_segments((-200, -200, -100, -100)) == []
+    assert len(index.get_segments((-100, -100, 100, 100))) == 4
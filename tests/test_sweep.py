@@ -0,0 +1,40 @@
+# -*- coding:utf-8 -*-
+import os
+import pickle
+
+from funcs import base
+from funcs import _sweep as sweep
+
+
+def test_parse_shard_name():
+    assert sweep.parse_shard_name("mass1_3_14_180results.pickle") == (
+        sweep.SweepJob(1, 3, 14),
+        180,
+    )
+    assert sweep.parse_shard_name("mass1_3_14_180results.pickle.tmp") is None
+    assert sweep.parse_shard_name(".1_3_14.tmp") is None
+
+
+def test_pending_jobs_skip_written_shards(tmp_path):
+    folder = str(tmp_path)
+    jobs = sweep.get_sweep_jobs([0, 1], [3, 4], [0, 1, 2])
+    assert len(jobs) == 12
+
+    written = jobs[1:5]
+    for job in written:
+        mass_results = base.MassResults(job.center_radius, None, "mass", [None] * job.point_index)
+        path = sweep.write_shard(folder, job, mass_results)
+        assert os.path.basename(path) == sweep.SHARD_FORMAT.format(
+            job.mass_index, job.center_radius, job.point_index, job.point_index
+        )
+        with open(path, "rb") as f:
+            assert pickle.load(f).radius == job.center_radius
+    # 쓰다가 죽은 임시 파일은 끝난 job으로 보지 않는다.
+    with open(os.path.join(folder, ".{}_{}_{}.tmp".format(*jobs[0])), "wb") as f:
+        f.write(b"broken")
+
+    assert sorted(sweep.get_finished_jobs(folder)) == sorted(written)
+    runner = sweep.SweepRunner(None, ["all"], folder, processes=1)
+    assert runner.get_pending_jobs(jobs) == [job for job in jobs if job not in written]
+    # 모두 끝났으면 worker를 만들지 않고 바로 끝난다.
+    assert list(runner.run(written)) == []